@@ -0,0 +1,230 @@
+import io
+import json
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+# First numeric video ID served by the mock site
+FIRST_VIDEO_ID = 7_300_000_000_000_000_000
+
+SEARCH_INPUT_HTML = '<input type="search" placeholder="Search" name="q">'
+
+HOME_PAGE = f"""<!DOCTYPE html>
+<html><head><title>Mock TikTok</title></head>
+<body>
+<header>{SEARCH_INPUT_HTML}</header>
+<main><h1>For You</h1></main>
+<script>
+document.querySelector("input").addEventListener("keydown", (event) => {{
+    if (event.key === "Enter") {{
+        location.href = "/search/video/?q=" +
+            encodeURIComponent(event.target.value);
+    }}
+}});
+</script>
+</body></html>
+"""
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Log in | Mock TikTok</title></head>
+<body>
+<button id="login">Log in</button>
+<script>
+document.querySelector("#login").addEventListener("click", () => {
+    document.cookie = "sessionid=mock-session; path=/; max-age=31536000";
+    location.href = "/foryou";
+});
+</script>
+</body></html>
+"""
+
+# Search results page: renders cards from the search API and loads the
+# next page whenever the user scrolls close to the bottom
+SEARCH_PAGE = f"""<!DOCTYPE html>
+<html><head><title>Search | Mock TikTok</title>
+<style>
+  div[data-e2e="search-video-card"] {{ height: 320px; margin: 8px; }}
+</style></head>
+<body>
+<header>{SEARCH_INPUT_HTML}</header>
+<div id="grid"></div>
+<script>
+const keyword = new URLSearchParams(location.search).get("q") || "";
+const grid = document.querySelector("#grid");
+let cursor = 0;
+let hasMore = true;
+let loading = false;
+
+async function loadMore() {{
+    if (loading || !hasMore) return;
+    loading = true;
+    const response = await fetch(
+        "/api/search/item/full/?keyword=" + encodeURIComponent(keyword) +
+        "&offset=" + cursor
+    );
+    const payload = await response.json();
+    for (const entry of payload.data) {{
+        const item = entry.item;
+        const card = document.createElement("div");
+        card.setAttribute("data-e2e", "search-video-card");
+        const link = document.createElement("a");
+        link.href = "/@" + item.author.uniqueId + "/video/" + item.id +
+            "?is_from_webapp=1";
+        link.textContent = item.desc;
+        card.appendChild(link);
+        grid.appendChild(card);
+    }}
+    cursor = payload.cursor;
+    hasMore = payload.has_more === 1;
+    loading = false;
+}}
+
+window.addEventListener("scroll", () => {{
+    if (window.innerHeight + window.scrollY >=
+            document.body.scrollHeight - 400) {{
+        loadMore();
+    }}
+}});
+document.querySelector("input").value = keyword;
+loadMore();
+</script>
+</body></html>
+"""
+
+VIDEO_PAGE = """<!DOCTYPE html>
+<html><head><title>Video | Mock TikTok</title></head>
+<body>
+<video src="/media/clip.wav" autoplay muted loop></video>
+</body></html>
+"""
+
+
+def _silent_wav(seconds: float = 1.0, rate: int = 8000) -> bytes:
+    """A short silent WAV file, playable by Chromium's media stack."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as clip:
+        clip.setnchannels(1)
+        clip.setsampwidth(1)
+        clip.setframerate(rate)
+        clip.writeframes(b"\x80" * int(seconds * rate))
+    return buffer.getvalue()
+
+
+class MockTikTokServer:
+    """
+    A local stand-in for the parts of TikTok used by the automation:
+    login, home page with a search input, an infinitely scrolling
+    search-video-card grid backed by a JSON search API, and video pages.
+
+    latency_ms delays every response, card_count caps the number of
+    search results and page_size is the number of cards per API page.
+    """
+
+    def __init__(
+        self,
+        latency_ms: int = 0,
+        card_count: int = 100,
+        page_size: int = 12,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.card_count = card_count
+        self.page_size = page_size
+        self.requests_served = 0
+        self._media = _silent_wav()
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def search_payload(self, keyword: str, offset: int) -> dict:
+        """Builds a search API page shaped like TikTok's response."""
+        end = min(offset + self.page_size, self.card_count)
+        items = [
+            {
+                "type": 1,
+                "item": {
+                    "id": str(FIRST_VIDEO_ID + index),
+                    "desc": f"{keyword} video {index}",
+                    "author": {"uniqueId": f"creator{index % 10}"},
+                },
+            }
+            for index in range(offset, end)
+        ]
+        return {
+            "data": items,
+            "cursor": end,
+            "has_more": 1 if end < self.card_count else 0,
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass  # Keep test and benchmark output quiet
+
+            def _send(self, body: bytes, content_type: str):
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+                server.requests_served += 1
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                path = url.path
+                html = "text/html; charset=utf-8"
+
+                if path in ("/", "/foryou"):
+                    self._send(HOME_PAGE.encode(), html)
+                elif path == "/login":
+                    self._send(LOGIN_PAGE.encode(), html)
+                elif path.rstrip("/") == "/search/video":
+                    self._send(SEARCH_PAGE.encode(), html)
+                elif path.startswith("/api/search/item/full"):
+                    query = parse_qs(url.query)
+                    payload = server.search_payload(
+                        query.get("keyword", [""])[0],
+                        int(query.get("offset", ["0"])[0]),
+                    )
+                    self._send(
+                        json.dumps(payload).encode(), "application/json"
+                    )
+                elif path == "/media/clip.wav":
+                    self._send(server._media, "audio/wav")
+                elif "/video/" in path:
+                    self._send(VIDEO_PAGE.encode(), html)
+                else:
+                    self.send_error(404)
+
+        return Handler
+
+    def start(self) -> "MockTikTokServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockTikTokServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
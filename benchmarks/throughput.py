@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from playwright.sync_api import sync_playwright
+
+from benchmarks.mock_tiktok_site import MockTikTokServer
+from logs.logger import logger
+from src.api_harvest import ApiHarvester
+from src.metrics import phase_timings
+from src.search import perform_search
+from src.viewer import watch_tiktok_feed
+
+
+# Viewer settings compared by the suite
+SCENARIOS = {
+    "same_tab": {"video_tab_mode": "same", "prefetch": False},
+    "secondary_tab": {"video_tab_mode": "secondary", "prefetch": False},
+    "prefetch": {"video_tab_mode": "secondary", "prefetch": True},
+    "network_harvest": {
+        "video_tab_mode": "secondary",
+        "prefetch": False,
+        "harvest_mode": "network",
+    },
+}
+
+
+# Seconds between two samples of the browser's memory
+RSS_SAMPLE_INTERVAL_SECONDS = 0.25
+
+
+def _read_proc_status(pid: int) -> tuple[int, int] | None:
+    """(parent PID, resident KB) of a process, None once it is gone."""
+    parent, rss_kb = None, 0
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as status:
+            for line in status:
+                if line.startswith("PPid:"):
+                    parent = int(line.split()[1])
+                elif line.startswith("VmRSS:"):
+                    rss_kb = int(line.split()[1])
+    except (OSError, ValueError):
+        return None
+    return (parent, rss_kb) if parent is not None else None
+
+
+def descendants_rss_mb(root_pid: int) -> float:
+    """
+    Current resident memory of every descendant of root_pid (Playwright
+    driver, browser and its renderer, GPU and utility processes), in MB.
+    """
+    processes = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            status = _read_proc_status(int(entry))
+            if status:
+                processes[int(entry)] = status
+
+    children: dict[int, list[int]] = {}
+    for pid, (parent, _) in processes.items():
+        children.setdefault(parent, []).append(pid)
+
+    total_kb, pending = 0, list(children.get(root_pid, []))
+    while pending:
+        pid = pending.pop()
+        total_kb += processes[pid][1]
+        pending.extend(children.get(pid, []))
+    return total_kb / 1024
+
+
+class PeakRssSampler:
+    """
+    Samples the memory of the browser process tree (all descendants of
+    this process) in a background thread and keeps the peak. Resident
+    memory is read from /proc, so peaks are only measured on Linux.
+    """
+
+    def __init__(self, interval_seconds: float = RSS_SAMPLE_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self.peak_mb: float | None = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "PeakRssSampler":
+        if os.path.isdir("/proc"):
+            self.peak_mb = 0.0
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            self.peak_mb = max(self.peak_mb, descendants_rss_mb(os.getpid()))
+            if self._stopped.wait(self.interval_seconds):
+                return
+
+
+def run_scenario(
+    name: str,
+    videos: int,
+    card_count: int,
+    latency_ms: int,
+    watch_seconds: int,
+) -> dict:
+    """
+    Drives perform_search and watch_tiktok_feed against the mock site
+    in a fresh headless browser and returns the measured numbers.
+    """
+    phase_timings.reset()
+    settings = dict(SCENARIOS[name])
+    harvest_mode = settings.pop("harvest_mode", "dom")
+
+    server = MockTikTokServer(latency_ms=latency_ms, card_count=card_count)
+
+    with server, PeakRssSampler() as rss:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_context().new_page()
+            page.goto(f"{server.base_url}/")
+            api_harvester = (
+                ApiHarvester(page) if harvest_mode == "network" else None
+            )
+
+            started_at = time.perf_counter()
+            perform_search(page, "benchmark")
+            processed = watch_tiktok_feed(
+                page,
+                skip_percent=0,
+                max_videos_to_process=videos,
+                watch_seconds_range=(watch_seconds, watch_seconds),
+                api_harvester=api_harvester,
+                **settings,
+            )
+            elapsed = time.perf_counter() - started_at
+            browser.close()
+
+    summary = phase_timings.summary()
+    return {
+        "scenario": name,
+        "videos": processed,
+        "seconds": round(elapsed, 2),
+        "videos_per_minute": round(processed / elapsed * 60, 1),
+        "harvest_ms": {
+            key: round(summary.get("harvest", {}).get(key, 0) * 1000, 2)
+            for key in ("p50", "p95", "max")
+        },
+        "scroll_ms": {
+            key: round(summary.get("scroll", {}).get(key, 0) * 1000, 2)
+            for key in ("p50", "p95", "max")
+        },
+        "requests_served": server.requests_served,
+        "peak_browser_rss_mb": (
+            round(rss.peak_mb, 1) if rss.peak_mb is not None else None
+        ),
+    }
+
+
+def find_regressions(
+    results: list[dict], baseline: list[dict], tolerance: float
+) -> list[str]:
+    """
+    Compares videos/minute with a saved baseline and describes every
+    scenario that got slower by more than the tolerance (0.1 = 10%).
+    """
+    baseline_by_name = {entry["scenario"]: entry for entry in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline_by_name.get(result["scenario"])
+        if not previous:
+            continue
+        limit = previous["videos_per_minute"] * (1 - tolerance)
+        if result["videos_per_minute"] < limit:
+            regressions.append(
+                f"{result['scenario']}: {result['videos_per_minute']} "
+                f"videos/min, baseline {previous['videos_per_minute']}"
+            )
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parses command line options of the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Throughput benchmark against the mock TikTok site."
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable, default: all).",
+    )
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--watch-seconds", type=int, default=0)
+    parser.add_argument(
+        "--output", help="Write the results as JSON to this file."
+    )
+    parser.add_argument(
+        "--baseline", help="JSON results of an earlier run to compare with."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed videos/minute drop against the baseline "
+        "(default: 0.1 = 10%%).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Runs the selected scenarios and reports (and checks) the results."""
+    args = parse_args(argv)
+    results = []
+
+    for name in args.scenario or sorted(SCENARIOS):
+        result = run_scenario(
+            name, args.videos, args.cards, args.latency_ms, args.watch_seconds
+        )
+        logger.info(
+            f"Benchmark '{name}': {result['videos_per_minute']} videos/min, "
+            f"harvest p95 {result['harvest_ms']['p95']} ms."
+        )
+        results.append(result)
+
+    report = {"results": results}
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for regression in regressions:
+            logger.error(f"Throughput regression: {regression}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,25 @@
+import atexit
+import gzip
+import json
 import logging
 import os
+import queue
+import shutil
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+
+from src.config import (
+    LOG_FORMAT,
+    LOG_ROTATION,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+)
 
 
 # Get the directory where the current script (logger.py) is located
@@ -13,17 +31,73 @@ PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
 # Define the logs directory relative to the project root
 LOG_DIR = os.path.join(PROJECT_ROOT, "logs")
 
-# Define the log file path with a timestamp
-LOG_FILE_PATH = os.path.join(
-    LOG_DIR,
-    f"tiktok_automation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log",
-)
+# Define the log file path, older logs are rotated next to it
+LOG_FILE_PATH = os.path.join(LOG_DIR, "tiktok_automation.log")
+
+# Background listener writing the queued records (set by setup_logger)
+listener: QueueListener | None = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats every record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(
+                record.created, tz=timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.process,
+            "message": record.getMessage(),
+        }
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _gzip_namer(name: str) -> str:
+    """Names rotated log files with a .gz suffix."""
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, destination: str):
+    """Compresses the rotated log file and removes the original."""
+    with open(source, "rb") as source_file:
+        with gzip.open(destination, "wb") as destination_file:
+            shutil.copyfileobj(source_file, destination_file)
+    os.remove(source)
 
 
-def setup_logger():
+def _create_file_handler(rotation: str) -> logging.FileHandler:
+    """Creates the size- or time-rotated, compressed file handler."""
+    if rotation == "time":
+        file_handler = TimedRotatingFileHandler(
+            LOG_FILE_PATH,
+            when="midnight",
+            backupCount=LOG_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True,
+        )
+    else:
+        file_handler = RotatingFileHandler(
+            LOG_FILE_PATH,
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True,
+        )
+    file_handler.namer = _gzip_namer
+    file_handler.rotator = _gzip_rotator
+    return file_handler
+
+
+def setup_logger(log_format: str = LOG_FORMAT, rotation: str = LOG_ROTATION):
     """
     Sets up a logger that outputs to both the console and a file.
+    Logging calls only put the record on a queue; a background listener
+    thread does the actual console and file writes.
     """
+    global listener
+
     logger = logging.getLogger("tiktok_automation_logger")
     logger.setLevel(logging.INFO)
 
@@ -44,13 +118,27 @@ def setup_logger():
         console_handler.setStream(sys.stdout)
         console_handler.stream.reconfigure(encoding="utf-8", errors="replace")
 
-        logger.addHandler(console_handler)
-
         # File Handler
-        file_handler = logging.FileHandler(LOG_FILE_PATH, encoding="utf-8")
+        file_handler = _create_file_handler(rotation)
         file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        file_handler.setFormatter(
+            JsonLinesFormatter() if log_format == "json" else formatter
+        )
+
+        # The hot path only enqueues, the listener does the I/O
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+
+        listener = QueueListener(
+            log_queue,
+            console_handler,
+            file_handler,
+            respect_handler_level=True,
+        )
+        listener.start()
+
+        # Flush the queue before the interpreter exits
+        atexit.register(listener.stop)
 
     return logger
 
@@ -0,0 +1,110 @@
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Page, Response
+
+from logs.logger import logger
+from src.config import FEED_API_URL_PATTERNS
+
+
+def is_search_results_url(url: str) -> bool:
+    """Whether url is a tag or video search results page."""
+    return "/tag/" in url or "/search/video" in url
+
+
+def is_feed_api_response(response: Response) -> bool:
+    """Whether the response is a search or feed API page of videos."""
+    return response.ok and any(
+        pattern in response.url for pattern in FEED_API_URL_PATTERNS
+    )
+
+
+def extract_video_items(payload: dict) -> list[dict]:
+    """
+    Video items of a search ("data": [{"item": ...}]) or feed
+    ("itemList": [...]) API payload; entries without a video are dropped.
+    """
+    if not isinstance(payload, dict):
+        return []
+    items = [entry.get("item") for entry in payload.get("data") or []] + list(
+        payload.get("itemList") or []
+    )
+    return [
+        item
+        for item in items
+        if isinstance(item, dict)
+        and item.get("id")
+        and (item.get("author") or {}).get("uniqueId")
+    ]
+
+
+def feed_has_more(payload: dict) -> bool | None:
+    """
+    Whether an API payload says more results follow ("has_more" of the
+    search API, "hasMore" of the feed API), None if it does not tell.
+    """
+    if not isinstance(payload, dict):
+        return None
+    has_more = payload.get("has_more", payload.get("hasMore"))
+    return None if has_more is None else bool(has_more)
+
+
+def video_link(origin: str, item: dict) -> str:
+    """Normalized link of a video item, as harvested from the DOM."""
+    return f"{origin}/@{item['author']['uniqueId']}/video/{item['id']}"
+
+
+class ApiHarvester:
+    """
+    Collects the search/feed API responses of a page and turns their
+    JSON into video links, without waiting for the cards to render.
+    Attach it before the search so the first results page is included.
+    Responses received while the page is not on search results (e.g. a
+    video opened in the same tab, which loads its own recommendations)
+    are ignored. has_more tells whether the last API page drained
+    announced more.
+    """
+
+    def __init__(self, page: Page):
+        self.page = page
+        self._responses: list[Response] = []
+        self.has_more = True
+        page.on("response", self._on_response)
+
+    def _on_response(self, response: Response):
+        """Only queues the response, it is parsed by drain()."""
+        if is_feed_api_response(response) and is_search_results_url(
+            self.page.url
+        ):
+            self._responses.append(response)
+
+    @property
+    def pending(self) -> int:
+        """Number of API responses not drained yet."""
+        return len(self._responses)
+
+    def drain(self) -> list[str]:
+        """Returns the links of all videos received since the last drain."""
+        responses, self._responses = self._responses, []
+        links = []
+        for response in responses:
+            try:
+                payload = response.json()
+            except Exception as e:
+                logger.warning(f"Could not parse {response.url}: {e}")
+                continue
+
+            has_more = feed_has_more(payload)
+            if has_more is not None:
+                self.has_more = has_more
+            parts = urlsplit(response.url)
+            origin = f"{parts.scheme}://{parts.netloc}"
+            links.extend(
+                video_link(origin, item)
+                for item in extract_video_items(payload)
+            )
+        return links
+
+    def close(self):
+        """Stops listening to the page's responses."""
+        self.page.remove_listener("response", self._on_response)
+        self._responses.clear()
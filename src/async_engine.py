@@ -0,0 +1,382 @@
+import asyncio
+import os
+import random
+
+from playwright.async_api import (
+    async_playwright,
+    expect,
+    Browser,
+    Page,
+    BrowserContext,
+    Playwright,
+)
+
+from logs.logger import logger
+from src.clock import clock
+from src.config import (
+    STORAGE_STATE_PATH,
+    HEADLESS,
+    TIKTOK_BASE_URL,
+    DEFAULT_SEARCH_QUERY,
+    DEFAULT_SKIP_PERCENT,
+    MIN_WATCH_DURATION_SECONDS,
+    MAX_WATCH_DURATION_SECONDS,
+    MAX_FEED_SCROLLS,
+    MAX_VIDEOS_TO_PROCESS,
+    SESSION_READY_TIMEOUT_MS,
+    SEARCH_NAVIGATION_TIMEOUT_MS,
+    SEARCH_RESULTS_TIMEOUT_MS,
+    SCROLL_READY_TIMEOUT_MS,
+    VIDEO_READY_TIMEOUT_MS,
+)
+from src.readiness import (
+    CARD_COUNT_ABOVE_SCRIPT,
+    SEARCH_INPUT_SELECTOR,
+    VIDEO_CAN_PLAY_SCRIPT,
+    async_wait_until_ready,
+)
+from src.metrics import phase_timings
+from src.resilience import adaptive_timeouts
+from src.routing import async_apply_routing_profile
+from src.search import is_search_results_url
+from src.viewer import (
+    HARVEST_NEW_VIDEO_LINKS_SCRIPT,
+    SCROLL_TO_BOTTOM_SCRIPT,
+    SEARCH_VIDEO_CARD_SELECTOR,
+    get_video_id,
+)
+
+
+async def _async_perform_login_and_save_session(
+    context: BrowserContext,
+) -> Page:
+    """
+    Async counterpart of _perform_login_and_save_session in src/auth.py.
+    """
+    page = await context.new_page()
+    await page.goto(f"{TIKTOK_BASE_URL}/login")
+    logger.info(
+        "⏳ Please log in manually. Waiting for login completion (max 90s)..."
+    )
+
+    try:
+        await page.wait_for_url(
+            lambda url: url.startswith(TIKTOK_BASE_URL)
+            and "/login" not in url,
+            timeout=90000,
+        )
+        logger.info("✅ Login detected and page loaded.")
+    except Exception as e:
+        logger.warning(f"Login not detected within timeout or error: {e}.")
+        raise RuntimeError(
+            "Failed to log in to TikTok within the allotted time."
+        ) from e
+
+    await context.storage_state(path=STORAGE_STATE_PATH)
+    logger.info("✅ Session saved.")
+
+    return page
+
+
+async def _async_reuse_session(context: BrowserContext) -> Page:
+    """Internal helper: Loads saved session and returns the page."""
+    page = await context.new_page()
+    await page.goto(f"{TIKTOK_BASE_URL}/", wait_until="commit")
+    await async_wait_until_ready(
+        "search input",
+        lambda timeout: page.locator(SEARCH_INPUT_SELECTOR).wait_for(
+            state="attached", timeout=timeout
+        ),
+        SESSION_READY_TIMEOUT_MS,
+    )
+    logger.info("✅ Session loaded. You're logged in.")
+    return page
+
+
+async def async_get_authenticated_page_and_context(
+    p: Playwright | None = None,
+    login_lock: asyncio.Lock | None = None,
+    headless: bool = HEADLESS,
+) -> tuple[Page, BrowserContext, Playwright]:
+    """
+    Async version of get_authenticated_page_and_context.
+
+    Pass an already started Playwright instance to share one driver
+    between sessions, and a lock so that only one session performs
+    the manual login while the others wait and reuse its saved state.
+    """
+    if p is None:
+        p = await async_playwright().start()
+    browser = await p.chromium.launch(headless=headless)
+
+    try:
+        return await _async_open_session(browser, p, login_lock)
+    except BaseException:
+        # The caller only gets the browser back through the context
+        await browser.close()
+        raise
+
+
+async def _async_open_session(
+    browser: Browser, p: Playwright, login_lock: asyncio.Lock | None
+) -> tuple[Page, BrowserContext, Playwright]:
+    """Logs in or reuses the saved session in a new context of browser."""
+    context: BrowserContext
+    page: Page
+
+    async with login_lock or asyncio.Lock():
+        if not os.path.exists(STORAGE_STATE_PATH):
+            logger.info(
+                "No saved session found. Starting manual login process."
+            )
+            context = await browser.new_context()
+            await async_apply_routing_profile(context)
+            page = await _async_perform_login_and_save_session(context)
+            return page, context, p
+
+    logger.info("Saved session found. Attempting to reuse session.")
+    context = await browser.new_context(storage_state=STORAGE_STATE_PATH)
+    await async_apply_routing_profile(context)
+    page = await _async_reuse_session(context)
+
+    return page, context, p
+
+
+async def async_perform_search(page: Page, query: str = DEFAULT_SEARCH_QUERY):
+    """
+    Async version of perform_search, with the same timeouts, adaptive
+    waits and phase timings. It always types into the search box: the
+    direct search URL and the results cache are not supported here.
+    """
+    if not query:
+        query = DEFAULT_SEARCH_QUERY
+
+    logger.info(f"Starting search for query: '{query}'")
+
+    try:
+        with phase_timings.span("search"):
+            search_input = page.locator(SEARCH_INPUT_SELECTOR)
+            await expect(search_input).to_be_visible()
+            await expect(search_input).to_be_enabled()
+            logger.info("Found search input field.")
+
+            # Also set when starting from a previous results page
+            previous_url = page.url
+
+            await search_input.fill(query)
+            logger.info(f"Entered search query: '{query}'")
+            await page.keyboard.press("Enter")
+            logger.info("Pressed Enter to submit search.")
+
+            with adaptive_timeouts.track(
+                "search navigation", SEARCH_NAVIGATION_TIMEOUT_MS
+            ) as timeout_ms:
+                await page.wait_for_url(
+                    lambda url: is_search_results_url(url)
+                    and url != previous_url,
+                    timeout=timeout_ms,
+                    wait_until="commit",
+                )
+            logger.info("Successfully navigated to search results page.")
+
+            await async_wait_until_ready(
+                "search results",
+                lambda timeout: page.wait_for_function(
+                    CARD_COUNT_ABOVE_SCRIPT,
+                    arg=[SEARCH_VIDEO_CARD_SELECTOR, 0],
+                    timeout=timeout,
+                ),
+                SEARCH_RESULTS_TIMEOUT_MS,
+            )
+        logger.info("Search completed successfully.")
+
+    except Exception as e:
+        logger.error(f"Error during search: {e}")
+        raise
+
+
+async def _async_wait_for_more_cards(page: Page, card_count: int) -> bool:
+    """Waits until the feed holds more than card_count video cards."""
+    return await async_wait_until_ready(
+        "more video cards",
+        lambda timeout: page.wait_for_function(
+            CARD_COUNT_ABOVE_SCRIPT,
+            arg=[SEARCH_VIDEO_CARD_SELECTOR, card_count],
+            timeout=timeout,
+        ),
+        SCROLL_READY_TIMEOUT_MS,
+    )
+
+
+async def async_watch_tiktok_feed(
+    page: Page,
+    skip_percent: int = DEFAULT_SKIP_PERCENT,
+    max_videos_to_process: int = MAX_VIDEOS_TO_PROCESS,
+) -> int:
+    """
+    Async version of watch_tiktok_feed.
+    Returns the number of unique videos processed.
+    It covers the basic scroll/harvest/watch loop only: videos play in
+    the results tab, and the seen-video index, network harvesting,
+    prefetching, parallel tabs, checkpoints, the memory governor and the
+    circuit breaker are not supported (main rejects the options for them
+    in the concurrent modes).
+    """
+    logger.info(
+        f"Starting to watch TikTok feed with {skip_percent}% skip chance."
+    )
+
+    processed_videos_count = 0
+    unique_video_urls = set()
+    scroll_count = 0
+    last_scroll_height = -1
+
+    while (
+        processed_videos_count < max_videos_to_process
+        and scroll_count < MAX_FEED_SCROLLS
+    ):
+        current_scroll_height = await page.evaluate(
+            "document.body.scrollHeight"
+        )
+        if current_scroll_height == last_scroll_height and scroll_count > 0:
+            logger.info(
+                "Reached end of scrollable content or "
+                "no new videos found after scrolling."
+            )
+            break
+
+        last_scroll_height = current_scroll_height
+
+        logger.info(
+            f"Scrolling down the feed "
+            f"(Scroll {scroll_count + 1}/{MAX_FEED_SCROLLS})..."
+        )
+        card_count = await page.evaluate(
+            SCROLL_TO_BOTTOM_SCRIPT, SEARCH_VIDEO_CARD_SELECTOR
+        )
+        await _async_wait_for_more_cards(page, card_count or 0)
+        scroll_count += 1
+
+        video_links = (
+            await page.evaluate(
+                HARVEST_NEW_VIDEO_LINKS_SCRIPT, SEARCH_VIDEO_CARD_SELECTOR
+            )
+            or []
+        )
+        logger.info(f"Harvested {len(video_links)} new video links.")
+
+        new_videos_found_this_scroll = False
+
+        for video_url in video_links:
+            try:
+                if video_url in unique_video_urls:
+                    continue
+
+                unique_video_urls.add(video_url)
+                new_videos_found_this_scroll = True
+                processed_videos_count += 1
+
+                video_id = get_video_id(video_url)
+
+                should_skip = random.randint(1, 100) <= skip_percent
+
+                if should_skip:
+                    logger.info(
+                        f"Video ID: {video_id}, Link: {video_url} - Skipped."
+                    )
+                else:
+                    logger.info(
+                        f"Video ID: {video_id}, "
+                        f"Link: {video_url} - Watching..."
+                    )
+                    await page.goto(video_url, wait_until="commit")
+                    await async_wait_until_ready(
+                        "video playback",
+                        lambda timeout: page.wait_for_function(
+                            VIDEO_CAN_PLAY_SCRIPT, timeout=timeout
+                        ),
+                        VIDEO_READY_TIMEOUT_MS,
+                    )
+
+                    watch_time = random.randint(
+                        MIN_WATCH_DURATION_SECONDS, MAX_WATCH_DURATION_SECONDS
+                    )
+                    logger.info(f"Watching video for {watch_time} seconds.")
+                    # Yields to the other sessions while this one "watches"
+                    await clock.async_sleep(watch_time)
+
+                    logger.info(
+                        f"Video ID: {video_id}, Link: {video_url} "
+                        f"- Watched fully. Returning to search results."
+                    )
+                    await page.go_back(wait_until="commit")
+                    await _async_wait_for_more_cards(page, 0)
+
+                if processed_videos_count >= max_videos_to_process:
+                    logger.info(
+                        f"Reached maximum number of "
+                        f"videos to process: {max_videos_to_process}."
+                    )
+                    break
+
+            except Exception as e:
+                logger.error(f"Error processing video link {video_url}: {e}")
+                continue
+
+        if processed_videos_count >= max_videos_to_process:
+            break
+
+        if (
+            not new_videos_found_this_scroll
+            and scroll_count > 0
+            and processed_videos_count > 0
+        ):
+            logger.info(
+                "No new unique videos found after scrolling. "
+                "Ending feed watch."
+            )
+            break
+
+    logger.info(
+        f"Finished watching TikTok feed. "
+        f"Processed {processed_videos_count} unique videos."
+    )
+    return processed_videos_count
+
+
+async def run_feed_session(
+    p: Playwright,
+    session_number: int,
+    login_lock: asyncio.Lock,
+    query: str = DEFAULT_SEARCH_QUERY,
+    headless: bool = HEADLESS,
+) -> int:
+    """
+    Runs one login -> search -> watch session on the shared Playwright
+    instance and closes its context afterwards.
+    Returns the number of processed videos (0 on failure).
+    """
+    logger.info(f"[session {session_number}] Starting feed session.")
+    context = None
+
+    try:
+        page, context, _ = await async_get_authenticated_page_and_context(
+            p, login_lock, headless
+        )
+        await async_perform_search(page, query)
+        return await async_watch_tiktok_feed(page)
+
+    except Exception as e:
+        logger.error(
+            f"[session {session_number}] An error occurred "
+            f"during the session: {e}"
+        )
+        return 0
+
+    finally:
+        if context:
+            browser = context.browser
+            await context.close()
+            if browser:
+                await browser.close()
+            logger.info(f"[session {session_number}] Browser closed.")
@@ -1,28 +1,51 @@
+import json
 import os
 import time
 from playwright.sync_api import (
     sync_playwright,
+    Browser,
     Page,
     BrowserContext,
     Playwright,
 )
-from src.config import STORAGE_STATE_PATH
+from src.config import (
+    BROWSER_DAEMON_CDP_URL,
+    HEADLESS,
+    LAUNCH_MODE,
+    PERSISTENT_PROFILE_DIR,
+    STORAGE_STATE_PATH,
+    TIKTOK_BASE_URL,
+    SESSION_READY_TIMEOUT_MS,
+    ROUTING_PROFILE,
+)
+from src.har import har_recording_options, replay_har
+from src.metrics import phase_timings
+from src.routing import apply_routing_profile
+from src.readiness import SEARCH_INPUT_SELECTOR, navigate, wait_until_ready
+from src.session_state import (
+    are_cookies_fresh,
+    is_session_fresh,
+    session_expires_at,
+)
 from logs.logger import logger
 
 
-def _perform_login_and_save_session(context: BrowserContext) -> Page:
+def _perform_login_and_save_session(
+    context: BrowserContext, storage_state_path: str = STORAGE_STATE_PATH
+) -> Page:
     """
     Manages manual user login and saves the authenticated session to a file.
     """
     page = context.new_page()
-    page.goto("https://www.tiktok.com/login")
+    page.goto(f"{TIKTOK_BASE_URL}/login")
     logger.info(
         "⏳ Please log in manually. Waiting for login completion (max 90s)..."
     )
 
     try:
         page.wait_for_url(
-            lambda url: "tiktok.com/" in url and "/login" not in url,
+            lambda url: url.startswith(TIKTOK_BASE_URL)
+            and "/login" not in url,
             timeout=90000,
         )
         logger.info("✅ Login detected and page loaded.")
@@ -32,41 +55,208 @@ def _perform_login_and_save_session(context: BrowserContext) -> Page:
             "Failed to log in to TikTok within the allotted time."
         ) from e
 
-    context.storage_state(path=STORAGE_STATE_PATH)
+    context.storage_state(path=storage_state_path)
     logger.info("✅ Session saved.")
 
     return page
 
 
-def _reuse_session(context: BrowserContext) -> Page:
-    """Internal helper: Loads saved session and returns the page."""
-    page = context.new_page()
-    page.goto("https://www.tiktok.com/")
+def _reuse_session(context: BrowserContext, page: Page | None = None) -> Page:
+    """
+    Internal helper: Loads saved session and returns the page
+    (a new one unless page is given).
+    """
+    page = page or context.new_page()
+    navigate(page, f"{TIKTOK_BASE_URL}/", "home page navigation")
+    # The page is usable as soon as the search input is in the DOM
+    wait_until_ready(
+        "search input",
+        lambda timeout: page.locator(SEARCH_INPUT_SELECTOR).wait_for(
+            state="attached", timeout=timeout
+        ),
+        SESSION_READY_TIMEOUT_MS,
+    )
     logger.info("✅ Session loaded. You're logged in.")
-    time.sleep(3)  # Give it a moment to load
     return page
 
 
-def get_authenticated_page_and_context() -> (
-    tuple[Page, BrowserContext, Playwright]
-):
+def _open_saved_session(
+    context: BrowserContext, storage_state_path: str, page: Page | None = None
+) -> Page:
     """
-    Launches Playwright, handles login, and returns the active page,
-    browser context, and Playwright instance.
+    Returns a page of a context holding the saved session. While the
+    session cookies are fresh the validation navigation is skipped and
+    the page stays blank until the search opens TikTok.
+    """
+    if is_session_fresh(storage_state_path):
+        logger.info(
+            f"✅ Session cookies valid until "
+            f"{time.ctime(session_expires_at(storage_state_path))}, "
+            "skipping session check."
+        )
+        return page or context.new_page()
+    if page:
+        return _reuse_session(context, page)
+    return _reuse_session(context)
+
+
+def restore_session_cookies(
+    context: BrowserContext, storage_state_path: str
+) -> bool:
+    """
+    Adds the cookies of a saved storage state to a persistent context
+    (which cannot be created from a storage state). Returns False when
+    there is no saved session.
+    """
+    if not os.path.exists(storage_state_path):
+        return False
+    with open(storage_state_path, encoding="utf-8") as state_file:
+        cookies = json.load(state_file).get("cookies", [])
+    context.add_cookies(cookies)
+    return True
+
+
+def open_authenticated_page(
+    browser: Browser,
+    storage_state_path: str | None = None,
+    routing_profile: str = ROUTING_PROFILE,
+    record_har_path: str | None = None,
+    replay_har_path: str | None = None,
+) -> tuple[Page, BrowserContext]:
+    """
+    Opens a new context on an already launched browser, logging in or
+    reusing the session saved at storage_state_path. Requests of the
+    context are filtered by the given routing profile, recorded into
+    record_har_path and/or served from the recording at replay_har_path.
     """
-    p = sync_playwright().__enter__()
-    browser = p.chromium.launch(headless=False)
+    storage_state_path = storage_state_path or STORAGE_STATE_PATH
 
     context: BrowserContext
     page: Page
 
-    if not os.path.exists(STORAGE_STATE_PATH):
+    if not os.path.exists(storage_state_path):
         logger.info("No saved session found. Starting manual login process.")
-        context = browser.new_context()
-        page = _perform_login_and_save_session(context)
+        context = browser.new_context(**har_recording_options(record_har_path))
+        apply_routing_profile(context, routing_profile)
+        replay_har(context, replay_har_path)
+        page = _perform_login_and_save_session(context, storage_state_path)
     else:
         logger.info("Saved session found. Attempting to reuse session.")
-        context = browser.new_context(storage_state=STORAGE_STATE_PATH)
-        page = _reuse_session(context)
+        context = browser.new_context(
+            storage_state=storage_state_path,
+            **har_recording_options(record_har_path),
+        )
+        apply_routing_profile(context, routing_profile)
+        replay_har(context, replay_har_path)
+        page = _open_saved_session(context, storage_state_path)
+
+    return page, context
+
+
+def open_persistent_page(
+    p: Playwright,
+    storage_state_path: str | None = None,
+    headless: bool = HEADLESS,
+    profile_dir: str = PERSISTENT_PROFILE_DIR,
+    routing_profile: str = ROUTING_PROFILE,
+    record_har_path: str | None = None,
+    replay_har_path: str | None = None,
+) -> tuple[Page, BrowserContext]:
+    """
+    Launches a persistent context on profile_dir, which keeps cookies
+    and the HTTP cache between runs, restores the saved session into it
+    and logs in if there is none. HAR recording and replay work as in
+    open_authenticated_page.
+    """
+    storage_state_path = storage_state_path or STORAGE_STATE_PATH
+
+    context = p.chromium.launch_persistent_context(
+        profile_dir,
+        headless=headless,
+        **har_recording_options(record_har_path),
+    )
+    apply_routing_profile(context, routing_profile)
+    replay_har(context, replay_har_path)
+    first_page = context.pages[0] if context.pages else None
+
+    if restore_session_cookies(context, storage_state_path):
+        logger.info("Saved session restored into the persistent profile.")
+        page = _open_saved_session(context, storage_state_path, first_page)
+    else:
+        logger.info("No saved session found. Starting manual login process.")
+        page = _perform_login_and_save_session(context, storage_state_path)
+
+    return page, context
+
+
+def get_authenticated_page_and_context(
+    storage_state_path: str | None = None,
+    headless: bool = HEADLESS,
+    launch_mode: str = LAUNCH_MODE,
+    record_har_path: str | None = None,
+    replay_har_path: str | None = None,
+) -> tuple[Page, BrowserContext, Playwright]:
+    """
+    Launches Playwright, handles login, and returns the active page,
+    browser context, and Playwright instance.
+    launch_mode "persistent" uses a persistent profile directory instead
+    of a fresh context; closing that context also closes the browser.
+    With record_har_path the traffic of the context is recorded into a
+    HAR file when it closes; with replay_har_path it is served from such
+    a recording instead of the network.
+    """
+    with phase_timings.span("login"):
+        p = sync_playwright().__enter__()
+
+        if launch_mode == "persistent":
+            page, context = open_persistent_page(
+                p,
+                storage_state_path,
+                headless,
+                record_har_path=record_har_path,
+                replay_har_path=replay_har_path,
+            )
+        else:
+            browser = p.chromium.launch(headless=headless)
+            page, context = open_authenticated_page(
+                browser,
+                storage_state_path,
+                record_har_path=record_har_path,
+                replay_har_path=replay_har_path,
+            )
+
+    return page, context, p
+
+
+def attach_to_browser_daemon(
+    cdp_url: str = BROWSER_DAEMON_CDP_URL,
+    routing_profile: str = ROUTING_PROFILE,
+) -> tuple[Page, BrowserContext, Playwright]:
+    """
+    Connects over CDP to the warm browser of the daemon (src/daemon.py)
+    and opens a page in its already authenticated context. As for a
+    saved session, the validation navigation is skipped while the
+    context's session cookies are fresh.
+    The context belongs to the daemon: close only the page when done.
+    """
+    with phase_timings.span("login"):
+        p = sync_playwright().start()
+        try:
+            browser = p.chromium.connect_over_cdp(cdp_url)
+        except Exception:
+            p.stop()
+            raise
+        logger.info(f"✅ Attached to browser daemon at {cdp_url}.")
+
+        context = browser.contexts[0]
+        page = context.new_page()
+        # Routes are set on this page only, they go away with it
+        apply_routing_profile(page, routing_profile)
+        if are_cookies_fresh(context.cookies()):
+            logger.info(
+                "✅ Daemon session cookies are fresh, skipping session check."
+            )
+        else:
+            _reuse_session(context, page)
 
     return page, context, p
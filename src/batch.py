@@ -0,0 +1,129 @@
+from typing import NamedTuple
+
+from playwright.sync_api import Page
+
+from logs.logger import logger
+from src.api_harvest import ApiHarvester
+from src.checkpoint import FeedCheckpoint
+from src.config import (
+    DEFAULT_SEARCH_QUERY,
+    HARVEST_MODE,
+    MAX_VIDEOS_TO_PROCESS,
+    PARALLEL_WATCH_TABS,
+    SEARCH_MODE,
+)
+from src.results_cache import ResultsCache
+from src.search import perform_search
+from src.seen_index import SeenVideoIndex
+from src.viewer import watch_tiktok_feed
+
+
+class QueryTask(NamedTuple):
+    """A search query and the number of videos to process for it."""
+
+    query: str
+    max_videos: int = MAX_VIDEOS_TO_PROCESS
+
+
+def parse_query(text: str, default_max_videos: int) -> QueryTask:
+    """
+    Parses "query" or "query,max_videos" (the budget is only taken from
+    a trailing number, so queries may contain commas themselves).
+    """
+    query, separator, budget = text.strip().rpartition(",")
+    if separator and budget.strip().isdigit():
+        return QueryTask(query.strip(), int(budget))
+    return QueryTask(text.strip(), default_max_videos)
+
+
+def load_queries(
+    path: str, default_max_videos: int = MAX_VIDEOS_TO_PROCESS
+) -> list[QueryTask]:
+    """Reads one query per line, skipping blank lines and # comments."""
+    with open(path, encoding="utf-8") as queries_file:
+        return [
+            parse_query(line, default_max_videos)
+            for line in queries_file
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+def run_query_batch(
+    page: Page,
+    queries: list[QueryTask],
+    seen_index: SeenVideoIndex | None = None,
+    results_cache: ResultsCache | None = None,
+    search_mode: str = SEARCH_MODE,
+    harvest_mode: str = HARVEST_MODE,
+    checkpoint: FeedCheckpoint | None = None,
+    parallel_tabs: int = PARALLEL_WATCH_TABS,
+) -> dict[tuple[int, str], int]:
+    """
+    Runs the queries back-to-back on the same authenticated page and
+    returns the number of processed videos per (position, query), so a
+    query repeated in the batch is counted once per run. A failing query
+    is logged and the batch moves on to the next one.
+    Queries repeated within the TTL of results_cache start with their
+    cached results. With harvest_mode="network" video links are read
+    from the feed API responses, listened to from before the search.
+    Progress is saved to checkpoint: queries it lists as completed (by
+    position in queries) are skipped and the feed in progress is
+    resumed. The checkpoint is removed once every query has completed.
+    With parallel_tabs above 1 each feed watches that many videos at
+    the same time.
+    """
+    if not queries:
+        queries = [QueryTask(DEFAULT_SEARCH_QUERY)]
+    if checkpoint:
+        checkpoint.set_queries(queries)
+
+    results = {}
+    for position, task in enumerate(queries):
+        number = position + 1
+        if checkpoint and checkpoint.is_completed(position):
+            logger.info(f"Query '{task.query}' already completed, skipping.")
+            continue
+        if checkpoint:
+            checkpoint.start_query(position, task.query)
+
+        logger.info(
+            f"Query {number}/{len(queries)}: '{task.query}' "
+            f"(up to {task.max_videos} videos)."
+        )
+        api_harvester = (
+            ApiHarvester(page) if harvest_mode == "network" else None
+        )
+        try:
+            cached_links = perform_search(
+                page, task.query, search_mode, results_cache
+            )
+            results[position, task.query] = watch_tiktok_feed(
+                page,
+                max_videos_to_process=task.max_videos,
+                seen_index=seen_index,
+                initial_links=cached_links,
+                api_harvester=api_harvester,
+                checkpoint=checkpoint,
+                parallel_tabs=parallel_tabs,
+            )
+            if checkpoint:
+                checkpoint.finish_query(position)
+        except Exception as e:
+            logger.error(f"Query '{task.query}' failed: {e}")
+            results[position, task.query] = 0
+            if checkpoint:
+                checkpoint.save()
+        finally:
+            if api_harvester:
+                api_harvester.close()
+
+    if checkpoint and all(
+        checkpoint.is_completed(position) for position in range(len(queries))
+    ):
+        checkpoint.clear()
+
+    logger.info(
+        f"Batch finished: {sum(results.values())} videos processed "
+        f"over {len(queries)} queries."
+    )
+    return results
@@ -0,0 +1,157 @@
+import json
+import os
+import time
+
+from logs.logger import logger
+from src.config import CHECKPOINT_EVERY_VIDEOS, CHECKPOINT_PATH
+from src.metrics import write_atomically
+
+
+class FeedCheckpoint:
+    """
+    Progress of a batch run: its queries, the positions (in queries) of
+    the queries already completed and the state of the feed in progress
+    (processed links, counters and the last harvested link). Queries are
+    tracked by position, so a query repeated in the batch runs each time.
+    Saved to path every every_videos processed videos, so a run started
+    with --resume continues where a failed one stopped instead of
+    starting again from the first scroll.
+    """
+
+    def __init__(
+        self,
+        path: str = CHECKPOINT_PATH,
+        every_videos: int = CHECKPOINT_EVERY_VIDEOS,
+    ):
+        self.path = path
+        self.every_videos = max(1, every_videos)
+        self.queries: list[tuple[str, int]] = []
+        self.completed_positions: list[int] = []
+        self._reset_feed(None, None)
+        self._unsaved_videos = 0
+
+    def _reset_feed(self, position: int | None, query: str | None):
+        self.position = position
+        self.query = query
+        self.processed_urls: list[str] = []
+        self.processed_videos_count = 0
+        self.scroll_count = 0
+        self.last_harvested_url: str | None = None
+
+    @classmethod
+    def load(cls, path: str = CHECKPOINT_PATH) -> "FeedCheckpoint | None":
+        """Reads a saved checkpoint, or returns None if there is none."""
+        try:
+            with open(path, encoding="utf-8") as checkpoint_file:
+                state = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+        checkpoint = cls(path)
+        checkpoint.queries = [tuple(task) for task in state["queries"]]
+        checkpoint.completed_positions = state["completed_positions"]
+        feed = state["feed"]
+        checkpoint.position = feed["position"]
+        checkpoint.query = feed["query"]
+        checkpoint.processed_urls = feed["processed_urls"]
+        checkpoint.processed_videos_count = feed["processed_videos_count"]
+        checkpoint.scroll_count = feed["scroll_count"]
+        checkpoint.last_harvested_url = feed["last_harvested_url"]
+        return checkpoint
+
+    def set_queries(self, queries: list[tuple[str, int]]):
+        """
+        Sets the queries of the batch. Progress recorded for other
+        queries is dropped, as its positions would not match.
+        """
+        queries = [tuple(task) for task in queries]
+        if queries != self.queries and (
+            self.completed_positions or self.position is not None
+        ):
+            logger.warning(
+                "Checkpoint was saved for other queries, starting over."
+            )
+            self.completed_positions = []
+            self._reset_feed(None, None)
+        self.queries = queries
+
+    def is_completed(self, position: int) -> bool:
+        """Whether the query at position in queries was completed."""
+        return position in self.completed_positions
+
+    def start_query(self, position: int, query: str):
+        """Starts the feed of a query, keeping its state when resuming."""
+        if (position, query) != (self.position, self.query):
+            self._reset_feed(position, query)
+            self.save()
+        elif self.processed_urls:
+            logger.info(
+                f"Resuming '{query}' after {self.processed_videos_count} "
+                f"videos and {self.scroll_count} scrolls."
+            )
+
+    def record_harvest(self, scroll_count: int, video_links: list[str]):
+        """Remembers the scroll position and the last harvested link."""
+        self.scroll_count = scroll_count
+        if video_links:
+            self.last_harvested_url = video_links[-1]
+
+    def record_video(self, video_url: str, processed_videos_count: int):
+        """Adds a handled link; saves every every_videos videos."""
+        self.processed_urls.append(video_url)
+        self.processed_videos_count = processed_videos_count
+        self._unsaved_videos += 1
+        if self._unsaved_videos >= self.every_videos:
+            self.save()
+
+    def finish_query(self, position: int):
+        """Marks the query at position as completed and saves."""
+        self.completed_positions.append(position)
+        self._reset_feed(None, None)
+        self.save()
+
+    def save(self):
+        """Writes through a temporary file so a crash never truncates it."""
+        state = {
+            "saved_at": time.time(),
+            "queries": self.queries,
+            "completed_positions": self.completed_positions,
+            "feed": {
+                "position": self.position,
+                "query": self.query,
+                "processed_urls": self.processed_urls,
+                "processed_videos_count": self.processed_videos_count,
+                "scroll_count": self.scroll_count,
+                "last_harvested_url": self.last_harvested_url,
+            },
+        }
+        write_atomically(self.path, json.dumps(state))
+        self._unsaved_videos = 0
+
+    def clear(self):
+        """Removes the saved checkpoint once the whole batch is done."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def open_checkpoint(resume: bool = False) -> FeedCheckpoint | None:
+    """
+    The saved checkpoint when resuming (a new one if there is none),
+    a new checkpoint otherwise, or None when CHECKPOINT_PATH is disabled.
+    """
+    if not CHECKPOINT_PATH:
+        return None
+    if resume:
+        checkpoint = FeedCheckpoint.load(CHECKPOINT_PATH)
+        if checkpoint:
+            completed = len(checkpoint.completed_positions)
+            logger.info(
+                f"Resuming from checkpoint: {completed}"
+                f"/{len(checkpoint.queries)} queries completed."
+            )
+            return checkpoint
+        logger.warning("No checkpoint to resume, starting from scratch.")
+    return FeedCheckpoint(CHECKPOINT_PATH)
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from contextlib import contextmanager
+
+
+class Clock:
+    """
+    Time source of the automation: every wait, watch timer and duration
+    measurement goes through it instead of the time module. Inside
+    virtual() time only advances when something sleeps (or advance() is
+    called), so simulations and tests run without waiting.
+    """
+
+    def __init__(self):
+        self.virtual_now: float | None = None
+
+    @property
+    def is_virtual(self) -> bool:
+        return self.virtual_now is not None
+
+    def time(self) -> float:
+        """Wall time in seconds since the epoch (virtual time if on)."""
+        if self.virtual_now is not None:
+            return self.virtual_now
+        return time.time()
+
+    def monotonic(self) -> float:
+        if self.virtual_now is not None:
+            return self.virtual_now
+        return time.monotonic()
+
+    def perf_counter(self) -> float:
+        if self.virtual_now is not None:
+            return self.virtual_now
+        return time.perf_counter()
+
+    def sleep(self, seconds: float):
+        if self.virtual_now is not None:
+            self.advance(seconds)
+        else:
+            time.sleep(seconds)
+
+    async def async_sleep(self, seconds: float):
+        """sleep() for coroutines; on virtual time it only yields."""
+        if self.virtual_now is not None:
+            self.advance(seconds)
+            await asyncio.sleep(0)
+        else:
+            await asyncio.sleep(seconds)
+
+    def advance(self, seconds: float):
+        """Moves virtual time forward (e.g. simulated page latency)."""
+        if self.virtual_now is not None:
+            self.virtual_now += max(0.0, seconds)
+
+    @contextmanager
+    def virtual(self, start: float = 0.0):
+        """Runs the enclosed block on virtual time starting at start."""
+        previous = self.virtual_now
+        self.virtual_now = start
+        try:
+            yield self
+        finally:
+            self.virtual_now = previous
+
+
+# Shared by every module of this process
+clock = Clock()
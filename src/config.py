@@ -1,5 +1,8 @@
 STORAGE_STATE_PATH = "tiktok_auth.json"
 
+# Site the automation runs against (e.g. the local mock site in tests)
+TIKTOK_BASE_URL = "https://www.tiktok.com"
+
 DEFAULT_SEARCH_QUERY = "cats"  # You can change this to any search term
 
 DEFAULT_SKIP_PERCENT = 12
@@ -7,3 +10,163 @@ MIN_WATCH_DURATION_SECONDS = 5
 MAX_WATCH_DURATION_SECONDS = 15
 MAX_FEED_SCROLLS = 10
 MAX_VIDEOS_TO_PROCESS = 50
+
+# Browser launch: HEADLESS hides the browser window. LAUNCH_MODE
+# "browser" launches a browser and opens a context from the saved
+# session, "persistent" uses a persistent Chromium profile directory
+# (PERSISTENT_PROFILE_DIR) that keeps its cookies and cache between runs
+HEADLESS = False
+LAUNCH_MODE = "browser"
+PERSISTENT_PROFILE_DIR = "browser_profile"
+
+# A saved session whose cookies (SESSION_COOKIE_NAMES) stay valid for at
+# least SESSION_MIN_REMAINING_SECONDS is used without first loading the
+# home page to check that it is still logged in
+SESSION_COOKIE_NAMES = ("sessionid",)
+SESSION_MIN_REMAINING_SECONDS = 60 * 60
+
+# Long-lived browser started with `python -m src.daemon`: runs started
+# with --attach connect to it over CDP instead of launching their own
+BROWSER_DAEMON_PORT = 9222
+BROWSER_DAEMON_CDP_URL = f"http://127.0.0.1:{BROWSER_DAEMON_PORT}"
+BROWSER_DAEMON_PROFILE_DIR = "browser_daemon_profile"
+
+# Directory with one Playwright storage-state file (*.json) per account,
+# used by the multi-account context pool
+ACCOUNTS_DIR = "accounts"
+CONTEXT_POOL_CONCURRENCY = 4  # Max contexts in use at the same time
+
+# Upper bounds (ms) for the condition-based waits of the hot path
+SESSION_READY_TIMEOUT_MS = 10000  # Search input attached after login
+SEARCH_RESULTS_TIMEOUT_MS = 10000  # First video cards rendered
+SCROLL_READY_TIMEOUT_MS = 5000  # Card count grew after a scroll
+VIDEO_READY_TIMEOUT_MS = 15000  # Video element reports it can play
+SEARCH_NAVIGATION_TIMEOUT_MS = 30000  # Results URL after pressing Enter
+NAVIGATION_TIMEOUT_MS = 30000  # Video or home page committed after goto
+
+# Adaptive timeouts: once ADAPTIVE_TIMEOUT_MIN_SAMPLES durations of a wait
+# are known (of its last ADAPTIVE_TIMEOUT_WINDOW), its timeout becomes
+# their ADAPTIVE_TIMEOUT_PERCENTILE plus ADAPTIVE_TIMEOUT_MARGIN_MS,
+# between ADAPTIVE_TIMEOUT_FLOOR_MS and the fixed upper bound above
+ADAPTIVE_TIMEOUTS = True
+ADAPTIVE_TIMEOUT_WINDOW = 50
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 10
+ADAPTIVE_TIMEOUT_PERCENTILE = 0.95
+ADAPTIVE_TIMEOUT_MARGIN_MS = 500
+ADAPTIVE_TIMEOUT_FLOOR_MS = 1000
+
+# Circuit breaker: CIRCUIT_BREAKER_FAILURES failed videos within
+# CIRCUIT_BREAKER_WINDOW_SECONDS pause the feed for the cooldown, which
+# doubles (up to the max) when it opens again before a video succeeded
+CIRCUIT_BREAKER_FAILURES = 3
+CIRCUIT_BREAKER_WINDOW_SECONDS = 60
+CIRCUIT_BREAKER_COOLDOWN_SECONDS = 15
+CIRCUIT_BREAKER_MAX_COOLDOWN_SECONDS = 240
+
+# How perform_search reaches the results: "ui" types the query into the
+# search box, "direct" navigates straight to the search results URL
+# (falling back to the search box if that navigation fails)
+SEARCH_MODE = "ui"
+# First results window of every query, reused by a repeated query within
+# the TTL so it can start before the grid renders (None disables it)
+RESULTS_CACHE_PATH = "results_cache.json"
+RESULTS_CACHE_TTL_SECONDS = 15 * 60
+
+# Where new video links come from: "dom" scrapes the rendered result
+# cards, "network" reads them from the search/feed API responses (JSON)
+# as soon as they arrive, before the cards are rendered
+HARVEST_MODE = "dom"
+FEED_API_URL_PATTERNS = (
+    "/api/search/item/full/",
+    "/api/search/general/full/",
+    "/api/recommend/item_list/",
+    "/api/post/item_list/",
+)
+
+# Memory governor of long feeds: PRUNE_PROCESSED_CARDS removes harvested
+# result cards from the DOM (keeping the last PRUNE_KEEP_LAST_CARDS), and
+# with a MEMORY_BUDGET_MB the JS heap of the results page is sampled
+# every MEMORY_SAMPLE_EVERY_SCROLLS scrolls and the page reloaded at the
+# same query and position when it exceeds the budget (None disables it)
+PRUNE_PROCESSED_CARDS = False
+PRUNE_KEEP_LAST_CARDS = 12
+MEMORY_BUDGET_MB = None
+MEMORY_SAMPLE_EVERY_SCROLLS = 5
+
+# Where watched videos are opened: "same" navigates the search results
+# page and goes back afterwards, "secondary" keeps the results page in
+# place and opens videos in reusable secondary tabs of the same context
+VIDEO_TAB_MODE = "same"
+VIDEO_TAB_POOL_SIZE = 1  # Number of reusable secondary tabs
+# Load the next video to watch in another secondary tab while the
+# current one is playing (only used with VIDEO_TAB_MODE = "secondary")
+PREFETCH_NEXT_VIDEO = False
+# Number of videos watched at the same time, each in its own tab of the
+# context with its own watch timer (1 = one video after the other)
+PARALLEL_WATCH_TABS = 1
+
+# HAR recording (--record-har) and offline replay (--replay-har):
+# "full" records every detail of the traffic, "minimal" only what replay
+# needs; replayed requests missing from the recording are aborted
+# ("abort", fully offline) or sent to the network ("fallback")
+HAR_RECORD_MODE = "minimal"
+HAR_REPLAY_NOT_FOUND = "abort"
+
+# Request-interception profile applied to every browser context:
+# "full" loads everything, "lean" blocks images, fonts, trackers and
+# preview videos of the search grid, "minimal" also blocks stylesheets
+# and all media (videos are then only "watched" by staying on the page,
+# and the watch timer starts once the video element exists)
+ROUTING_PROFILE = "full"
+
+# Persistent index of already processed video IDs shared between runs
+# (set to None to disable). Entries older than the TTL are ignored and
+# deleted when the index is opened. New IDs are written in batches of
+# SEEN_INDEX_COMMIT_BATCH (and when the index is closed).
+SEEN_INDEX_PATH = "seen_videos.sqlite3"
+SEEN_INDEX_TTL_SECONDS = 30 * 24 * 60 * 60
+SEEN_INDEX_BLOOM_CAPACITY = 1_000_000  # Expected number of IDs
+SEEN_INDEX_COMMIT_BATCH = 50
+
+# Job queue shared by coordinated workers (python -m src.coordinator).
+# A leased job goes back on the queue when its worker stops sending
+# heartbeats for COORDINATOR_LEASE_SECONDS, and is marked failed after
+# COORDINATOR_MAX_ATTEMPTS failed or abandoned runs
+COORDINATOR_DB_PATH = "jobs.sqlite3"
+COORDINATOR_LEASE_SECONDS = 120
+COORDINATOR_HEARTBEAT_SECONDS = 30
+COORDINATOR_MAX_ATTEMPTS = 3
+COORDINATOR_POLL_SECONDS = 10
+
+# Progress of the running batch (queries, processed videos, scroll
+# position) is saved here every CHECKPOINT_EVERY_VIDEOS videos, so
+# `--resume` can continue after a failure (None disables checkpoints)
+CHECKPOINT_PATH = "checkpoint.json"
+CHECKPOINT_EVERY_VIDEOS = 5
+
+# Per-phase timing report written at the end of every run
+METRICS_JSON_PATH = "logs/run_report.json"
+METRICS_PROMETHEUS_PATH = "logs/tiktok_automation.prom"
+
+# Opt-in browser-side profiling (--profile): CDP performance metrics at
+# most every PROFILE_SAMPLE_INTERVAL_SECONDS, resource timing of the
+# open pages after every search, scroll and navigation, and with --trace
+# a Playwright trace kept only if a phase took over the threshold.
+# Deliberate waits (watching a video, circuit breaker cooldowns) are
+# long by design and never count as slow
+PROFILE_SAMPLE_INTERVAL_SECONDS = 10
+PROFILE_TRACE_THRESHOLD_MS = 4000
+PROFILE_TRACE_IGNORED_PHASES = ("watch", "cooldown")
+PROFILE_TRACE_DIR = "logs/traces"
+PROFILE_REPORT_PATH = "logs/browser_profile.json"
+
+# Logging: "text" or "json" (one JSON object per line) for the log file,
+# rotation by "size" (LOG_MAX_BYTES) or "time" (daily at midnight);
+# rotated files are gzip-compressed and LOG_BACKUP_COUNT of them kept
+LOG_FORMAT = "text"
+LOG_ROTATION = "size"
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Seconds the browser stays open for review before closing (0 = none)
+TEARDOWN_DELAY_SECONDS = 10
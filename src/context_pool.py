@@ -0,0 +1,134 @@
+import asyncio
+import glob
+import os
+from contextlib import asynccontextmanager
+
+from playwright.async_api import Browser, BrowserContext, Playwright
+
+from logs.logger import logger
+from src.async_engine import (
+    _async_reuse_session,
+    async_perform_search,
+    async_watch_tiktok_feed,
+)
+from src.config import (
+    ACCOUNTS_DIR,
+    CONTEXT_POOL_CONCURRENCY,
+    DEFAULT_SEARCH_QUERY,
+    HEADLESS,
+)
+from src.routing import async_apply_routing_profile
+
+
+def list_account_states(accounts_dir: str = ACCOUNTS_DIR) -> list[str]:
+    """Returns the sorted storage-state file paths found in accounts_dir."""
+    return sorted(glob.glob(os.path.join(accounts_dir, "*.json")))
+
+
+class ContextPool:
+    """
+    Shares one Chromium instance between several accounts.
+
+    Every account (a storage-state file in accounts_dir) gets its own
+    BrowserContext, opened lazily on first use and kept open for reuse.
+    At most `concurrency` contexts are handed out at the same time and
+    an account is never used by two tasks at once.
+    """
+
+    def __init__(
+        self,
+        p: Playwright,
+        accounts_dir: str = ACCOUNTS_DIR,
+        concurrency: int = CONTEXT_POOL_CONCURRENCY,
+        headless: bool = HEADLESS,
+    ):
+        self.p = p
+        self.accounts_dir = accounts_dir
+        self.concurrency = concurrency
+        self.headless = headless
+
+        self.browser: Browser | None = None
+        self._contexts: dict[str, BrowserContext] = {}
+        self._free_accounts: asyncio.Queue[str] = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def start(self) -> "ContextPool":
+        """Launches the shared browser and registers the accounts."""
+        account_states = list_account_states(self.accounts_dir)
+        if not account_states:
+            raise RuntimeError(
+                f"No storage-state files found in '{self.accounts_dir}'."
+            )
+
+        self.browser = await self.p.chromium.launch(headless=self.headless)
+        for state_path in account_states:
+            self._free_accounts.put_nowait(state_path)
+
+        logger.info(
+            f"Context pool started with {len(account_states)} accounts "
+            f"and concurrency {self.concurrency}."
+        )
+        return self
+
+    async def _get_context(self, state_path: str) -> BrowserContext:
+        """Returns the open context of an account, creating it if needed."""
+        if state_path not in self._contexts:
+            context = await self.browser.new_context(storage_state=state_path)
+            await async_apply_routing_profile(context)
+            self._contexts[state_path] = context
+            logger.info(f"Opened browser context for account '{state_path}'.")
+        return self._contexts[state_path]
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Waits for a free slot and a free account, then yields
+        (account, context). Both are released when the block exits.
+        """
+        async with self._semaphore:
+            state_path = await self._free_accounts.get()
+            try:
+                yield state_path, await self._get_context(state_path)
+            finally:
+                self._free_accounts.put_nowait(state_path)
+
+    async def close(self):
+        """Closes every open context and the shared browser."""
+        for context in self._contexts.values():
+            await context.close()
+        self._contexts.clear()
+
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        logger.info("Context pool closed.")
+
+
+async def run_pooled_session(
+    pool: ContextPool,
+    session_number: int,
+    query: str = DEFAULT_SEARCH_QUERY,
+) -> int:
+    """
+    Runs one search -> watch session on a context taken from the pool.
+    Returns the number of processed videos (0 on failure).
+    """
+    async with pool.acquire() as (account, context):
+        logger.info(f"[session {session_number}] Using account '{account}'.")
+        page = None
+
+        try:
+            page = await _async_reuse_session(context)
+            await async_perform_search(page, query)
+            return await async_watch_tiktok_feed(page)
+
+        except Exception as e:
+            logger.error(
+                f"[session {session_number}] An error occurred "
+                f"during the session: {e}"
+            )
+            return 0
+
+        finally:
+            if page:
+                await page.close()
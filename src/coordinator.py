@@ -0,0 +1,367 @@
+import argparse
+import os
+import socket
+import sqlite3
+import threading
+from typing import NamedTuple
+
+from playwright.sync_api import sync_playwright
+
+from logs.logger import logger
+from src.clock import clock
+from src.config import (
+    COORDINATOR_DB_PATH,
+    COORDINATOR_HEARTBEAT_SECONDS,
+    COORDINATOR_LEASE_SECONDS,
+    COORDINATOR_MAX_ATTEMPTS,
+    COORDINATOR_POLL_SECONDS,
+    HEADLESS,
+)
+from src.workers import Job, load_jobs, run_job
+
+
+class LeasedJob(NamedTuple):
+    """A job handed to a worker, identified by its queue ID."""
+
+    id: int
+    job: Job
+    attempts: int
+
+
+class JobQueue:
+    """
+    Queue of (account, query, video budget) jobs in SQLite, shared by
+    workers that lease one job at a time. A lease lasts lease_seconds and
+    is extended by heartbeats; jobs whose lease expired are queued again,
+    up to max_attempts runs per job.
+    """
+
+    def __init__(
+        self,
+        path: str = COORDINATOR_DB_PATH,
+        lease_seconds: int = COORDINATOR_LEASE_SECONDS,
+        max_attempts: int = COORDINATOR_MAX_ATTEMPTS,
+    ):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        # Transactions are explicit, so a lease is one atomic write
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY, "
+            "account TEXT NOT NULL, "
+            "query TEXT NOT NULL, "
+            "max_videos INTEGER NOT NULL, "
+            "status TEXT NOT NULL DEFAULT 'queued', "
+            "worker TEXT, "
+            "lease_expires_at REAL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "processed INTEGER, "
+            "error TEXT, "
+            "updated_at REAL NOT NULL"
+            ")"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)"
+        )
+
+    def enqueue(self, job: Job) -> int:
+        """Adds a job to the queue and returns its ID."""
+        cursor = self._connection.execute(
+            "INSERT INTO jobs (account, query, max_videos, updated_at) "
+            "VALUES (?, ?, ?, ?)",
+            (job.account, job.query, job.max_videos, clock.time()),
+        )
+        return cursor.lastrowid
+
+    def _requeue_expired(self, now: float) -> int:
+        """Queues the jobs whose lease expired again (or fails them)."""
+        failed = self._connection.execute(
+            "UPDATE jobs SET status = 'failed', worker = NULL, "
+            "error = 'lease expired', updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires_at < ? "
+            "AND attempts >= ?",
+            (now, now, self.max_attempts),
+        ).rowcount
+        requeued = self._connection.execute(
+            "UPDATE jobs SET status = 'queued', worker = NULL, "
+            "updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires_at < ?",
+            (now, now),
+        ).rowcount
+        if failed or requeued:
+            logger.warning(
+                f"{requeued} expired job leases requeued, "
+                f"{failed} jobs out of attempts."
+            )
+        return requeued
+
+    def lease(self, worker: str) -> LeasedJob | None:
+        """Leases the oldest queued job to worker, None if there is none."""
+        now = clock.time()
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._requeue_expired(now)
+            row = self._connection.execute(
+                "SELECT id, account, query, max_videos, attempts FROM jobs "
+                "WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row:
+                self._connection.execute(
+                    "UPDATE jobs SET status = 'leased', worker = ?, "
+                    "lease_expires_at = ?, attempts = attempts + 1, "
+                    "updated_at = ? WHERE id = ?",
+                    (worker, now + self.lease_seconds, now, row[0]),
+                )
+            self._connection.execute("COMMIT")
+        except Exception:
+            self._connection.execute("ROLLBACK")
+            raise
+
+        if not row:
+            return None
+        return LeasedJob(row[0], Job(*row[1:4]), row[4] + 1)
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """
+        Extends the lease of a job. Returns False if worker no longer
+        holds it (it expired and was handed to another worker).
+        """
+        now = clock.time()
+        return bool(
+            self._connection.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (now + self.lease_seconds, now, job_id, worker),
+            ).rowcount
+        )
+
+    def complete(self, job_id: int, worker: str, processed: int) -> bool:
+        """Marks a leased job as done, False if the lease was lost."""
+        return bool(
+            self._connection.execute(
+                "UPDATE jobs SET status = 'done', processed = ?, "
+                "error = NULL, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (processed, clock.time(), job_id, worker),
+            ).rowcount
+        )
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """
+        Queues a failed job again, or marks it failed once it ran out of
+        attempts. Returns False if the lease was lost.
+        """
+        return bool(
+            self._connection.execute(
+                "UPDATE jobs SET "
+                "status = CASE WHEN attempts >= ? "
+                "THEN 'failed' ELSE 'queued' END, "
+                "worker = NULL, error = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (self.max_attempts, error, clock.time(), job_id, worker),
+            ).rowcount
+        )
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs per status."""
+        return dict(
+            self._connection.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        )
+
+    def close(self):
+        self._connection.close()
+
+
+class LeaseHeartbeat:
+    """
+    Renews a job's lease every interval_seconds from a background
+    thread while the job runs, whatever the job is doing (long watches,
+    circuit breaker cooldowns, page recycles). The thread has its own
+    database connection and never touches the Playwright objects.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        leased: LeasedJob,
+        worker: str,
+        interval_seconds: float = COORDINATOR_HEARTBEAT_SECONDS,
+    ):
+        if interval_seconds * 2 > queue.lease_seconds:
+            raise ValueError(
+                f"Heartbeat interval {interval_seconds}s is too long for "
+                f"a {queue.lease_seconds}s lease (at most half of it)."
+            )
+        self.queue = queue
+        self.leased = leased
+        self.worker = worker
+        self.interval_seconds = interval_seconds
+        self.lost = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        queue = JobQueue(
+            self.queue.path, self.queue.lease_seconds, self.queue.max_attempts
+        )
+        try:
+            while not self._stopped.wait(self.interval_seconds):
+                try:
+                    renewed = queue.heartbeat(self.leased.id, self.worker)
+                except sqlite3.Error as e:
+                    # The lease outlives one missed beat, try again
+                    logger.warning(f"Heartbeat of job {self.leased.id}: {e}")
+                    continue
+                if not renewed:
+                    self.lost = True
+                    logger.warning(
+                        f"Lease of job {self.leased.id} was lost, "
+                        "its result will be dropped."
+                    )
+                    return
+        finally:
+            queue.close()
+
+
+def default_worker_id() -> str:
+    """Identifies this worker process across the fleet."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_leased_job(
+    queue: JobQueue, leased: LeasedJob, worker: str, browser=None
+) -> dict:
+    """
+    Runs a leased job on browser while keeping its lease alive, and
+    reports the result to the queue.
+    """
+    with LeaseHeartbeat(queue, leased, worker):
+        result = run_job(leased.job, browser)
+
+    if result["error"]:
+        reported = queue.fail(leased.id, worker, result["error"])
+    else:
+        reported = queue.complete(leased.id, worker, result["processed"])
+    if not reported:
+        logger.warning(
+            f"Job {leased.id} was leased to another worker meanwhile, "
+            "its result is not recorded."
+        )
+    logger.info(
+        f"Job {leased.id} ({leased.job.account} / '{leased.job.query}', "
+        f"attempt {leased.attempts}): {result['processed']} videos, "
+        f"{'failed: ' + result['error'] if result['error'] else 'ok'}."
+    )
+    return result
+
+
+def run_worker(
+    queue: JobQueue,
+    worker: str | None = None,
+    headless: bool = HEADLESS,
+    poll_seconds: float = COORDINATOR_POLL_SECONDS,
+    exit_when_empty: bool = False,
+) -> int:
+    """
+    Leases and runs jobs on one browser until the process is stopped
+    (or, with exit_when_empty, until the queue is empty). Returns the
+    number of jobs this worker ran.
+    """
+    worker = worker or default_worker_id()
+    jobs_run = 0
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        logger.info(f"Worker {worker} waiting for jobs.")
+        try:
+            while True:
+                leased = queue.lease(worker)
+                if leased is None:
+                    if exit_when_empty:
+                        break
+                    clock.sleep(poll_seconds)
+                    continue
+                run_leased_job(queue, leased, worker, browser)
+                jobs_run += 1
+        except KeyboardInterrupt:
+            logger.info(f"Stopping worker {worker}.")
+        finally:
+            browser.close()
+
+    return jobs_run
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parses command line options of the coordinator."""
+    parser = argparse.ArgumentParser(
+        description="Queue jobs and run lease-based workers."
+    )
+    parser.add_argument(
+        "--db",
+        default=COORDINATOR_DB_PATH,
+        help=f"Job queue database (default: {COORDINATOR_DB_PATH}).",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser(
+        "enqueue", help="Add the jobs of a CSV file to the queue."
+    )
+    enqueue.add_argument(
+        "jobs", help="CSV file with one 'account,query[,N]' job per line."
+    )
+
+    work = commands.add_parser("work", help="Lease and run jobs.")
+    work.add_argument("--worker-id", default=None)
+    work.add_argument(
+        "--headless", action=argparse.BooleanOptionalAction, default=HEADLESS
+    )
+    work.add_argument(
+        "--exit-when-empty",
+        action="store_true",
+        help="Stop once no job is queued instead of polling for more.",
+    )
+
+    commands.add_parser("status", help="Show the number of jobs per status.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the selected coordinator command."""
+    args = parse_args(argv)
+    queue = JobQueue(args.db)
+    try:
+        if args.command == "enqueue":
+            jobs = load_jobs(args.jobs)
+            for job in jobs:
+                queue.enqueue(job)
+            logger.info(f"Queued {len(jobs)} jobs in {args.db}.")
+        elif args.command == "work":
+            run_worker(
+                queue,
+                args.worker_id,
+                args.headless,
+                exit_when_empty=args.exit_when_empty,
+            )
+        logger.info(f"Job queue {args.db}: {queue.counts()}")
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
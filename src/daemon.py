@@ -0,0 +1,99 @@
+import argparse
+
+from playwright.sync_api import sync_playwright
+
+from logs.logger import logger
+from src.auth import (
+    _perform_login_and_save_session,
+    _reuse_session,
+    restore_session_cookies,
+)
+from src.config import (
+    BROWSER_DAEMON_PORT,
+    BROWSER_DAEMON_PROFILE_DIR,
+    HEADLESS,
+    STORAGE_STATE_PATH,
+)
+
+
+def run_browser_daemon(
+    port: int = BROWSER_DAEMON_PORT,
+    storage_state_path: str = STORAGE_STATE_PATH,
+    profile_dir: str = BROWSER_DAEMON_PROFILE_DIR,
+    headless: bool = HEADLESS,
+):
+    """
+    Keeps a logged-in Chromium running with its CDP endpoint on port,
+    so short runs (--attach) skip the browser launch and session restore.
+    Runs until the browser is closed or the process is interrupted.
+    """
+    with sync_playwright() as p:
+        context = p.chromium.launch_persistent_context(
+            profile_dir,
+            headless=headless,
+            args=[f"--remote-debugging-port={port}"],
+        )
+        try:
+            page = context.pages[0] if context.pages else None
+            if restore_session_cookies(context, storage_state_path):
+                _reuse_session(context, page)
+            else:
+                logger.info("No saved session found. Log in to the daemon.")
+                _perform_login_and_save_session(context, storage_state_path)
+
+            logger.info(
+                f"✅ Browser daemon ready. Attach with "
+                f"--attach http://127.0.0.1:{port}"
+            )
+            # Blocks (while serving Playwright events) until the
+            # browser window is closed
+            context.wait_for_event("close", timeout=0)
+
+        except KeyboardInterrupt:
+            logger.info("Stopping browser daemon.")
+        finally:
+            try:
+                context.close()
+            except Exception:
+                pass  # Already closed together with the browser
+
+    logger.info("Browser daemon stopped.")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parses command line options of the daemon."""
+    parser = argparse.ArgumentParser(
+        description="Keep a warm, logged-in browser for --attach runs."
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=BROWSER_DAEMON_PORT,
+        help=f"CDP port (default: {BROWSER_DAEMON_PORT}).",
+    )
+    parser.add_argument(
+        "--storage-state",
+        default=STORAGE_STATE_PATH,
+        help=f"Saved session to restore (default: {STORAGE_STATE_PATH}).",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=BROWSER_DAEMON_PROFILE_DIR,
+        help="Chromium profile directory of the daemon "
+        f"(default: {BROWSER_DAEMON_PROFILE_DIR}).",
+    )
+    parser.add_argument(
+        "--headless",
+        action=argparse.BooleanOptionalAction,
+        default=HEADLESS,
+        help="Run the browser without a window (needs a saved session, "
+        "the manual login needs the window).",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_browser_daemon(
+        args.port, args.storage_state, args.profile_dir, args.headless
+    )
@@ -0,0 +1,39 @@
+from playwright.sync_api import BrowserContext
+
+from logs.logger import logger
+from src.config import HAR_RECORD_MODE, HAR_REPLAY_NOT_FOUND
+
+
+def har_recording_options(record_har_path: str | None) -> dict:
+    """
+    Context options recording all traffic of the context into a HAR file
+    (written when the context closes). Empty without a path.
+    A .zip path stores response bodies as separate entries of the zip.
+    """
+    if not record_har_path:
+        return {}
+    logger.info(f"Recording network traffic to {record_har_path}.")
+    return {
+        "record_har_path": record_har_path,
+        "record_har_mode": HAR_RECORD_MODE,
+    }
+
+
+def replay_har(
+    context: BrowserContext,
+    replay_har_path: str | None,
+    not_found: str = HAR_REPLAY_NOT_FOUND,
+):
+    """
+    Serves the requests of the context from a recorded HAR file instead
+    of the network. Requests missing from the recording are aborted
+    (not_found="abort", fully offline) or sent to the network
+    (not_found="fallback").
+    """
+    if not replay_har_path:
+        return
+    context.route_from_har(replay_har_path, not_found=not_found)
+    logger.info(
+        f"Replaying network traffic from {replay_har_path} "
+        f"(requests not in it: {not_found})."
+    )
@@ -1,17 +1,73 @@
-import time
+import argparse
+import asyncio
 
+from playwright.async_api import async_playwright
+
+from src.async_engine import run_feed_session
+from src.batch import QueryTask, load_queries, parse_query, run_query_batch
+from src.config import (
+    ACCOUNTS_DIR,
+    BROWSER_DAEMON_CDP_URL,
+    HEADLESS,
+    LAUNCH_MODE,
+    CONTEXT_POOL_CONCURRENCY,
+    MAX_VIDEOS_TO_PROCESS,
+    PARALLEL_WATCH_TABS,
+    STORAGE_STATE_PATH,
+    TEARDOWN_DELAY_SECONDS,
+    SEARCH_MODE,
+    HARVEST_MODE,
+    METRICS_JSON_PATH,
+    METRICS_PROMETHEUS_PATH,
+)
+from src.context_pool import (
+    ContextPool,
+    list_account_states,
+    run_pooled_session,
+)
 from src.auth import (
+    attach_to_browser_daemon,
     get_authenticated_page_and_context,
 )
-from src.search import perform_search
+from src.metrics import phase_timings
+from src.checkpoint import open_checkpoint
+from src.clock import clock
+from src.profiling import start_browser_profiler
+from src.results_cache import open_results_cache
+from src.routing import routing_stats
+from src.seen_index import open_seen_index
 from logs.logger import logger
-from src.viewer import watch_tiktok_feed
+from src.workers import Job, load_jobs, run_jobs_in_pool
 
 
-def main():
+def main(
+    queries: list[QueryTask] | None = None,
+    teardown_delay: float = TEARDOWN_DELAY_SECONDS,
+    search_mode: str = SEARCH_MODE,
+    harvest_mode: str = HARVEST_MODE,
+    cdp_url: str | None = None,
+    headless: bool = HEADLESS,
+    launch_mode: str = LAUNCH_MODE,
+    resume: bool = False,
+    profile: bool = False,
+    trace: bool = False,
+    parallel_tabs: int = PARALLEL_WATCH_TABS,
+    record_har: str | None = None,
+    replay_har: str | None = None,
+):
     """
     Runs the main TikTok automation script,
     handling login, search, and cleanup.
+    All queries run back-to-back on the same authenticated session.
+    With cdp_url the run attaches to the browser daemon instead of
+    launching a browser, and leaves the daemon's context open.
+    With resume the run continues the saved checkpoint (and its queries
+    when none are given) instead of starting from the first scroll.
+    With profile (or trace) browser-side metrics are collected, with
+    trace also a Playwright trace that is kept if a phase was slow.
+    With parallel_tabs above 1 that many videos are watched at once.
+    record_har saves the traffic of the run into a HAR file, replay_har
+    runs against such a recording without the network.
     """
     logger.info("Starting TikTok automation script.")
 
@@ -19,17 +75,43 @@ def main():
     page = None
     context = None
     p_instance = None
+    seen_index = None
+    profiler = None
 
     try:
         # Get browser controls (page), session (context),
         # and the Playwright program (p_instance)
-        page, context, p_instance = get_authenticated_page_and_context()
+        if cdp_url:
+            page, context, p_instance = attach_to_browser_daemon(cdp_url)
+        else:
+            page, context, p_instance = get_authenticated_page_and_context(
+                headless=headless,
+                launch_mode=launch_mode,
+                record_har_path=record_har,
+                replay_har_path=replay_har,
+            )
 
-        # Perform the search operation on TikTok.
-        perform_search(page)
+        if profile or trace:
+            profiler = start_browser_profiler(page, context, trace)
 
-        # Now that the search is done, start watching videos from the feed.
-        watch_tiktok_feed(page)
+        # Videos processed by earlier runs of this account are ignored
+        seen_index = open_seen_index(STORAGE_STATE_PATH)
+
+        checkpoint = open_checkpoint(resume)
+        if checkpoint and not queries:
+            queries = [QueryTask(*task) for task in checkpoint.queries]
+
+        # Search for every query and watch videos from its feed.
+        run_query_batch(
+            page,
+            queries or [],
+            seen_index,
+            open_results_cache(),
+            search_mode,
+            harvest_mode,
+            checkpoint,
+            parallel_tabs,
+        )
 
     except Exception as e:
         logger.error(f"An error occurred during the script's work: {e}")
@@ -37,16 +119,30 @@ def main():
     # Ensures the browser window and its background processes
     # are shut down, even if your script crashes
     finally:
+        if seen_index:
+            seen_index.close()
+        if profiler:
+            try:
+                profiler.stop()
+            except Exception as e:
+                logger.warning(f"Could not stop browser profiling: {e}")
+
         # Check if context was successfully assigned
         if context:
-            logger.info(
-                "Keeping browser open for 10 seconds "
-                "for review before closing..."
-            )
-            time.sleep(10)
-            # Close the browser context (which closes the browser window)
-            context.close()
-            logger.info("Browser context closed.")
+            if teardown_delay > 0:
+                logger.info(
+                    f"Keeping browser open for {teardown_delay} seconds "
+                    "for review before closing..."
+                )
+                clock.sleep(teardown_delay)
+            if cdp_url:
+                # The daemon's context stays warm for the next run
+                page.close()
+                logger.info("Page closed, browser daemon keeps running.")
+            else:
+                # Close the browser context (which closes the browser window)
+                context.close()
+                logger.info("Browser context closed.")
 
         # Check if Playwright instance was successfully assigned
         if p_instance:
@@ -57,8 +153,290 @@ def main():
         else:
             logger.warning("No Playwright instance to close.")
 
+    routing_stats.log_summary()
+    phase_timings.write_reports(METRICS_JSON_PATH, METRICS_PROMETHEUS_PATH)
+    logger.info("TikTok automation script finished.")
+
+
+async def async_main(
+    sessions: int,
+    accounts_dir: str | None = None,
+    concurrency: int = CONTEXT_POOL_CONCURRENCY,
+    headless: bool = HEADLESS,
+):
+    """
+    Runs several feed sessions concurrently in one event loop,
+    sharing a single Playwright driver between them.
+    With accounts_dir, sessions share one browser through a ContextPool
+    and each uses the context of one of the saved accounts.
+    """
+    logger.info(
+        f"Starting TikTok automation script with {sessions} "
+        f"concurrent sessions."
+    )
+
+    p_instance = await async_playwright().start()
+    pool = None
+
+    try:
+        if accounts_dir:
+            pool = await ContextPool(
+                p_instance, accounts_dir, concurrency, headless
+            ).start()
+            sessions_to_run = (
+                run_pooled_session(pool, number)
+                for number in range(1, sessions + 1)
+            )
+        else:
+            login_lock = asyncio.Lock()
+            sessions_to_run = (
+                run_feed_session(
+                    p_instance, number, login_lock, headless=headless
+                )
+                for number in range(1, sessions + 1)
+            )
+
+        results = await asyncio.gather(*sessions_to_run)
+        logger.info(
+            f"All sessions finished. Processed {sum(results)} videos "
+            f"in total (per session: {results})."
+        )
+
+    finally:
+        if pool:
+            await pool.close()
+        await p_instance.stop()
+        logger.info("Playwright instance exited.")
+
+    routing_stats.log_summary()
     logger.info("TikTok automation script finished.")
 
 
+# Options of the single-session run (main), which the concurrent
+# (--sessions, --accounts-dir) and multi-process (--workers) modes ignore
+SINGLE_SESSION_OPTIONS = (
+    ("--query", "query"),
+    ("--queries-file", "queries_file"),
+    ("--videos-per-query", "videos_per_query"),
+    ("--teardown-delay", "teardown_delay"),
+    ("--search-mode", "search_mode"),
+    ("--harvest-mode", "harvest_mode"),
+    ("--attach", "attach"),
+    ("--launch-mode", "launch_mode"),
+    ("--resume", "resume"),
+    ("--profile", "profile"),
+    ("--trace", "trace"),
+    ("--parallel-tabs", "parallel_tabs"),
+    ("--record-har", "record_har"),
+    ("--replay-har", "replay_har"),
+)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parses command line options of the script."""
+    parser = argparse.ArgumentParser(description="TikTok automation script.")
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        default=1,
+        help="Number of feed sessions to run concurrently "
+        "in one event loop (default: 1).",
+    )
+    parser.add_argument(
+        "--accounts-dir",
+        default=None,
+        help="Directory of per-account storage-state files. Sessions then "
+        "share one browser with a context per account.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=CONTEXT_POOL_CONCURRENCY,
+        help="Max number of account contexts in use at the same time "
+        f"(default: {CONTEXT_POOL_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Spread jobs over this many worker processes, "
+        "one browser per process (default: 1).",
+    )
+    parser.add_argument(
+        "--jobs",
+        default=None,
+        help="CSV file with one 'account,query' job per line for --workers. "
+        "Defaults to every account in --accounts-dir with the default query.",
+    )
+    parser.add_argument(
+        "--query",
+        action="append",
+        default=[],
+        help="Search query, optionally with its video budget as "
+        "'query,N'. Repeat to run several queries on one session.",
+    )
+    parser.add_argument(
+        "--queries-file",
+        default=None,
+        help="File with one query (or 'query,N') per line.",
+    )
+    parser.add_argument(
+        "--videos-per-query",
+        type=int,
+        default=MAX_VIDEOS_TO_PROCESS,
+        help="Video budget of queries without their own "
+        f"(default: {MAX_VIDEOS_TO_PROCESS}).",
+    )
+    parser.add_argument(
+        "--teardown-delay",
+        type=float,
+        default=TEARDOWN_DELAY_SECONDS,
+        help="Seconds to keep the browser open before closing "
+        f"(default: {TEARDOWN_DELAY_SECONDS}).",
+    )
+    parser.add_argument(
+        "--search-mode",
+        choices=("ui", "direct"),
+        default=SEARCH_MODE,
+        help="'ui' types queries into the search box, 'direct' opens the "
+        f"search results URL (default: {SEARCH_MODE}).",
+    )
+    parser.add_argument(
+        "--harvest-mode",
+        choices=("dom", "network"),
+        default=HARVEST_MODE,
+        help="'dom' scrapes the rendered result cards, 'network' reads "
+        f"video links from the feed API responses (default: {HARVEST_MODE}).",
+    )
+    parser.add_argument(
+        "--attach",
+        nargs="?",
+        const=BROWSER_DAEMON_CDP_URL,
+        default=None,
+        metavar="CDP_URL",
+        help="Attach to the browser daemon (python -m src.daemon) instead "
+        f"of launching a browser (default URL: {BROWSER_DAEMON_CDP_URL}).",
+    )
+    parser.add_argument(
+        "--headless",
+        action=argparse.BooleanOptionalAction,
+        default=HEADLESS,
+        help="Run the browser without a window.",
+    )
+    parser.add_argument(
+        "--launch-mode",
+        choices=("browser", "persistent"),
+        default=LAUNCH_MODE,
+        help="'browser' opens a fresh context from the saved session, "
+        "'persistent' reuses a persistent profile directory "
+        f"(default: {LAUNCH_MODE}).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the batch saved in the checkpoint of a failed run.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Collect browser-side metrics (CDP performance metrics and "
+        "resource timing) into the browser profile report.",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Also record a Playwright trace, saved only when a phase "
+        "exceeds the latency threshold.",
+    )
+    parser.add_argument(
+        "--parallel-tabs",
+        type=int,
+        default=PARALLEL_WATCH_TABS,
+        help="Number of videos watched at the same time, each in its own "
+        f"tab (default: {PARALLEL_WATCH_TABS}).",
+    )
+    har = parser.add_mutually_exclusive_group()
+    har.add_argument(
+        "--record-har",
+        default=None,
+        metavar="PATH",
+        help="Record the network traffic of the run into a HAR file "
+        "(.har, or .zip to keep response bodies as separate files).",
+    )
+    har.add_argument(
+        "--replay-har",
+        default=None,
+        metavar="PATH",
+        help="Serve every request from a recorded HAR file instead of "
+        "the network, for repeatable offline runs.",
+    )
+    args = parser.parse_args(argv)
+    if args.attach and (args.record_har or args.replay_har):
+        parser.error("--record-har/--replay-har need a launched browser.")
+    if args.jobs and args.workers < 2:
+        parser.error("--jobs needs --workers 2 or more.")
+    if args.workers > 1 or args.sessions > 1 or args.accounts_dir:
+        ignored = [
+            option
+            for option, name in SINGLE_SESSION_OPTIONS
+            if getattr(args, name) != parser.get_default(name)
+        ]
+        if ignored:
+            parser.error(
+                f"{', '.join(ignored)} only apply to a single session, "
+                "not to --sessions, --accounts-dir or --workers."
+            )
+    return args
+
+
+def run_from_command_line(argv=None):
+    """Runs the mode selected by the command line options."""
+    args = parse_args(argv)
+    queries = [
+        parse_query(query, args.videos_per_query) for query in args.query
+    ]
+    if args.queries_file:
+        queries += load_queries(args.queries_file, args.videos_per_query)
+
+    if args.workers > 1:
+        jobs = (
+            load_jobs(args.jobs)
+            if args.jobs
+            else [
+                Job(account)
+                for account in list_account_states(
+                    args.accounts_dir or ACCOUNTS_DIR
+                )
+            ]
+        )
+        run_jobs_in_pool(jobs, args.workers, args.headless)
+        phase_timings.write_reports(METRICS_JSON_PATH, METRICS_PROMETHEUS_PATH)
+    elif args.sessions > 1 or args.accounts_dir:
+        asyncio.run(
+            async_main(
+                args.sessions,
+                args.accounts_dir,
+                args.concurrency,
+                args.headless,
+            )
+        )
+    else:
+        main(
+            queries,
+            args.teardown_delay,
+            args.search_mode,
+            args.harvest_mode,
+            args.attach,
+            args.headless,
+            args.launch_mode,
+            args.resume,
+            args.profile,
+            args.trace,
+            args.parallel_tabs,
+            args.record_har,
+            args.replay_har,
+        )
+
+
 if __name__ == "__main__":
-    main()
+    run_from_command_line()
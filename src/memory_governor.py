@@ -0,0 +1,115 @@
+from playwright.sync_api import Page
+
+from logs.logger import logger
+from src.config import (
+    MEMORY_BUDGET_MB,
+    MEMORY_SAMPLE_EVERY_SCROLLS,
+    PRUNE_KEEP_LAST_CARDS,
+    PRUNE_PROCESSED_CARDS,
+)
+
+# Removes all but the last `keep` cards (which keep the page scrollable
+# and the infinite-scroll trigger in place). With harvestedOnly, cards
+# the DOM harvest has not returned yet are kept as well.
+PRUNE_CARDS_SCRIPT = """
+([cardSelector, keep, harvestedOnly]) => {
+    const cards = Array.from(document.querySelectorAll(cardSelector));
+    let removed = 0;
+    for (const card of cards.slice(0, Math.max(0, cards.length - keep))) {
+        if (harvestedOnly && !card.hasAttribute("data-tap-harvested")) {
+            continue;
+        }
+        card.remove();
+        removed++;
+    }
+    return removed;
+}
+"""
+
+# Used JS heap of the page in bytes (Chromium only, null elsewhere)
+JS_HEAP_USED_SCRIPT = """
+() => performance.memory ? performance.memory.usedJSHeapSize : null
+"""
+
+
+class MemoryGovernor:
+    """
+    Keeps the memory of a long-running results page flat: prunes the
+    cards that were already harvested and, every sample_every scrolls,
+    samples the page's JS heap and reports when it exceeds budget_mb so
+    the page can be recycled.
+    """
+
+    def __init__(
+        self,
+        budget_mb: float | None = MEMORY_BUDGET_MB,
+        sample_every: int = MEMORY_SAMPLE_EVERY_SCROLLS,
+        prune: bool = PRUNE_PROCESSED_CARDS,
+        keep_last_cards: int = PRUNE_KEEP_LAST_CARDS,
+    ):
+        self.budget_mb = budget_mb
+        self.sample_every = max(1, sample_every)
+        self.prune = prune
+        self.keep_last_cards = keep_last_cards
+        self.samples_mb: list[float] = []
+        self.pruned_cards = 0
+        self.recycles = 0
+
+    def prune_cards(
+        self, page: Page, card_selector: str, harvested_only: bool = True
+    ) -> int:
+        """Removes processed cards from the DOM, returns how many."""
+        if not self.prune:
+            return 0
+        removed = page.evaluate(
+            PRUNE_CARDS_SCRIPT,
+            [card_selector, self.keep_last_cards, harvested_only],
+        )
+        self.pruned_cards += removed or 0
+        return removed or 0
+
+    def prune_restored_cards(self, page: Page, card_selector: str) -> int:
+        """
+        Removes the cards a reloaded results page loaded again on its way
+        back to its position (all processed before the reload), whether
+        or not pruning is enabled, so the reload releases their memory.
+        """
+        removed = page.evaluate(
+            PRUNE_CARDS_SCRIPT, [card_selector, self.keep_last_cards, False]
+        )
+        self.pruned_cards += removed or 0
+        return removed or 0
+
+    def sample(self, page: Page) -> float | None:
+        """Used JS heap of the page in MB, or None if not available."""
+        used_bytes = page.evaluate(JS_HEAP_USED_SCRIPT)
+        if used_bytes is None:
+            return None
+        used_mb = used_bytes / (1024 * 1024)
+        self.samples_mb.append(used_mb)
+        return used_mb
+
+    def needs_recycle(self, page: Page, scroll_count: int) -> bool:
+        """
+        Samples the heap on every sample_every-th scroll and tells
+        whether it is above the budget.
+        """
+        if not self.budget_mb or scroll_count % self.sample_every:
+            return False
+
+        used_mb = self.sample(page)
+        if used_mb is None:
+            return False
+        logger.info(
+            f"Results page JS heap: {used_mb:.0f} MB "
+            f"(budget {self.budget_mb} MB, "
+            f"{self.pruned_cards} cards pruned so far)."
+        )
+        return used_mb > self.budget_mb
+
+
+def create_memory_governor() -> MemoryGovernor | None:
+    """A governor with the configured settings, or None if disabled."""
+    if not PRUNE_PROCESSED_CARDS and not MEMORY_BUDGET_MB:
+        return None
+    return MemoryGovernor()
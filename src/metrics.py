@@ -0,0 +1,122 @@
+import json
+import math
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+from logs.logger import logger
+from src.clock import clock
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def write_atomically(path: str, content: str):
+    """Writes through a temporary file so readers never see partial data."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as report_file:
+        report_file.write(content)
+    os.replace(temporary_path, path)
+
+
+class PhaseTimings:
+    """Collects duration samples (seconds) per phase of a run."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+        # Called with (phase, seconds) for every recorded sample
+        self.listeners: list[Callable[[str, float], None]] = []
+
+    @contextmanager
+    def span(self, phase: str):
+        """Times the enclosed block, also when it raises."""
+        started_at = clock.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, clock.perf_counter() - started_at)
+
+    def record(self, phase: str, seconds: float):
+        self.samples.setdefault(phase, []).append(seconds)
+        for listener in self.listeners:
+            listener(phase, seconds)
+
+    def merge(self, samples: dict[str, list[float]]):
+        """Adds samples collected elsewhere (e.g. in a worker process)."""
+        for phase, values in samples.items():
+            self.samples.setdefault(phase, []).extend(values)
+
+    def reset(self):
+        self.samples.clear()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Returns count, total, p50, p95 and max for every phase."""
+        summary = {}
+        for phase, values in sorted(self.samples.items()):
+            if not values:
+                continue
+            ordered = sorted(values)
+            summary[phase] = {
+                "count": len(ordered),
+                "total": round(sum(ordered), 4),
+                "p50": round(percentile(ordered, 0.5), 4),
+                "p95": round(percentile(ordered, 0.95), 4),
+                "max": round(ordered[-1], 4),
+            }
+        return summary
+
+    def write_json_report(self, path: str):
+        """Writes the summary as a JSON run report."""
+        report = {"generated_at": time.time(), "phases": self.summary()}
+        write_atomically(path, json.dumps(report, indent=2) + "\n")
+
+    def write_prometheus_textfile(self, path: str):
+        """
+        Writes the summary in the Prometheus text format, ready for the
+        node_exporter textfile collector.
+        """
+        name = "tiktok_automation_phase_duration_seconds"
+        lines = [
+            f"# HELP {name} Duration of automation phases in seconds.",
+            f"# TYPE {name} summary",
+        ]
+        max_lines = [
+            f"# HELP {name}_max Longest duration of a phase in seconds.",
+            f"# TYPE {name}_max gauge",
+        ]
+        for phase, stats in self.summary().items():
+            label = f'phase="{phase}"'
+            lines += [
+                f'{name}{{{label},quantile="0.5"}} {stats["p50"]}',
+                f'{name}{{{label},quantile="0.95"}} {stats["p95"]}',
+                f"{name}_sum{{{label}}} {stats['total']}",
+                f"{name}_count{{{label}}} {stats['count']}",
+            ]
+            max_lines.append(f"{name}_max{{{label}}} {stats['max']}")
+        write_atomically(path, "\n".join(lines + max_lines) + "\n")
+
+    def write_reports(self, json_path: str, prometheus_path: str):
+        """Writes both reports and logs a one-line summary per phase."""
+        for phase, stats in self.summary().items():
+            logger.info(
+                f"Phase '{phase}': {stats['count']} x, "
+                f"p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s, "
+                f"max {stats['max']:.2f}s."
+            )
+        try:
+            self.write_json_report(json_path)
+            self.write_prometheus_textfile(prometheus_path)
+            logger.info(f"Run report written to {json_path}.")
+        except OSError as e:
+            logger.error(f"Could not write the run report: {e}")
+
+
+# Timings of the current process
+phase_timings = PhaseTimings()
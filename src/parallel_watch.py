@@ -0,0 +1,128 @@
+import heapq
+import random
+
+from playwright.sync_api import BrowserContext, Page
+
+from logs.logger import logger
+from src.clock import clock
+from src.config import (
+    MAX_WATCH_DURATION_SECONDS,
+    MIN_WATCH_DURATION_SECONDS,
+    PARALLEL_WATCH_TABS,
+)
+from src.metrics import phase_timings
+from src.readiness import navigate, wait_for_video_ready
+from src.resilience import circuit_breaker
+
+
+class ParallelWatcher:
+    """
+    Watches up to `tabs` videos at the same time, each in its own tab of
+    the context with its own watch timer. submit() starts a video in a
+    free tab and only blocks while every tab is busy, so the feed keeps
+    scrolling and deciding while earlier videos are still playing.
+    """
+
+    def __init__(
+        self,
+        context: BrowserContext,
+        tabs: int = PARALLEL_WATCH_TABS,
+        watch_seconds_range: tuple[int, int] = (
+            MIN_WATCH_DURATION_SECONDS,
+            MAX_WATCH_DURATION_SECONDS,
+        ),
+        rng: random.Random | None = None,
+    ):
+        self.context = context
+        self.rng = rng or random
+        self.size = max(1, tabs)
+        self.watch_seconds_range = watch_seconds_range
+        self.watched = 0
+        self._tabs: list[Page] = []
+        self._idle_tabs: list[Page] = []
+        # Heap of (watch end time, order, video URL, played, tab)
+        self._playing: list[tuple[float, int, str, bool, Page]] = []
+        self._started = 0
+
+    def _free_tab(self) -> Page:
+        """An idle tab, a new one while below size, else waits for one."""
+        self._collect_finished()
+        if not self._idle_tabs and len(self._tabs) < self.size:
+            self._tabs.append(self.context.new_page())
+            logger.info(f"Opened watch tab {len(self._tabs)}/{self.size}.")
+            return self._tabs[-1]
+        if not self._idle_tabs:
+            self._wait_for_next()
+        return self._idle_tabs.pop()
+
+    def submit(self, video_url: str, video_id: str):
+        """Starts watching a video in a free tab."""
+        tab = self._free_tab()
+        try:
+            with phase_timings.span("navigation"):
+                navigate(tab, video_url)
+                # Start the watch timer as soon as the video can play
+                played = wait_for_video_ready(tab)
+            if not played:
+                circuit_breaker.record_failure()
+        except Exception as e:
+            logger.error(f"Error processing video link {video_url}: {e}")
+            circuit_breaker.record_failure()
+            self._idle_tabs.append(tab)
+            return
+
+        watch_time = self.rng.randint(*self.watch_seconds_range)
+        logger.info(
+            f"Video ID: {video_id}, Link: {video_url} - Watching for "
+            f"{watch_time} seconds ({len(self._playing) + 1} playing)."
+        )
+        self._started += 1
+        heapq.heappush(
+            self._playing,
+            (
+                clock.monotonic() + watch_time,
+                self._started,
+                video_url,
+                played,
+                tab,
+            ),
+        )
+
+    def _finish_next(self):
+        """Frees the tab of the video whose watch timer ends first."""
+        _, _, video_url, played, tab = heapq.heappop(self._playing)
+        self.watched += 1
+        if played:
+            # Only a video that played resets the breaker's backoff
+            circuit_breaker.record_success()
+        logger.info(f"Link: {video_url} - Watched fully.")
+        self._idle_tabs.append(tab)
+
+    def _collect_finished(self):
+        """Frees the tabs whose watch timer has run out."""
+        now = clock.monotonic()
+        while self._playing and self._playing[0][0] <= now:
+            self._finish_next()
+
+    def _wait_for_next(self):
+        """Sleeps until the next playing video has been watched."""
+        with phase_timings.span("watch"):
+            clock.sleep(max(0.0, self._playing[0][0] - clock.monotonic()))
+        self._finish_next()
+        self._collect_finished()
+
+    def drain(self):
+        """Waits until every started video has been watched."""
+        while self._playing:
+            self._wait_for_next()
+
+    def close(self):
+        """Closes every tab of the watcher."""
+        for tab in self._tabs:
+            try:
+                tab.close()
+            except Exception as e:
+                logger.warning(f"Could not close watch tab: {e}")
+        self._tabs.clear()
+        self._idle_tabs.clear()
+        self._playing.clear()
@@ -0,0 +1,216 @@
+import json
+import os
+
+from playwright.sync_api import BrowserContext, Page
+
+from logs.logger import logger
+from src.clock import clock
+from src.config import (
+    PROFILE_REPORT_PATH,
+    PROFILE_SAMPLE_INTERVAL_SECONDS,
+    PROFILE_TRACE_DIR,
+    PROFILE_TRACE_IGNORED_PHASES,
+    PROFILE_TRACE_THRESHOLD_MS,
+)
+from src.metrics import PhaseTimings, phase_timings, write_atomically
+
+# CDP Performance.getMetrics values kept in the samples
+CDP_METRIC_NAMES = (
+    "JSHeapUsedSize",
+    "JSHeapTotalSize",
+    "Nodes",
+    "JSEventListeners",
+    "LayoutCount",
+    "RecalcStyleCount",
+    "LayoutDuration",
+    "RecalcStyleDuration",
+    "ScriptDuration",
+    "TaskDuration",
+)
+
+# Phases after which the resource timing of the open pages is summed up
+RESOURCE_TIMING_PHASES = ("search", "scroll", "navigation")
+
+# Sums up the resource timing entries per initiator type and clears the
+# buffer, so every summary only covers the requests since the last one
+# (of the current document: a navigation starts a new buffer)
+RESOURCE_TIMING_SUMMARY_SCRIPT = """
+() => {
+    const summary = {};
+    for (const entry of performance.getEntriesByType("resource")) {
+        const type = entry.initiatorType || "other";
+        const group = summary[type] || (summary[type] = {
+            count: 0, transfer_bytes: 0, total_ms: 0, max_ms: 0
+        });
+        group.count += 1;
+        group.transfer_bytes += entry.transferSize || 0;
+        group.total_ms += entry.duration;
+        group.max_ms = Math.max(group.max_ms, entry.duration);
+    }
+    performance.clearResourceTimings();
+    return summary;
+}
+"""
+
+
+class BrowserProfiler:
+    """
+    Opt-in browser-side profiling of the page and context of a run,
+    driven by the phase timings (no extra thread touches the page):
+    - CDP performance metrics (JS heap, DOM nodes, layout and script
+      time), sampled at most every sample_interval_seconds,
+    - resource timing of the open pages after every search, scroll and
+      navigation,
+    - with trace, a Playwright trace of the run that is only saved when
+      some phase (other than the deliberate waits of ignored_phases)
+      took longer than trace_threshold_ms.
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        context: BrowserContext,
+        trace: bool = False,
+        sample_interval_seconds: float = PROFILE_SAMPLE_INTERVAL_SECONDS,
+        trace_threshold_ms: float = PROFILE_TRACE_THRESHOLD_MS,
+        trace_dir: str = PROFILE_TRACE_DIR,
+        timings: PhaseTimings = phase_timings,
+        ignored_phases: tuple[str, ...] = PROFILE_TRACE_IGNORED_PHASES,
+    ):
+        self.page = page
+        self.context = context
+        self.trace = trace
+        self.sample_interval_seconds = sample_interval_seconds
+        self.trace_threshold_ms = trace_threshold_ms
+        self.trace_dir = trace_dir
+        self.timings = timings
+        self.ignored_phases = ignored_phases
+
+        self.metric_samples: list[dict] = []
+        self.resource_timings: list[dict] = []
+        self.slow_phases: list[tuple[str, float]] = []
+        self._cdp = None
+        self._last_sample_at = float("-inf")
+
+    def start(self) -> "BrowserProfiler":
+        """Enables CDP metrics, starts tracing and follows the phases."""
+        self._cdp = self.context.new_cdp_session(self.page)
+        self._cdp.send("Performance.enable")
+        if self.trace:
+            self.context.tracing.start(screenshots=True, snapshots=True)
+        self.timings.listeners.append(self.on_phase)
+        logger.info("Browser profiling started.")
+        return self
+
+    def sample_metrics(self, label: str) -> dict:
+        """Takes one CDP performance metrics sample."""
+        metrics = {
+            metric["name"]: metric["value"]
+            for metric in self._cdp.send("Performance.getMetrics")["metrics"]
+            if metric["name"] in CDP_METRIC_NAMES
+        }
+        sample = {"at": clock.time(), "after": label, **metrics}
+        self.metric_samples.append(sample)
+        logger.info(
+            f"Browser metrics after {label}: "
+            f"JS heap {metrics.get('JSHeapUsedSize', 0) / 1e6:.0f} MB, "
+            f"{metrics.get('Nodes', 0):.0f} nodes, "
+            f"layout {metrics.get('LayoutDuration', 0) * 1000:.0f} ms, "
+            f"script {metrics.get('ScriptDuration', 0) * 1000:.0f} ms."
+        )
+        return sample
+
+    def summarize_resource_timing(self, label: str) -> list[dict]:
+        """
+        Resource timing of every open page of the context (the results
+        page and the video tabs) since the last summary.
+        """
+        pages = [self.page] + [
+            page for page in self.context.pages if page is not self.page
+        ]
+        summaries = []
+        for page in pages:
+            by_type = page.evaluate(RESOURCE_TIMING_SUMMARY_SCRIPT) or {}
+            if not by_type and page is not self.page:
+                continue  # Idle tab, nothing loaded since the last one
+            summaries.append(
+                {
+                    "at": clock.time(),
+                    "after": label,
+                    "url": page.url,
+                    "by_type": by_type,
+                }
+            )
+        self.resource_timings.extend(summaries)
+        return summaries
+
+    def on_phase(self, phase: str, seconds: float):
+        """Phase timings listener; profiling never fails the run."""
+        try:
+            if (
+                phase not in self.ignored_phases
+                and seconds * 1000 > self.trace_threshold_ms
+            ):
+                self.slow_phases.append((phase, seconds))
+            if phase in RESOURCE_TIMING_PHASES:
+                self.summarize_resource_timing(phase)
+            now = clock.monotonic()
+            if now - self._last_sample_at >= self.sample_interval_seconds:
+                self._last_sample_at = now
+                self.sample_metrics(phase)
+        except Exception as e:
+            logger.warning(f"Browser profiling failed after {phase}: {e}")
+
+    def stop(self, report_path: str = PROFILE_REPORT_PATH) -> str | None:
+        """
+        Stops profiling and writes the report. Returns the path of the
+        saved trace, which is only kept if some phase was too slow.
+        """
+        if self.on_phase in self.timings.listeners:
+            self.timings.listeners.remove(self.on_phase)
+
+        trace_path = None
+        try:
+            if self.trace and self.slow_phases:
+                os.makedirs(self.trace_dir, exist_ok=True)
+                trace_path = os.path.join(
+                    self.trace_dir, f"trace-{int(clock.time())}.zip"
+                )
+                self.context.tracing.stop(path=trace_path)
+                phase, seconds = max(self.slow_phases, key=lambda x: x[1])
+                logger.warning(
+                    f"Phase '{phase}' took {seconds:.1f}s, "
+                    f"trace saved to {trace_path}."
+                )
+            elif self.trace:
+                self.context.tracing.stop()  # Nothing slow, drop it
+        except Exception as e:
+            logger.warning(f"Could not stop tracing: {e}")
+
+        try:
+            self._write_report(report_path, trace_path)
+        except Exception as e:
+            # Runs during teardown, which must still close the browser
+            logger.warning(f"Could not write the browser profile: {e}")
+        return trace_path
+
+    def _write_report(self, path: str, trace_path: str | None):
+        report = {
+            "metrics": self.metric_samples,
+            "resource_timing": self.resource_timings,
+            "slow_phases": self.slow_phases,
+            "trace": trace_path,
+        }
+        write_atomically(path, json.dumps(report, indent=2))
+        logger.info(f"Browser profile written to {path}.")
+
+
+def start_browser_profiler(
+    page: Page, context: BrowserContext, trace: bool = False
+) -> BrowserProfiler | None:
+    """Starts profiling, or warns and returns None if it is unavailable."""
+    try:
+        return BrowserProfiler(page, context, trace).start()
+    except Exception as e:
+        logger.warning(f"Browser profiling is not available: {e}")
+        return None
@@ -0,0 +1,144 @@
+from typing import Awaitable, Callable
+
+from playwright.sync_api import Page
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from logs.logger import logger
+from src.clock import clock
+from src.config import NAVIGATION_TIMEOUT_MS, VIDEO_READY_TIMEOUT_MS
+from src.resilience import adaptive_timeouts
+from src.routing import blocks_video_media
+
+
+SEARCH_INPUT_SELECTOR = 'input[placeholder*="Search"]'
+
+# Page conditions used instead of fixed sleeps. Each is passed to
+# page.wait_for_function, which polls it inside the page on every
+# animation frame, so the wait ends as soon as the condition holds.
+CARD_COUNT_ABOVE_SCRIPT = """
+([cardSelector, count]) =>
+    document.querySelectorAll(cardSelector).length > count
+"""
+
+# HAVE_FUTURE_DATA (3) is the readyState reached when "canplay" fires
+VIDEO_CAN_PLAY_SCRIPT = """
+() => {
+    const video = document.querySelector("video");
+    return !!video && video.readyState >= 3;
+}
+"""
+
+# Used instead when the routing profile blocks video media, which then
+# never reaches a playable readyState
+VIDEO_ELEMENT_PRESENT_SCRIPT = """
+() => !!document.querySelector("video")
+"""
+
+
+def wait_until_ready(
+    description: str,
+    wait: Callable[[int], object],
+    timeout_ms: int,
+    confirm_timeout: bool = False,
+) -> bool:
+    """
+    Calls wait() with the adaptive timeout learned for description
+    (at most timeout_ms) and logs how long the condition took.
+    Returns False (with a warning) instead of raising when the timeout
+    is hit, so a slow page costs at most that timeout.
+    With confirm_timeout, a wait cut short by the learned timeout is
+    retried once for the rest of timeout_ms before giving up, for waits
+    whose timeout means more than slowness (e.g. the end of the feed).
+    """
+    fixed_timeout_ms = timeout_ms
+    started_at = clock.perf_counter()
+
+    try:
+        with adaptive_timeouts.track(description, timeout_ms) as timeout_ms:
+            wait(timeout_ms)
+    except PlaywrightTimeoutError:
+        if not (confirm_timeout and timeout_ms < fixed_timeout_ms):
+            logger.warning(
+                f"Timed out after {timeout_ms} ms waiting for {description}."
+            )
+            return False
+        try:
+            wait(fixed_timeout_ms - timeout_ms)
+        except PlaywrightTimeoutError:
+            logger.warning(
+                f"Timed out after {fixed_timeout_ms} ms waiting for "
+                f"{description}."
+            )
+            return False
+
+    elapsed_ms = (clock.perf_counter() - started_at) * 1000
+    logger.info(f"Ready: {description} after {elapsed_ms:.0f} ms.")
+    return True
+
+
+def wait_for_video_ready(page: Page) -> bool:
+    """
+    Waits until the video element of the page can start playing, or
+    only until it exists when the routing profile blocks its media.
+    """
+    if blocks_video_media(page):
+        return wait_until_ready(
+            "video element",
+            lambda timeout: page.wait_for_function(
+                VIDEO_ELEMENT_PRESENT_SCRIPT, timeout=timeout
+            ),
+            VIDEO_READY_TIMEOUT_MS,
+        )
+    return wait_until_ready(
+        "video playback",
+        lambda timeout: page.wait_for_function(
+            VIDEO_CAN_PLAY_SCRIPT, timeout=timeout
+        ),
+        VIDEO_READY_TIMEOUT_MS,
+    )
+
+
+def navigate(
+    page: Page,
+    url: str,
+    description: str = "video navigation",
+    timeout_ms: int = NAVIGATION_TIMEOUT_MS,
+):
+    """
+    Navigates page to url until the response is committed, with the
+    adaptive timeout learned for description (at most timeout_ms), so a
+    hung navigation costs about as long as a slow one, not the fixed
+    bound. Raises Playwright's TimeoutError like goto does.
+    """
+    with adaptive_timeouts.track(description, timeout_ms) as timeout_ms:
+        page.goto(url, wait_until="commit", timeout=timeout_ms)
+
+
+def navigate_back(
+    page: Page,
+    description: str = "back navigation",
+    timeout_ms: int = NAVIGATION_TIMEOUT_MS,
+):
+    """Goes back in the page's history like navigate() goes forward."""
+    with adaptive_timeouts.track(description, timeout_ms) as timeout_ms:
+        page.go_back(wait_until="commit", timeout=timeout_ms)
+
+
+async def async_wait_until_ready(
+    description: str, wait: Callable[[int], Awaitable], timeout_ms: int
+) -> bool:
+    """Async version of wait_until_ready."""
+    started_at = clock.perf_counter()
+
+    try:
+        with adaptive_timeouts.track(description, timeout_ms) as timeout_ms:
+            await wait(timeout_ms)
+    except PlaywrightTimeoutError:
+        logger.warning(
+            f"Timed out after {timeout_ms} ms waiting for {description}."
+        )
+        return False
+
+    elapsed_ms = (clock.perf_counter() - started_at) * 1000
+    logger.info(f"Ready: {description} after {elapsed_ms:.0f} ms.")
+    return True
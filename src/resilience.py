@@ -0,0 +1,155 @@
+from collections import deque
+from contextlib import contextmanager
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from logs.logger import logger
+from src.clock import clock
+from src.config import (
+    ADAPTIVE_TIMEOUTS,
+    ADAPTIVE_TIMEOUT_FLOOR_MS,
+    ADAPTIVE_TIMEOUT_MARGIN_MS,
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+    ADAPTIVE_TIMEOUT_PERCENTILE,
+    ADAPTIVE_TIMEOUT_WINDOW,
+    CIRCUIT_BREAKER_COOLDOWN_SECONDS,
+    CIRCUIT_BREAKER_FAILURES,
+    CIRCUIT_BREAKER_MAX_COOLDOWN_SECONDS,
+    CIRCUIT_BREAKER_WINDOW_SECONDS,
+)
+from src.metrics import percentile, phase_timings
+
+
+class AdaptiveTimeouts:
+    """
+    Learns the timeout of every operation (e.g. "search results") from
+    its recent durations: a high percentile plus a margin, bounded by
+    the fixed timeout of the operation and a floor. Until enough
+    durations are known the fixed timeout is used.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = ADAPTIVE_TIMEOUTS,
+        window: int = ADAPTIVE_TIMEOUT_WINDOW,
+        min_samples: int = ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+        fraction: float = ADAPTIVE_TIMEOUT_PERCENTILE,
+        margin_ms: float = ADAPTIVE_TIMEOUT_MARGIN_MS,
+        floor_ms: float = ADAPTIVE_TIMEOUT_FLOOR_MS,
+    ):
+        self.enabled = enabled
+        self.window = window
+        self.min_samples = min_samples
+        self.fraction = fraction
+        self.margin_ms = margin_ms
+        self.floor_ms = floor_ms
+        self.durations_ms: dict[str, deque[float]] = {}
+
+    def record(self, operation: str, duration_ms: float):
+        """Adds a duration; a timed out wait counts with its timeout."""
+        self.durations_ms.setdefault(
+            operation, deque(maxlen=self.window)
+        ).append(duration_ms)
+
+    def timeout_ms(self, operation: str, fixed_timeout_ms: float) -> int:
+        """Timeout to use for the next wait of the operation."""
+        durations = self.durations_ms.get(operation, ())
+        if not self.enabled or len(durations) < self.min_samples:
+            return int(fixed_timeout_ms)
+
+        learned_ms = (
+            percentile(sorted(durations), self.fraction) + self.margin_ms
+        )
+        return int(min(fixed_timeout_ms, max(self.floor_ms, learned_ms)))
+
+    @contextmanager
+    def track(self, operation: str, fixed_timeout_ms: float):
+        """
+        Yields the timeout for a wait and records how long it took;
+        a Playwright timeout is recorded with the full timeout.
+        """
+        timeout_ms = self.timeout_ms(operation, fixed_timeout_ms)
+        started_at = clock.perf_counter()
+        try:
+            yield timeout_ms
+        except PlaywrightTimeoutError:
+            self.record(operation, timeout_ms)
+            raise
+        self.record(operation, (clock.perf_counter() - started_at) * 1000)
+
+    def reset(self):
+        """Forgets all durations."""
+        self.durations_ms.clear()
+
+
+class CircuitBreaker:
+    """
+    Backs off when failures cluster: failure_threshold failures within
+    window_seconds open the breaker for cooldown_seconds, during which
+    wait_if_open() sleeps. Opening again before any success doubles the
+    cooldown, up to max_cooldown_seconds.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_BREAKER_FAILURES,
+        window_seconds: float = CIRCUIT_BREAKER_WINDOW_SECONDS,
+        cooldown_seconds: float = CIRCUIT_BREAKER_COOLDOWN_SECONDS,
+        max_cooldown_seconds: float = CIRCUIT_BREAKER_MAX_COOLDOWN_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.times_opened = 0
+        self._failures: deque[float] = deque()
+        self._next_cooldown = cooldown_seconds
+        self._open_until = 0.0
+
+    def record_failure(self):
+        """Counts a failure and opens the breaker if failures cluster."""
+        now = clock.monotonic()
+        self._failures.append(now)
+        while self._failures[0] < now - self.window_seconds:
+            self._failures.popleft()
+
+        if len(self._failures) >= self.failure_threshold:
+            self._open_until = now + self._next_cooldown
+            self.times_opened += 1
+            logger.warning(
+                f"{len(self._failures)} failures within "
+                f"{self.window_seconds}s, backing off for "
+                f"{self._next_cooldown}s."
+            )
+            self._failures.clear()
+            self._next_cooldown = min(
+                self._next_cooldown * 2, self.max_cooldown_seconds
+            )
+
+    def record_success(self):
+        """A success resets the cooldown to its initial length."""
+        self._next_cooldown = self.cooldown_seconds
+
+    def reset(self):
+        """Closes the breaker and forgets all failures."""
+        self._failures.clear()
+        self._next_cooldown = self.cooldown_seconds
+        self._open_until = 0.0
+        self.times_opened = 0
+
+    @property
+    def is_open(self) -> bool:
+        return clock.monotonic() < self._open_until
+
+    def wait_if_open(self):
+        """Sleeps until the breaker closes again."""
+        remaining = self._open_until - clock.monotonic()
+        if remaining > 0:
+            logger.info(f"Circuit breaker open, waiting {remaining:.0f}s.")
+            with phase_timings.span("cooldown"):
+                clock.sleep(remaining)
+
+
+# Shared by all waits and feeds of this process
+adaptive_timeouts = AdaptiveTimeouts()
+circuit_breaker = CircuitBreaker()
@@ -0,0 +1,71 @@
+import json
+import time
+
+from logs.logger import logger
+from src.config import RESULTS_CACHE_PATH, RESULTS_CACHE_TTL_SECONDS
+from src.metrics import write_atomically
+
+
+class ResultsCache:
+    """
+    Video links of the first results window per search query, with the
+    time they were seen. A query repeated within the TTL can start
+    processing these links before the results grid has rendered.
+    """
+
+    def __init__(
+        self, path: str, ttl_seconds: float = RESULTS_CACHE_TTL_SECONDS
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.entries: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        """Reads the cache file; a missing or damaged file is empty."""
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                entries = json.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable results cache: {e}")
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    @staticmethod
+    def _key(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def _is_fresh(self, entry: dict, now: float) -> bool:
+        return now - entry.get("saved_at", 0) <= self.ttl_seconds
+
+    def get(self, query: str) -> list[str] | None:
+        """Cached links of the query, or None if missing or expired."""
+        entry = self.entries.get(self._key(query))
+        if not entry or not self._is_fresh(entry, time.time()):
+            return None
+        return list(entry["links"])
+
+    def put(self, query: str, links: list[str]):
+        """Stores the links of a query and drops expired entries."""
+        if not links:
+            return
+        now = time.time()
+        self.entries = {
+            key: entry
+            for key, entry in self.entries.items()
+            if self._is_fresh(entry, now)
+        }
+        self.entries[self._key(query)] = {"saved_at": now, "links": links}
+        self._save()
+
+    def _save(self):
+        """Writes through a temporary file so a crash never truncates it."""
+        write_atomically(self.path, json.dumps(self.entries))
+
+
+def open_results_cache() -> ResultsCache | None:
+    """Opens the results cache, or returns None when it is disabled."""
+    if not RESULTS_CACHE_PATH:
+        return None
+    return ResultsCache(RESULTS_CACHE_PATH)
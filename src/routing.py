@@ -0,0 +1,166 @@
+import weakref
+
+from playwright.sync_api import BrowserContext, Page, Request, Route
+
+from logs.logger import logger
+from src.config import ROUTING_PROFILE
+
+
+# URL fragments of analytics and monitoring endpoints
+TRACKER_URL_PATTERNS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "mon.tiktokv.com",
+    "mcs.tiktokw",
+    "/monitor_browser/",
+    "/web/report",
+    "analytics.tiktok.com",
+)
+
+# Request categories blocked by each profile
+ROUTING_PROFILES = {
+    "full": frozenset(),
+    "lean": frozenset({"image", "font", "tracker", "preview_media"}),
+    "minimal": frozenset(
+        {"image", "font", "tracker", "preview_media", "media", "stylesheet"}
+    ),
+}
+
+# Rough average transfer size of a blocked request, per category.
+# Blocked requests never get a response, so savings can only be
+# estimated from these.
+ESTIMATED_BYTES_PER_REQUEST = {
+    "image": 30_000,
+    "font": 40_000,
+    "tracker": 2_000,
+    "preview_media": 400_000,
+    "media": 1_000_000,
+    "stylesheet": 20_000,
+}
+
+
+class RoutingStats:
+    """Counts blocked requests per category over the whole run."""
+
+    def __init__(self):
+        self.blocked: dict[str, int] = {}
+
+    def record(self, category: str):
+        """Counts one blocked request."""
+        self.blocked[category] = self.blocked.get(category, 0) + 1
+
+    def estimated_bytes_saved(self) -> int:
+        """Estimated number of bytes not downloaded thanks to blocking."""
+        return sum(
+            count * ESTIMATED_BYTES_PER_REQUEST.get(category, 0)
+            for category, count in self.blocked.items()
+        )
+
+    def log_summary(self):
+        """Logs the blocked requests and the estimated bytes saved."""
+        if not self.blocked:
+            return
+        details = ", ".join(
+            f"{category}: {count}"
+            for category, count in sorted(self.blocked.items())
+        )
+        logger.info(
+            f"Blocked {sum(self.blocked.values())} requests ({details}), "
+            f"~{self.estimated_bytes_saved() / 1_000_000:.1f} MB saved."
+        )
+
+
+# Stats of every context of this process
+routing_stats = RoutingStats()
+
+# Contexts and pages whose profile blocks the media of video pages
+_media_blocking_targets = weakref.WeakSet()
+
+
+def blocks_video_media(page) -> bool:
+    """
+    Whether the routing profile of a page (or of its context) blocks
+    the media of video pages, so their videos can never start playing.
+    """
+    return (
+        page in _media_blocking_targets
+        or page.context in _media_blocking_targets
+    )
+
+
+def classify_request(request: Request) -> str | None:
+    """
+    Returns the blocking category of a request, or None for requests
+    that are always allowed (documents, scripts, API calls...).
+    """
+    if any(pattern in request.url for pattern in TRACKER_URL_PATTERNS):
+        return "tracker"
+
+    resource_type = request.resource_type
+    if resource_type == "media":
+        try:
+            frame_url = request.frame.url
+        except Exception:
+            frame_url = ""
+        # Media outside a video page is a preview in the search grid
+        return "media" if "/video/" in frame_url else "preview_media"
+    if resource_type in ("image", "font", "stylesheet"):
+        return resource_type
+    return None
+
+
+def get_blocked_categories(profile: str) -> frozenset:
+    """Returns the categories blocked by a profile, validating its name."""
+    if profile not in ROUTING_PROFILES:
+        raise ValueError(
+            f"Unknown routing profile '{profile}'. "
+            f"Available: {', '.join(ROUTING_PROFILES)}."
+        )
+    return ROUTING_PROFILES[profile]
+
+
+def apply_routing_profile(
+    context: BrowserContext | Page, profile: str = ROUTING_PROFILE
+):
+    """
+    Installs a context-wide (or page-wide, when given a page) route
+    aborting the requests blocked by the given profile.
+    The "full" profile installs no route at all.
+    """
+    blocked_categories = get_blocked_categories(profile)
+    if not blocked_categories:
+        return
+    if "media" in blocked_categories:
+        _media_blocking_targets.add(context)
+
+    def handle_route(route: Route):
+        category = classify_request(route.request)
+        if category in blocked_categories:
+            routing_stats.record(category)
+            route.abort()
+        else:
+            route.fallback()
+
+    context.route("**/*", handle_route)
+    logger.info(f"Applied '{profile}' routing profile.")
+
+
+async def async_apply_routing_profile(context, profile: str = ROUTING_PROFILE):
+    """Async version of apply_routing_profile."""
+    blocked_categories = get_blocked_categories(profile)
+    if not blocked_categories:
+        return
+    if "media" in blocked_categories:
+        _media_blocking_targets.add(context)
+
+    async def handle_route(route):
+        category = classify_request(route.request)
+        if category in blocked_categories:
+            routing_stats.record(category)
+            await route.abort()
+        else:
+            await route.fallback()
+
+    await context.route("**/*", handle_route)
+    logger.info(f"Applied '{profile}' routing profile.")
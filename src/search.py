@@ -1,36 +1,144 @@
+from urllib.parse import quote, urlsplit
+
 from playwright.sync_api import Page, expect
 from logs.logger import logger
-from src.config import DEFAULT_SEARCH_QUERY
-import time
+from src.api_harvest import is_search_results_url
+from src.config import (
+    DEFAULT_SEARCH_QUERY,
+    SEARCH_MODE,
+    SEARCH_NAVIGATION_TIMEOUT_MS,
+    SEARCH_RESULTS_TIMEOUT_MS,
+    TIKTOK_BASE_URL,
+)
+from src.metrics import phase_timings
+from src.readiness import (
+    CARD_COUNT_ABOVE_SCRIPT,
+    SEARCH_INPUT_SELECTOR,
+    wait_until_ready,
+)
+from src.resilience import adaptive_timeouts
+from src.results_cache import ResultsCache
+from src.viewer import SEARCH_VIDEO_CARD_SELECTOR, read_video_links
+
+SEARCH_MODES = ("ui", "direct")
+
+
+def search_results_url(current_url: str, query: str) -> str:
+    """
+    Video search results URL of query, on the site of current_url
+    (TIKTOK_BASE_URL when the page has not loaded a site yet).
+    """
+    parts = urlsplit(current_url)
+    if parts.scheme in ("http", "https"):
+        base_url = f"{parts.scheme}://{parts.netloc}"
+    else:
+        base_url = TIKTOK_BASE_URL
+    return f"{base_url}/search/video?q={quote(query)}"
+
+
+def _submit_search_box(page: Page, query: str):
+    """Types the query into the search box and waits for the results URL."""
+    if page.url == "about:blank":
+        # A fresh saved session is used without loading TikTok first
+        page.goto(f"{TIKTOK_BASE_URL}/", wait_until="commit")
 
+    search_input = page.locator(SEARCH_INPUT_SELECTOR)
+    expect(search_input).to_be_visible()
+    expect(search_input).to_be_enabled()
+    logger.info("Found search input field.")
+
+    # Also set when starting from a previous results page
+    previous_url = page.url
+
+    search_input.fill(query)
+    logger.info(f"Entered search query: '{query}'")
+    page.keyboard.press("Enter")
+    logger.info("Pressed Enter to submit search.")
+
+    with adaptive_timeouts.track(
+        "search navigation", SEARCH_NAVIGATION_TIMEOUT_MS
+    ) as timeout_ms:
+        page.wait_for_url(
+            lambda url: is_search_results_url(url) and url != previous_url,
+            timeout=timeout_ms,
+            wait_until="commit",
+        )
 
-def perform_search(page: Page, query: str = DEFAULT_SEARCH_QUERY):
-    """Performs a search on TikTok using the given query."""
+
+def _open_search_results_url(page: Page, query: str) -> bool:
+    """
+    Navigates straight to the results URL of the query. Returns False
+    if that failed or ended elsewhere (e.g. a redirect to login).
+    """
+    url = search_results_url(page.url, query)
+    try:
+        page.goto(url, wait_until="commit")
+    except Exception as e:
+        logger.warning(f"Direct navigation to {url} failed: {e}")
+        return False
+
+    if not is_search_results_url(page.url):
+        logger.warning(f"Direct navigation to {url} ended at {page.url}.")
+        return False
+    return True
+
+
+def perform_search(
+    page: Page,
+    query: str = DEFAULT_SEARCH_QUERY,
+    mode: str = SEARCH_MODE,
+    results_cache: ResultsCache | None = None,
+) -> list[str]:
+    """
+    Performs a search on TikTok using the given query.
+    With mode="direct" the results URL is opened without typing into the
+    search box, which remains the fallback. When results_cache holds a
+    fresh first window of this query, its links are returned at once
+    without waiting for the grid (warm start); otherwise the rendered
+    first window is cached and an empty list is returned.
+    """
     if not query:
         query = DEFAULT_SEARCH_QUERY
+    if mode not in SEARCH_MODES:
+        raise ValueError(
+            f"Unknown search mode '{mode}', "
+            f"expected one of {', '.join(SEARCH_MODES)}."
+        )
 
     logger.info(f"Starting search for query: '{query}'")
 
     try:
-        search_input_selector = 'input[placeholder*="Search"]'
-        search_input = page.locator(search_input_selector)
-        expect(search_input).to_be_visible()
-        expect(search_input).to_be_enabled()
-        logger.info("Found search input field.")
-
-        search_input.fill(query)
-        logger.info(f"Entered search query: '{query}'")
-        page.keyboard.press("Enter")
-        logger.info("Pressed Enter to submit search.")
+        with phase_timings.span("search"):
+            if mode == "direct" and _open_search_results_url(page, query):
+                logger.info("Opened search results URL directly.")
+            else:
+                if mode == "direct":
+                    logger.info("Falling back to the search box.")
+                _submit_search_box(page, query)
+            logger.info("Successfully navigated to search results page.")
 
-        page.wait_for_url(
-            lambda url: "/tag/" in url or "/search/video/" in url,
-            timeout=30000,
-        )
-        logger.info("Successfully navigated to search results page.")
+            cached_links = results_cache.get(query) if results_cache else None
+            if cached_links:
+                logger.info(
+                    f"Warm start with {len(cached_links)} cached results."
+                )
+                logger.info("Search completed successfully.")
+                return cached_links
 
-        time.sleep(3)  # Give some time for videos to load
-        logger.info("Search completed successfully.")
+            # Wait until the first video cards are rendered
+            wait_until_ready(
+                "search results",
+                lambda timeout: page.wait_for_function(
+                    CARD_COUNT_ABOVE_SCRIPT,
+                    arg=[SEARCH_VIDEO_CARD_SELECTOR, 0],
+                    timeout=timeout,
+                ),
+                SEARCH_RESULTS_TIMEOUT_MS,
+            )
+            if results_cache is not None:
+                results_cache.put(query, read_video_links(page))
+            logger.info("Search completed successfully.")
+            return []
 
     except Exception as e:
         logger.error(f"Error during search: {e}")
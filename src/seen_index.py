@@ -0,0 +1,178 @@
+import hashlib
+import math
+import os
+import sqlite3
+import time
+
+from logs.logger import logger
+from src.config import (
+    SEEN_INDEX_BLOOM_CAPACITY,
+    SEEN_INDEX_COMMIT_BATCH,
+    SEEN_INDEX_PATH,
+    SEEN_INDEX_TTL_SECONDS,
+)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over integers. Answers "definitely not
+    present" without touching the database for most unseen IDs.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(
+            8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: int):
+        """Bit positions of an item (double hashing of one digest)."""
+        digest = hashlib.blake2b(
+            item.to_bytes(8, "little", signed=False), digest_size=16
+        ).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return (
+            (first + i * second) % self.size for i in range(self.hash_count)
+        )
+
+    def add(self, item: int):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: int) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class SeenVideoIndex:
+    """
+    Persistent set of processed numeric video IDs, stored in SQLite and
+    namespaced per account. Entries expire after ttl_seconds and are
+    purged when the index is opened. A Bloom filter loaded at start-up
+    answers most lookups from memory. Added IDs are written commit_batch
+    at a time (and by flush() or close()), so the database is not locked
+    for every video.
+    """
+
+    def __init__(
+        self,
+        path: str = SEEN_INDEX_PATH,
+        namespace: str = "default",
+        ttl_seconds: int = SEEN_INDEX_TTL_SECONDS,
+        bloom_capacity: int = SEEN_INDEX_BLOOM_CAPACITY,
+        commit_batch: int = SEEN_INDEX_COMMIT_BATCH,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.commit_batch = commit_batch
+        # Video ID -> seen_at of the IDs not written yet
+        self._pending: dict[int, float] = {}
+
+        # Several worker processes may share the file
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS seen_videos ("
+            "namespace TEXT NOT NULL, "
+            "video_id INTEGER NOT NULL, "
+            "seen_at REAL NOT NULL, "
+            "PRIMARY KEY (namespace, video_id)"
+            ") WITHOUT ROWID"
+        )
+        self._connection.commit()
+        purged = self.purge_expired()
+
+        self._bloom = BloomFilter(bloom_capacity)
+        loaded = 0
+        for (video_id,) in self._connection.execute(
+            "SELECT video_id FROM seen_videos "
+            "WHERE namespace = ? AND seen_at >= ?",
+            (namespace, self._cutoff()),
+        ):
+            self._bloom.add(video_id)
+            loaded += 1
+
+        logger.info(
+            f"Seen-video index '{namespace}' loaded with {loaded} IDs "
+            f"({purged} expired entries purged)."
+        )
+
+    def _cutoff(self) -> float:
+        """Oldest seen_at timestamp that is still valid."""
+        return time.time() - self.ttl_seconds
+
+    def __contains__(self, video_id: int) -> bool:
+        if video_id not in self._bloom:
+            return False
+        if video_id in self._pending:
+            return self._pending[video_id] >= self._cutoff()
+        row = self._connection.execute(
+            "SELECT 1 FROM seen_videos "
+            "WHERE namespace = ? AND video_id = ? AND seen_at >= ?",
+            (self.namespace, video_id, self._cutoff()),
+        ).fetchone()
+        return row is not None
+
+    def add(self, video_id: int):
+        """Marks a video ID as seen now."""
+        self._pending[video_id] = time.time()
+        self._bloom.add(video_id)
+        if len(self._pending) >= self.commit_batch:
+            self.flush()
+
+    def flush(self):
+        """Writes the IDs added since the last flush in one transaction."""
+        if not self._pending:
+            return
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO seen_videos "
+            "(namespace, video_id, seen_at) VALUES (?, ?, ?)",
+            [
+                (self.namespace, video_id, seen_at)
+                for video_id, seen_at in self._pending.items()
+            ],
+        )
+        self._connection.commit()
+        self._pending.clear()
+
+    def purge_expired(self) -> int:
+        """Deletes expired entries of every namespace, returns the count."""
+        self.flush()
+        deleted = self._connection.execute(
+            "DELETE FROM seen_videos WHERE seen_at < ?", (self._cutoff(),)
+        ).rowcount
+        self._connection.commit()
+        return deleted
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._connection.close()
+
+
+def open_seen_index(storage_state_path: str) -> SeenVideoIndex | None:
+    """
+    Opens the index namespace of an account,
+    or returns None when SEEN_INDEX_PATH is disabled.
+    """
+    if not SEEN_INDEX_PATH:
+        return None
+    return SeenVideoIndex(
+        SEEN_INDEX_PATH, namespace=account_namespace(storage_state_path)
+    )
+
+
+def parse_video_id(video_id: str) -> int | None:
+    """Returns the numeric form of a video ID, or None if it has none."""
+    return int(video_id) if video_id.isdigit() else None
+
+
+def account_namespace(storage_state_path: str) -> str:
+    """Index namespace of an account: its storage-state file name."""
+    return os.path.splitext(os.path.basename(storage_state_path))[0]
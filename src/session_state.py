@@ -0,0 +1,86 @@
+import json
+import os
+import time
+
+from logs.logger import logger
+from src.config import SESSION_COOKIE_NAMES, SESSION_MIN_REMAINING_SECONDS
+
+# Storage-state path -> (file mtime, session expiry) of the last read
+_expiry_cache: dict[str, tuple[float, float | None]] = {}
+
+
+def _read_session_expiry(storage_state_path: str) -> float | None:
+    """Earliest expiry of the session cookies saved in the storage state."""
+    try:
+        with open(storage_state_path, encoding="utf-8") as state_file:
+            cookies = json.load(state_file).get("cookies", [])
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Could not read session cookies: {e}")
+        return None
+    return cookies_session_expiry(cookies)
+
+
+def cookies_session_expiry(cookies: list[dict]) -> float | None:
+    """
+    Earliest expiry of the session cookies among cookies (as saved in a
+    storage state or returned by BrowserContext.cookies()).
+    """
+    expiries = [
+        cookie.get("expires", -1)
+        for cookie in cookies
+        if cookie.get("name") in SESSION_COOKIE_NAMES
+    ]
+    # -1 marks a cookie that only lives as long as the browser session
+    if len(expiries) < len(SESSION_COOKIE_NAMES) or min(expiries) <= 0:
+        return None
+    return min(expiries)
+
+
+def session_expires_at(storage_state_path: str) -> float | None:
+    """
+    Time (epoch seconds) at which the saved session expires, or None if
+    unknown. Cached per file until the file changes.
+    """
+    try:
+        modified_at = os.path.getmtime(storage_state_path)
+    except OSError:
+        return None
+
+    cached = _expiry_cache.get(storage_state_path)
+    if cached and cached[0] == modified_at:
+        return cached[1]
+
+    expires_at = _read_session_expiry(storage_state_path)
+    _expiry_cache[storage_state_path] = (modified_at, expires_at)
+    return expires_at
+
+
+def is_session_fresh(
+    storage_state_path: str,
+    min_remaining_seconds: float = SESSION_MIN_REMAINING_SECONDS,
+) -> bool:
+    """
+    Whether the saved session cookies stay valid for at least
+    min_remaining_seconds, so the session need not be validated.
+    """
+    return _is_fresh(
+        session_expires_at(storage_state_path), min_remaining_seconds
+    )
+
+
+def are_cookies_fresh(
+    cookies: list[dict],
+    min_remaining_seconds: float = SESSION_MIN_REMAINING_SECONDS,
+) -> bool:
+    """
+    Whether the session cookies of a live context stay valid for at
+    least min_remaining_seconds, so the session need not be validated.
+    """
+    return _is_fresh(cookies_session_expiry(cookies), min_remaining_seconds)
+
+
+def _is_fresh(expires_at: float | None, min_remaining_seconds: float) -> bool:
+    return (
+        expires_at is not None
+        and expires_at - time.time() >= min_remaining_seconds
+    )
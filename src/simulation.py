@@ -0,0 +1,268 @@
+import argparse
+import json
+import logging
+import random
+import sys
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from logs.logger import logger
+from src.clock import clock
+from src.config import (
+    DEFAULT_SKIP_PERCENT,
+    MAX_VIDEOS_TO_PROCESS,
+    MAX_WATCH_DURATION_SECONDS,
+    MIN_WATCH_DURATION_SECONDS,
+    PARALLEL_WATCH_TABS,
+    VIDEO_TAB_MODE,
+)
+from src.metrics import phase_timings
+from src.readiness import CARD_COUNT_ABOVE_SCRIPT, VIDEO_CAN_PLAY_SCRIPT
+from src.resilience import adaptive_timeouts, circuit_breaker
+from src.viewer import (
+    HARVEST_NEW_VIDEO_LINKS_SCRIPT,
+    READ_VIDEO_LINKS_SCRIPT,
+    SCROLL_TO_BOTTOM_SCRIPT,
+    watch_tiktok_feed,
+)
+
+SIMULATED_ORIGIN = "https://www.tiktok.com"
+
+# Latency ranges (ms) of the simulated site, drawn uniformly
+SITE_MODEL = {
+    "cards_per_query": 300,
+    "cards_per_scroll": 12,
+    "scroll_latency_ms": (300, 2500),
+    "navigation_latency_ms": (100, 800),
+    "video_ready_latency_ms": (200, 3000),
+    "card_height_px": 320,
+}
+
+
+class SimulatedPage:
+    """
+    Fake Page answering the scripts and waits of watch_tiktok_feed from a
+    model of the search results feed. Latencies advance the virtual clock
+    instead of waiting, and a wait longer than its timeout raises like
+    Playwright does. Pages of one context share the model and counters.
+    """
+
+    def __init__(self, model: dict, rng: random.Random, stats: dict):
+        self.model = model
+        self.rng = rng
+        self.stats = stats
+        self.url = f"{SIMULATED_ORIGIN}/search/video?q=simulation"
+        self.context = SimulatedContext(model, rng, stats)
+        self._rendered = 0
+        self._harvested = 0
+        # Virtual time at which the batch requested by a scroll renders
+        self._batch_ready_at: float | None = None
+
+    def _latency(self, name: str) -> float:
+        """A latency of the model in seconds."""
+        return self.rng.uniform(*self.model[name]) / 1000
+
+    def _links(self, start: int, end: int) -> list[str]:
+        return [
+            f"{SIMULATED_ORIGIN}/@creator{index % 10}/video/{index + 1}"
+            for index in range(start, end)
+        ]
+
+    def _wait(self, seconds: float, timeout_ms: float | None):
+        """Lets seconds pass, or the timeout if that is shorter."""
+        if timeout_ms and seconds * 1000 > timeout_ms:
+            clock.advance(timeout_ms / 1000)
+            raise PlaywrightTimeoutError(f"Timeout {timeout_ms}ms exceeded.")
+        clock.advance(seconds)
+
+    def evaluate(self, script: str, arg=None):
+        if script == HARVEST_NEW_VIDEO_LINKS_SCRIPT:
+            links = self._links(self._harvested, self._rendered)
+            self._harvested = self._rendered
+            return links
+        if script == READ_VIDEO_LINKS_SCRIPT:
+            return self._links(0, self._rendered)
+        if script == SCROLL_TO_BOTTOM_SCRIPT:
+            self.stats["scrolls"] += 1
+            if self._rendered < self.model["cards_per_query"]:
+                self._batch_ready_at = clock.monotonic() + self._latency(
+                    "scroll_latency_ms"
+                )
+            return self._rendered
+        if script == "document.body.scrollHeight":
+            return self._rendered * self.model["card_height_px"]
+        return None
+
+    def wait_for_function(self, script: str, arg=None, timeout=None):
+        if script == VIDEO_CAN_PLAY_SCRIPT:
+            self._wait(self._latency("video_ready_latency_ms"), timeout)
+            return
+        if script == CARD_COUNT_ABOVE_SCRIPT and self._rendered > arg[1]:
+            return
+        if script == CARD_COUNT_ABOVE_SCRIPT and self._batch_ready_at:
+            self._wait(self._batch_ready_at - clock.monotonic(), timeout)
+            self._batch_ready_at = None
+            self._rendered = min(
+                self._rendered + self.model["cards_per_scroll"],
+                self.model["cards_per_query"],
+            )
+            return
+        # The condition never becomes true (e.g. end of the feed)
+        self._wait(float("inf"), timeout)
+
+    def goto(
+        self,
+        url: str,
+        wait_until: str | None = None,
+        timeout: float | None = None,
+    ):
+        self._wait(self._latency("navigation_latency_ms"), timeout)
+        if "/video/" in url:
+            self.stats["videos_opened"] += 1
+
+    def go_back(
+        self, wait_until: str | None = None, timeout: float | None = None
+    ):
+        self._wait(self._latency("navigation_latency_ms"), timeout)
+
+    def close(self):
+        pass
+
+
+class SimulatedContext:
+    """Fake BrowserContext whose tabs are SimulatedPages."""
+
+    def __init__(self, model: dict, rng: random.Random, stats: dict):
+        self.model = model
+        self.rng = rng
+        self.stats = stats
+
+    def new_page(self) -> SimulatedPage:
+        return SimulatedPage(self.model, self.rng, self.stats)
+
+
+def simulate_sessions(
+    sessions: int,
+    seed: int = 0,
+    model: dict | None = None,
+    skip_percent: int = DEFAULT_SKIP_PERCENT,
+    max_videos_to_process: int = MAX_VIDEOS_TO_PROCESS,
+    video_tab_mode: str = VIDEO_TAB_MODE,
+    parallel_tabs: int = PARALLEL_WATCH_TABS,
+    watch_seconds_range: tuple[int, int] = (
+        MIN_WATCH_DURATION_SECONDS,
+        MAX_WATCH_DURATION_SECONDS,
+    ),
+) -> dict:
+    """
+    Runs watch_tiktok_feed sessions against the simulated site on virtual
+    time and returns throughput, scroll and skip estimates for the given
+    feed settings. The same seed gives the same numbers.
+    """
+    model = {**SITE_MODEL, **(model or {})}
+    site_rng = random.Random(seed)
+    # Skip decisions and watch times, kept apart from the site's latencies
+    viewer_rng = random.Random(seed + 1)
+    phase_timings.reset()
+    # Learned timeouts and breaker state (in virtual timestamps) must
+    # neither come from nor leak into another simulation or a real run
+    adaptive_timeouts.reset()
+    circuit_breaker.reset()
+    totals = {"processed": 0, "videos_opened": 0, "scrolls": 0}
+
+    # Per-video logging would dominate the run time
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        with clock.virtual():
+            for _ in range(sessions):
+                stats = {"scrolls": 0, "videos_opened": 0}
+                page = SimulatedPage(model, site_rng, stats)
+                totals["processed"] += watch_tiktok_feed(
+                    page,
+                    skip_percent=skip_percent,
+                    max_videos_to_process=max_videos_to_process,
+                    video_tab_mode=video_tab_mode,
+                    watch_seconds_range=watch_seconds_range,
+                    parallel_tabs=parallel_tabs,
+                    rng=viewer_rng,
+                )
+                totals["videos_opened"] += stats["videos_opened"]
+                totals["scrolls"] += stats["scrolls"]
+            hours = clock.monotonic() / 3600
+    finally:
+        logger.setLevel(level)
+        adaptive_timeouts.reset()
+        circuit_breaker.reset()
+
+    return {
+        "sessions": sessions,
+        "virtual_hours": round(hours, 2),
+        "videos_processed": totals["processed"],
+        "videos_watched": totals["videos_opened"],
+        "videos_per_hour": (
+            round(totals["processed"] / hours, 1) if hours else 0
+        ),
+        "watched_per_hour": (
+            round(totals["videos_opened"] / hours, 1) if hours else 0
+        ),
+        "scrolls_per_session": round(totals["scrolls"] / sessions, 1),
+        "skip_ratio": (
+            round(1 - totals["videos_opened"] / totals["processed"], 3)
+            if totals["processed"]
+            else 0
+        ),
+        "phases": phase_timings.summary(),
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parses command line options of the simulation."""
+    parser = argparse.ArgumentParser(
+        description="Estimate feed throughput on virtual time."
+    )
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--skip-percent", type=int, default=DEFAULT_SKIP_PERCENT
+    )
+    parser.add_argument("--videos", type=int, default=MAX_VIDEOS_TO_PROCESS)
+    parser.add_argument(
+        "--video-tab-mode",
+        choices=("same", "secondary"),
+        default=VIDEO_TAB_MODE,
+    )
+    parser.add_argument(
+        "--parallel-tabs", type=int, default=PARALLEL_WATCH_TABS
+    )
+    parser.add_argument(
+        "--model",
+        default=None,
+        help="JSON object overriding SITE_MODEL entries, e.g. "
+        "'{\"scroll_latency_ms\": [1000, 5000]}'.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Runs the simulation and prints its estimates as JSON."""
+    args = parse_args(argv)
+    model = {
+        name: tuple(value) if isinstance(value, list) else value
+        for name, value in json.loads(args.model or "{}").items()
+    }
+    report = simulate_sessions(
+        args.sessions,
+        args.seed,
+        model,
+        args.skip_percent,
+        args.videos,
+        args.video_tab_mode,
+        args.parallel_tabs,
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+from playwright.sync_api import BrowserContext, Page
+
+from logs.logger import logger
+from src.config import VIDEO_TAB_POOL_SIZE
+from src.readiness import navigate
+
+
+class VideoTabPool:
+    """
+    A small pool of reusable secondary pages used to open videos,
+    so the search results page keeps its DOM and scroll position.
+    Tabs are created lazily and handed out round-robin.
+    """
+
+    def __init__(
+        self, context: BrowserContext, size: int = VIDEO_TAB_POOL_SIZE
+    ):
+        self.context = context
+        self.size = max(1, size)
+        self._tabs: list[Page] = []
+        self._next_index = 0
+        # Video URL -> tab that already started loading it
+        self._prefetched: dict[str, Page] = {}
+
+    def acquire(self) -> Page:
+        """Returns the next tab of the pool, opening it on first use."""
+        if len(self._tabs) < self.size:
+            self._tabs.append(self.context.new_page())
+            logger.info(f"Opened video tab {len(self._tabs)}/{self.size}.")
+            return self._tabs[-1]
+
+        tab = self._tabs[self._next_index]
+        self._next_index = (self._next_index + 1) % self.size
+
+        # Forget a prefetch that was never used, the tab is reused now
+        for url, prefetched_tab in list(self._prefetched.items()):
+            if prefetched_tab is tab:
+                del self._prefetched[url]
+        return tab
+
+    def open(self, video_url: str) -> Page:
+        """
+        Returns a tab showing video_url: the prefetched one if there is
+        one, otherwise the next tab of the pool navigated to the video.
+        """
+        tab = self._prefetched.pop(video_url, None)
+        if tab:
+            logger.info("Using prefetched video tab.")
+            return tab
+
+        tab = self.acquire()
+        navigate(tab, video_url)
+        return tab
+
+    def prefetch(self, video_url: str):
+        """
+        Starts loading video_url in the next tab of the pool without
+        waiting for the page to finish loading.
+        """
+        tab = self.acquire()
+        try:
+            navigate(tab, video_url)
+        except Exception as e:
+            logger.warning(f"Could not prefetch {video_url}: {e}")
+            return
+        self._prefetched[video_url] = tab
+        logger.info(f"Prefetching next video: {video_url}")
+
+    def close(self):
+        """Closes every tab of the pool."""
+        for tab in self._tabs:
+            try:
+                tab.close()
+            except Exception as e:
+                logger.warning(f"Could not close video tab: {e}")
+        self._tabs.clear()
+        self._prefetched.clear()
+        self._next_index = 0
@@ -1,4 +1,3 @@
-import time
 import random
 
 from playwright.sync_api import Page
@@ -12,139 +11,553 @@ from src.config import (
     MAX_WATCH_DURATION_SECONDS,
     MAX_FEED_SCROLLS,
     MAX_VIDEOS_TO_PROCESS,
+    PARALLEL_WATCH_TABS,
+    SCROLL_READY_TIMEOUT_MS,
+    VIDEO_TAB_MODE,
+    VIDEO_TAB_POOL_SIZE,
+    PREFETCH_NEXT_VIDEO,
 )
+from src.api_harvest import ApiHarvester, is_feed_api_response
+from src.checkpoint import FeedCheckpoint
+from src.clock import clock
+from src.memory_governor import MemoryGovernor, create_memory_governor
+from src.metrics import phase_timings
+from src.parallel_watch import ParallelWatcher
+from src.readiness import (
+    CARD_COUNT_ABOVE_SCRIPT,
+    navigate,
+    navigate_back,
+    wait_for_video_ready,
+    wait_until_ready,
+)
+from src.resilience import circuit_breaker
+from src.seen_index import SeenVideoIndex, parse_video_id
+from src.video_tabs import VideoTabPool
+
+
+SEARCH_VIDEO_CARD_SELECTOR = 'div[data-e2e="search-video-card"]'
+
+# Harvests the video links of all cards that were not harvested before
+# in a single in-page evaluation. Harvested cards are marked with a data
+# attribute, which acts as a cursor: every call only returns the cards
+# added since the previous one, already normalized (no query params).
+HARVEST_NEW_VIDEO_LINKS_SCRIPT = """
+(cardSelector) => {
+    const links = [];
+    const cards = document.querySelectorAll(
+        cardSelector + ":not([data-tap-harvested])"
+    );
+    for (const card of cards) {
+        card.setAttribute("data-tap-harvested", "1");
+        const anchor = card.querySelector('a[href*="/video/"]');
+        if (!anchor) continue;
+        const url = new URL(anchor.href, location.href);
+        links.push(url.origin + url.pathname);
+    }
+    return links;
+}
+"""
+
+# Reads the normalized links of all loaded cards without marking them,
+# so the next harvest still returns them
+READ_VIDEO_LINKS_SCRIPT = """
+(cardSelector) => {
+    const links = [];
+    for (const card of document.querySelectorAll(cardSelector)) {
+        const anchor = card.querySelector('a[href*="/video/"]');
+        if (!anchor) continue;
+        const url = new URL(anchor.href, location.href);
+        links.push(url.origin + url.pathname);
+    }
+    return links;
+}
+"""
+
+# Scrolls to the bottom and returns how many cards were loaded before,
+# so the growth of the feed can be awaited without another round-trip
+SCROLL_TO_BOTTOM_SCRIPT = """
+(cardSelector) => {
+    window.scrollTo(0, document.body.scrollHeight);
+    return document.querySelectorAll(cardSelector).length;
+}
+"""
+
+
+def wait_for_more_cards(
+    page: Page,
+    card_count: int,
+    description: str = "more video cards",
+    confirm_timeout: bool = True,
+) -> bool:
+    """
+    Waits until the feed holds more than card_count video cards.
+    Waits of different kinds use their own description, so the timeout
+    learned for one is not skewed by the durations of the other.
+    A timeout is taken as the end of the feed, so by default it is only
+    accepted at the fixed bound, not at the learned timeout.
+    """
+    return wait_until_ready(
+        description,
+        lambda timeout: page.wait_for_function(
+            CARD_COUNT_ABOVE_SCRIPT,
+            arg=[SEARCH_VIDEO_CARD_SELECTOR, card_count],
+            timeout=timeout,
+        ),
+        SCROLL_READY_TIMEOUT_MS,
+        confirm_timeout,
+    )
+
+
+def scroll_and_wait_for_feed_response(page: Page) -> bool:
+    """
+    Scrolls to the bottom and waits for the feed API response the
+    scroll triggers (the wait is armed before scrolling, so a fast
+    response is not missed).
+    """
+
+    def scroll(timeout: float):
+        with page.expect_response(is_feed_api_response, timeout=timeout):
+            page.evaluate(SCROLL_TO_BOTTOM_SCRIPT, SEARCH_VIDEO_CARD_SELECTOR)
+
+    # No response ends the feed, so the fixed bound confirms a timeout
+    return wait_until_ready(
+        "feed API response",
+        scroll,
+        SCROLL_READY_TIMEOUT_MS,
+        confirm_timeout=True,
+    )
+
+
+def harvest_new_video_links(page: Page) -> list[str]:
+    """
+    Returns the normalized links of the video cards
+    added to the page since the previous harvest.
+    """
+    return (
+        page.evaluate(
+            HARVEST_NEW_VIDEO_LINKS_SCRIPT, SEARCH_VIDEO_CARD_SELECTOR
+        )
+        or []
+    )
+
+
+def read_video_links(page: Page) -> list[str]:
+    """Returns the normalized links of all video cards on the page."""
+    return (
+        page.evaluate(READ_VIDEO_LINKS_SCRIPT, SEARCH_VIDEO_CARD_SELECTOR)
+        or []
+    )
+
+
+def get_video_id(video_url: str) -> str:
+    """Extracts the video ID (last path segment) from a video link."""
+    return video_url.rstrip("/").split("/")[-1] or video_url
+
+
+def _watch_video(
+    page: Page,
+    video_url: str,
+    video_id: str,
+    video_tabs: VideoTabPool | None = None,
+    next_video_url: str | None = None,
+    watch_seconds_range: tuple[int, int] = (
+        MIN_WATCH_DURATION_SECONDS,
+        MAX_WATCH_DURATION_SECONDS,
+    ),
+    rng: random.Random | None = None,
+) -> bool:
+    """
+    Opens a video and watches it for a random time
+    within watch_seconds_range (drawn from rng, by default the global
+    random generator). Returns whether the video became
+    playable (a video that never does is still given its watch time).
+    Without video_tabs the search results page itself navigates to the
+    video and goes back afterwards; with video_tabs the video is opened
+    in a secondary tab and the results page is left untouched.
+    With video_tabs, next_video_url starts loading in another tab
+    while this video is being watched.
+    """
+    with phase_timings.span("navigation"):
+        if video_tabs:
+            # Reuses the tab if this video was prefetched
+            video_page = video_tabs.open(video_url)
+        else:
+            # Navigate to the individual video page
+            video_page = page
+            navigate(video_page, video_url)
+
+        # Start the watch timer as soon as the video can play
+        played = wait_for_video_ready(video_page)
+
+    if video_tabs and next_video_url:
+        video_tabs.prefetch(next_video_url)
+
+    # Pick random watch time within set range
+    watch_time = (rng or random).randint(*watch_seconds_range)
+    logger.info(f"Watching video for {watch_time} seconds.")
+    with phase_timings.span("watch"):
+        clock.sleep(watch_time)
+
+    if video_tabs:
+        logger.info(
+            f"Video ID: {video_id}, Link: {video_url} - Watched fully."
+        )
+        return played
+
+    logger.info(
+        f"Video ID: {video_id}, Link: {video_url} "
+        f"- Watched fully. Returning to search results."
+    )
+
+    with phase_timings.span("navigation"):
+        # Go back to the previous page (the search results feed)
+        navigate_back(page)
+
+        # Wait for the search results to be rendered again (usually
+        # instant from the back/forward cache, unlike a scroll)
+        wait_for_more_cards(
+            page, 0, "search results after going back", confirm_timeout=False
+        )
+    return played
 
 
 def watch_tiktok_feed(
     page: Page,
     skip_percent: int = DEFAULT_SKIP_PERCENT,
     max_videos_to_process: int = MAX_VIDEOS_TO_PROCESS,
-):
+    video_tab_mode: str = VIDEO_TAB_MODE,
+    prefetch: bool = PREFETCH_NEXT_VIDEO,
+    seen_index: SeenVideoIndex | None = None,
+    watch_seconds_range: tuple[int, int] = (
+        MIN_WATCH_DURATION_SECONDS,
+        MAX_WATCH_DURATION_SECONDS,
+    ),
+    initial_links: list[str] | None = None,
+    api_harvester: ApiHarvester | None = None,
+    memory_governor: MemoryGovernor | None = None,
+    checkpoint: FeedCheckpoint | None = None,
+    parallel_tabs: int = PARALLEL_WATCH_TABS,
+    rng: random.Random | None = None,
+) -> int:
     """
     Walks through TikTok search results, watching
     or skipping videos based on skip_percent,
     scrolling to load more, and logging actions.
-    Processes up to max_videos_to_process videos.
+    Processes up to max_videos_to_process videos
+    and returns the number of unique videos processed.
+    With video_tab_mode="secondary" videos are opened in reusable
+    secondary tabs instead of the search results page, and with prefetch
+    the next video to watch is loaded while the current one plays.
+    Videos found in seen_index (processed by earlier runs) are ignored
+    and every processed video is added to it. Each watched video plays
+    for a random number of seconds within watch_seconds_range.
+    initial_links (e.g. cached results of a repeated query) are processed
+    before the first scroll, without waiting for the grid.
+    With api_harvester, new links are taken from the feed API responses
+    instead of the rendered cards, queued API pages are processed
+    before scrolling again, and the feed ends when the API has no more
+    results (or a scroll brings none) rather than on the scroll height.
+    memory_governor (by default the configured one, if enabled) prunes
+    processed cards and reloads the results page when its memory grows
+    beyond the budget.
+    Progress is recorded in checkpoint; a checkpoint that already holds
+    progress of this feed is resumed by scrolling back to its position
+    and skipping the videos it lists.
+    With parallel_tabs above 1, up to that many videos play at the same
+    time in their own tabs while the feed keeps scrolling; every started
+    video is watched to the end before returning.
+    Skip decisions and watch times are drawn from rng (by default the
+    global random generator), so a seeded one makes a run repeatable.
     """
     logger.info(
         f"Starting to watch TikTok feed with {skip_percent}% skip chance."
     )
 
+    if memory_governor is None:
+        memory_governor = create_memory_governor()
+
+    video_tabs = None
+    parallel_watcher = None
+    if parallel_tabs > 1:
+        parallel_watcher = ParallelWatcher(
+            page.context, parallel_tabs, watch_seconds_range, rng
+        )
+    elif video_tab_mode == "secondary":
+        # Prefetching needs a second tab to load into while one plays
+        video_tabs = VideoTabPool(
+            page.context,
+            max(VIDEO_TAB_POOL_SIZE, 2) if prefetch else VIDEO_TAB_POOL_SIZE,
+        )
+    try:
+        processed = _process_feed(
+            page,
+            skip_percent,
+            max_videos_to_process,
+            video_tabs,
+            prefetch,
+            seen_index,
+            watch_seconds_range,
+            initial_links,
+            api_harvester,
+            memory_governor,
+            checkpoint,
+            parallel_watcher,
+            rng,
+        )
+        if parallel_watcher:
+            parallel_watcher.drain()
+        return processed
+    finally:
+        if video_tabs:
+            video_tabs.close()
+        if parallel_watcher:
+            parallel_watcher.close()
+
+
+def _scroll_feed(page: Page, api_harvester: ApiHarvester | None = None):
+    """Scrolls to the bottom and waits for the next batch of the feed."""
+    with phase_timings.span("scroll"):
+        if api_harvester:
+            # The API response is enough, no need to wait for rendering
+            scroll_and_wait_for_feed_response(page)
+            return
+
+        card_count = page.evaluate(
+            SCROLL_TO_BOTTOM_SCRIPT, SEARCH_VIDEO_CARD_SELECTOR
+        )
+
+        # Wait until new content is rendered after scrolling
+        wait_for_more_cards(page, card_count or 0)
+
+
+def _recycle_results_page(
+    page: Page, scrolls: int, memory_governor: MemoryGovernor
+):
+    """
+    Reloads the results page to release the memory of its old document
+    and scrolls back to where the feed was. The cards loaded again are
+    pruned on the way, and the videos left are filtered out as already
+    processed.
+    """
+    logger.warning(
+        f"Results page is over its memory budget, reloading it "
+        f"and restoring {scrolls} scrolls."
+    )
+    with phase_timings.span("recycle"):
+        page.goto(page.url, wait_until="commit")
+        wait_for_more_cards(page, 0)
+        _restore_scroll_position(page, scrolls, memory_governor)
+
+
+def _restore_scroll_position(
+    page: Page, scrolls: int, memory_governor: MemoryGovernor | None = None
+):
+    """
+    Scrolls a freshly loaded results page down scrolls times. With
+    memory_governor, the cards of the positions already passed are
+    removed before each scroll, so they do not fill the page again.
+    """
+    for scroll in range(scrolls):
+        if memory_governor and scroll:
+            memory_governor.prune_restored_cards(
+                page, SEARCH_VIDEO_CARD_SELECTOR
+            )
+        card_count = page.evaluate(
+            SCROLL_TO_BOTTOM_SCRIPT, SEARCH_VIDEO_CARD_SELECTOR
+        )
+        if not wait_for_more_cards(page, card_count or 0):
+            break  # The feed has no more results to restore
+
+
+def _process_feed(
+    page: Page,
+    skip_percent: int,
+    max_videos_to_process: int,
+    video_tabs: VideoTabPool | None,
+    prefetch: bool,
+    seen_index: SeenVideoIndex | None,
+    watch_seconds_range: tuple[int, int],
+    initial_links: list[str] | None = None,
+    api_harvester: ApiHarvester | None = None,
+    memory_governor: MemoryGovernor | None = None,
+    checkpoint: FeedCheckpoint | None = None,
+    parallel_watcher: ParallelWatcher | None = None,
+    rng: random.Random | None = None,
+) -> int:
+    """Scroll/harvest/decide loop of watch_tiktok_feed."""
+    rng = rng or random
+
     processed_videos_count = 0
     unique_video_urls = set()
     scroll_count = 0
     last_scroll_height = -1
 
+    if checkpoint and checkpoint.processed_urls:
+        # Resume: skip straight to the content after the checkpoint
+        unique_video_urls.update(checkpoint.processed_urls)
+        processed_videos_count = checkpoint.processed_videos_count
+        scroll_count = checkpoint.scroll_count
+        logger.info(
+            f"Restoring {scroll_count} scrolls of the checkpoint "
+            f"(last harvested: {checkpoint.last_harvested_url})."
+        )
+        _restore_scroll_position(page, scroll_count, memory_governor)
+
     # Loop as long as we haven't processed enough videos and can still scroll
     while (
         processed_videos_count < max_videos_to_process
         and scroll_count < MAX_FEED_SCROLLS
     ):
-        # Get the current scroll height of the page
-        current_scroll_height = page.evaluate("document.body.scrollHeight")
+        scrolled = False
+        if initial_links:
+            # Warm start: these are processed before the grid renders
+            video_links, initial_links = initial_links, None
+            logger.info(f"Starting with {len(video_links)} cached links.")
+        else:
+            # API pages that arrived meanwhile are processed first
+            if not (api_harvester and api_harvester.pending):
+                if api_harvester:
+                    # Cards render after the API response, so the scroll
+                    # height lags behind: the API tells where it ends
+                    if not api_harvester.has_more:
+                        logger.info("The feed API has no more results.")
+                        break
+                else:
+                    # Get the current scroll height of the page
+                    current_scroll_height = page.evaluate(
+                        "document.body.scrollHeight"
+                    )
 
-        # Check if we're stuck (no new content loaded after scrolling)
-        if current_scroll_height == last_scroll_height and scroll_count > 0:
-            logger.info(
-                "Reached end of scrollable content or "
-                "no new videos found after scrolling."
-            )
-            break
+                    # Check if we're stuck (no new content after scrolling)
+                    if (
+                        current_scroll_height == last_scroll_height
+                        and scroll_count > 0
+                    ):
+                        logger.info(
+                            "Reached end of scrollable content or "
+                            "no new videos found after scrolling."
+                        )
+                        break
 
-        last_scroll_height = current_scroll_height
+                    last_scroll_height = current_scroll_height
 
-        # Scroll down to load more videos in the feed
-        logger.info(
-            f"Scrolling down the feed "
-            f"(Scroll {scroll_count + 1}/{MAX_FEED_SCROLLS})..."
-        )
-        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-
-        # Give some time for new content to load and render after scrolling
-        time.sleep(2)
-        scroll_count += 1
+                # Scroll down to load more videos in the feed
+                logger.info(
+                    f"Scrolling down the feed "
+                    f"(Scroll {scroll_count + 1}/{MAX_FEED_SCROLLS})..."
+                )
+                _scroll_feed(page, api_harvester)
+                scroll_count += 1
+                scrolled = True
 
-        video_links = page.locator(
-            'div[data-e2e="search-video-card"] a[href*="/video/"]'
-        ).all()
-        logger.info(f"Found {len(video_links)} video links on current view.")
+            with phase_timings.span("harvest"):
+                video_links = (
+                    api_harvester.drain()
+                    if api_harvester
+                    else harvest_new_video_links(page)
+                )
+            logger.info(f"Harvested {len(video_links)} new video links.")
+            if checkpoint:
+                checkpoint.record_harvest(scroll_count, video_links)
+            if (
+                api_harvester
+                and scrolled
+                and not video_links
+                and not api_harvester.pending
+            ):
+                logger.info("The feed API sent no videos after scrolling.")
+                break
 
         new_videos_found_this_scroll = False
 
-        for link_element in video_links:
-            try:
-                video_url = link_element.get_attribute("href")
-                if not video_url:
-                    continue  # Skip if the URL attribute is missing
+        # Decide skip/watch for the whole batch up front, so the next
+        # video to watch is known while the current one is playing
+        videos_to_watch = []
+        seen_in_earlier_runs = 0
 
-                # Remove query params to normalize and track unique URLs
-                base_video_url = video_url.split("?")[0]
+        for video_url in video_links:
+            if video_url in unique_video_urls:
+                continue  # Skip if this video has already been processed
 
-                if base_video_url in unique_video_urls:
-                    continue  # Skip if this video has already been processed
+            unique_video_urls.add(video_url)
+            new_videos_found_this_scroll = True
 
-                unique_video_urls.add(base_video_url)
-                new_videos_found_this_scroll = True
-                processed_videos_count += 1
+            video_id = get_video_id(video_url)
+            numeric_video_id = parse_video_id(video_id)
+            if seen_index is not None and numeric_video_id is not None:
+                if numeric_video_id in seen_index:
+                    seen_in_earlier_runs += 1
+                    continue  # Already handled by an earlier run
+                seen_index.add(numeric_video_id)
 
-                # Extract a simple video ID from the URL for logging purposes
-                video_id = (
-                    base_video_url.split("/")[-1]
-                    if base_video_url.split("/")[-1]
-                    else base_video_url
-                )
+            processed_videos_count += 1
+            if checkpoint:
+                checkpoint.record_video(video_url, processed_videos_count)
 
-                # Decide to skip based on skip_percent
-                should_skip = random.randint(1, 100) <= skip_percent
+            # Decide to skip based on skip_percent
+            should_skip = rng.randint(1, 100) <= skip_percent
 
-                if should_skip:
+            if should_skip:
+                with phase_timings.span("skip"):
                     logger.info(
                         f"Video ID: {video_id}, Link: {video_url} - Skipped."
                     )
-                else:
-                    logger.info(
-                        f"Video ID: {video_id}, "
-                        f"Link: {video_url} - Watching..."
-                    )
-
-                    # Click the link to navigate to the individual video page
-                    link_element.click()
-
-                    # Wait for video page to fully load
-                    # ('networkidle' = no active requests)
-                    page.wait_for_load_state("networkidle", timeout=30000)
+            else:
+                videos_to_watch.append(video_url)
 
-                    # Pick random watch time within set range
-                    watch_time = random.randint(
-                        MIN_WATCH_DURATION_SECONDS, MAX_WATCH_DURATION_SECONDS
-                    )
-                    logger.info(f"Watching video for {watch_time} seconds.")
-                    time.sleep(watch_time)
-
-                    logger.info(
-                        f"Video ID: {video_id}, Link: {video_url} "
-                        f"- Watched fully. Returning to search results."
-                    )
+            # Stop if max videos processed
+            if processed_videos_count >= max_videos_to_process:
+                logger.info(
+                    f"Reached maximum number of "
+                    f"videos to process: {max_videos_to_process}."
+                )
+                break
 
-                    # Go back to the previous page (the search results feed)
-                    page.go_back()
+        if seen_in_earlier_runs:
+            logger.info(
+                f"Ignored {seen_in_earlier_runs} videos "
+                f"already processed in earlier runs."
+            )
 
-                    # Wait for search results to reload
-                    page.wait_for_load_state("networkidle", timeout=30000)
+        if parallel_watcher:
+            for video_url in videos_to_watch:
+                circuit_breaker.wait_if_open()
+                # Only blocks while every watch tab is busy
+                parallel_watcher.submit(video_url, get_video_id(video_url))
+            videos_to_watch = []
 
-                # Stop if max videos processed
-                if processed_videos_count >= max_videos_to_process:
-                    logger.info(
-                        f"Reached maximum number of "
-                        f"videos to process: {max_videos_to_process}."
-                    )
-                    break
+        for index, video_url in enumerate(videos_to_watch):
+            next_video_url = (
+                videos_to_watch[index + 1]
+                if index + 1 < len(videos_to_watch)
+                else None
+            )
+            # Back off while failures cluster instead of piling up more
+            circuit_breaker.wait_if_open()
+            try:
+                logger.info(
+                    f"Video ID: {get_video_id(video_url)}, "
+                    f"Link: {video_url} - Watching..."
+                )
+                played = _watch_video(
+                    page,
+                    video_url,
+                    get_video_id(video_url),
+                    video_tabs,
+                    next_video_url if prefetch else None,
+                    watch_seconds_range,
+                    rng,
+                )
+                # Only a video that played resets the breaker's backoff
+                if played:
+                    circuit_breaker.record_success()
+                else:
+                    circuit_breaker.record_failure()
 
             except Exception as e:
                 # Log error and continue
-                logger.error(
-                    f"Error processing video link {link_element}: {e}"
-                )
+                logger.error(f"Error processing video link {video_url}: {e}")
+                circuit_breaker.record_failure()
                 continue
 
         if processed_videos_count >= max_videos_to_process:
@@ -153,7 +566,7 @@ def watch_tiktok_feed(
         # it suggests we've reached the end of new content for now.
         if (
             not new_videos_found_this_scroll
-            and scroll_count > 0
+            and scrolled
             and processed_videos_count > 0
         ):
             logger.info(
@@ -162,7 +575,19 @@ def watch_tiktok_feed(
             )
             break
 
+        if memory_governor:
+            # Card heights change, so the next height check is skipped
+            if memory_governor.prune_cards(
+                page, SEARCH_VIDEO_CARD_SELECTOR, api_harvester is None
+            ):
+                last_scroll_height = -1
+            if scrolled and memory_governor.needs_recycle(page, scroll_count):
+                _recycle_results_page(page, scroll_count, memory_governor)
+                memory_governor.recycles += 1
+                last_scroll_height = -1
+
     logger.info(
         f"Finished watching TikTok feed. "
         f"Processed {processed_videos_count} unique videos."
     )
+    return processed_videos_count
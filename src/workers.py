@@ -0,0 +1,210 @@
+import csv
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing import queues, util
+from typing import NamedTuple
+
+from playwright.sync_api import sync_playwright, Browser
+
+from logs.logger import logger
+from src.auth import open_authenticated_page
+from src.clock import clock
+from src.config import DEFAULT_SEARCH_QUERY, HEADLESS, MAX_VIDEOS_TO_PROCESS
+from src.metrics import phase_timings
+from src.routing import routing_stats
+from src.search import perform_search
+from src.seen_index import open_seen_index
+from src.viewer import watch_tiktok_feed
+
+
+class Job(NamedTuple):
+    """
+    One unit of work: a storage-state file, a search query and the
+    number of videos to process for it.
+    """
+
+    account: str
+    query: str = DEFAULT_SEARCH_QUERY
+    max_videos: int = MAX_VIDEOS_TO_PROCESS
+
+
+# Browser owned by the current worker process (one per process)
+_worker_browser: Browser | None = None
+
+# Prefix of the messages a worker process sends to the parent's log
+WORKER_LOG_FORMAT = "[worker %(process)d] %(message)s"
+
+
+def load_jobs(path: str) -> list[Job]:
+    """
+    Reads jobs from a CSV file with one `account,query[,max_videos]`
+    line per job. A missing query falls back to DEFAULT_SEARCH_QUERY and
+    a missing budget to MAX_VIDEOS_TO_PROCESS.
+    """
+    jobs = []
+    with open(path, newline="", encoding="utf-8") as jobs_file:
+        for row in csv.reader(jobs_file):
+            if not row or not row[0].strip():
+                continue
+            query = row[1].strip() if len(row) > 1 else ""
+            budget = row[2].strip() if len(row) > 2 else ""
+            jobs.append(
+                Job(
+                    row[0].strip(),
+                    query or DEFAULT_SEARCH_QUERY,
+                    int(budget) if budget.isdigit() else MAX_VIDEOS_TO_PROCESS,
+                )
+            )
+    return jobs
+
+
+def _shutdown_worker(p):
+    """Closes the worker browser and its Playwright driver."""
+    if _worker_browser:
+        _worker_browser.close()
+    p.stop()
+
+
+def _init_worker(
+    headless: bool = HEADLESS, log_queue: queues.Queue | None = None
+):
+    """
+    Process pool initializer: launches the browser reused by every job of
+    this worker (without a window with headless). The worker's log
+    records are sent on log_queue, so the parent writes them to one
+    combined log with their own level and timestamp.
+    """
+    global _worker_browser
+
+    # The inherited handlers feed the parent's listener thread, which
+    # does not exist in this process
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    if log_queue is not None:
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter(WORKER_LOG_FORMAT))
+        logger.addHandler(queue_handler)
+
+    p = sync_playwright().start()
+    _worker_browser = p.chromium.launch(headless=headless)
+    util.Finalize(None, _shutdown_worker, args=(p,), exitpriority=10)
+
+
+def run_job(job: Job, browser: Browser | None = None) -> dict:
+    """
+    Runs one login -> search -> watch job on the worker browser (or on
+    browser) and returns its result.
+    """
+    started_at = clock.perf_counter()
+    phase_timings.reset()
+    bytes_saved_before = routing_stats.estimated_bytes_saved()
+
+    result = {
+        "account": job.account,
+        "query": job.query,
+        "pid": os.getpid(),
+        "processed": 0,
+        "error": None,
+    }
+    context = None
+    seen_index = None
+
+    try:
+        page, context = open_authenticated_page(
+            browser or _worker_browser, job.account
+        )
+        perform_search(page, job.query)
+        seen_index = open_seen_index(job.account)
+        result["processed"] = watch_tiktok_feed(
+            page, max_videos_to_process=job.max_videos, seen_index=seen_index
+        )
+
+    except Exception as e:
+        logger.error(f"An error occurred during the job: {e}")
+        result["error"] = str(e)
+
+    finally:
+        if seen_index:
+            seen_index.close()
+        if context:
+            context.close()
+
+    result["duration_seconds"] = round(clock.perf_counter() - started_at, 2)
+    result["bytes_saved"] = (
+        routing_stats.estimated_bytes_saved() - bytes_saved_before
+    )
+    result["timings"] = dict(phase_timings.samples)
+    return result
+
+
+def log_run_summary(results: list[dict]):
+    """Logs the combined summary of all finished jobs."""
+    failed = [result for result in results if result["error"]]
+    processed = sum(result["processed"] for result in results)
+    bytes_saved = sum(result.get("bytes_saved", 0) for result in results)
+
+    logger.info(
+        f"Run summary: {len(results)} jobs, {len(failed)} failed, "
+        f"{processed} videos processed in total, "
+        f"~{bytes_saved / 1_000_000:.1f} MB saved by request blocking."
+    )
+    for result in results:
+        status = f"failed ({result['error']})" if result["error"] else "ok"
+        logger.info(
+            f"  {result['account']} / '{result['query']}': "
+            f"{result['processed']} videos in "
+            f"{result['duration_seconds']}s - {status}"
+        )
+
+
+def run_jobs_in_pool(
+    jobs: list[Job], workers: int, headless: bool = HEADLESS
+) -> list[dict]:
+    """
+    Spreads jobs over a pool of worker processes (one browser each),
+    hands their log records to this process's handlers as they are
+    logged, merges their phase timings into phase_timings, and returns
+    the results.
+    """
+    logger.info(f"Running {len(jobs)} jobs on {workers} worker processes.")
+    results = []
+
+    log_queue = multiprocessing.Queue()
+    log_listener = QueueListener(log_queue, *logger.handlers)
+    log_listener.start()
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(headless, log_queue),
+        ) as executor:
+            futures = {executor.submit(run_job, job): job for job in jobs}
+
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker process itself died (e.g. browser crash)
+                    logger.error(f"Worker failed on job {job}: {e}")
+                    result = {
+                        "account": job.account,
+                        "query": job.query,
+                        "pid": None,
+                        "processed": 0,
+                        "error": str(e),
+                        "duration_seconds": 0,
+                    }
+
+                phase_timings.merge(result.get("timings", {}))
+                results.append(result)
+    finally:
+        # Writes the records the workers queued before exiting
+        log_listener.stop()
+
+    log_run_summary(results)
+    return results
@@ -0,0 +1,130 @@
+import json
+from unittest.mock import MagicMock
+from urllib.request import urlopen
+
+from benchmarks.mock_tiktok_site import FIRST_VIDEO_ID, MockTikTokServer
+from src.api_harvest import (
+    ApiHarvester,
+    extract_video_items,
+    feed_has_more,
+    is_feed_api_response,
+)
+
+
+def _response(url: str, payload=None, ok: bool = True) -> MagicMock:
+    """A fake Playwright response returning payload from json()."""
+    response = MagicMock()
+    response.url = url
+    response.ok = ok
+    response.json.return_value = payload
+    return response
+
+
+def test_is_feed_api_response_matches_search_and_feed_apis():
+    """Test that only successful search/feed API responses are used."""
+    base = "https://www.tiktok.com"
+    assert is_feed_api_response(
+        _response(f"{base}/api/search/item/full/?keyword=cats")
+    )
+    assert is_feed_api_response(_response(f"{base}/api/post/item_list/?x=1"))
+    assert not is_feed_api_response(_response(f"{base}/api/user/detail/"))
+    assert not is_feed_api_response(
+        _response(f"{base}/api/search/item/full/", ok=False)
+    )
+
+
+def test_extract_video_items_reads_search_and_feed_payloads():
+    """Test both payload shapes and that incomplete items are dropped."""
+    author = {"uniqueId": "a"}
+    payload = {
+        "data": [
+            {"type": 1, "item": {"id": "1", "author": author}},
+            {"type": 4, "user_list": []},
+        ],
+        "itemList": [{"id": "2", "author": author}, {"id": "3"}],
+    }
+
+    assert [item["id"] for item in extract_video_items(payload)] == [
+        "1",
+        "2",
+    ]
+    assert extract_video_items(None) == []
+
+
+def test_feed_has_more_reads_search_and_feed_flags():
+    """Test that both API spellings of the flag are understood."""
+    assert feed_has_more({"has_more": 1}) is True
+    assert feed_has_more({"hasMore": False}) is False
+    assert feed_has_more({"data": []}) is None
+    assert feed_has_more(None) is None
+
+
+def test_api_harvester_turns_fixture_payloads_into_links():
+    """
+    Test that the harvester queues API responses as they arrive and
+    drains them into normalized video links, tracking whether the API
+    has more results, using payloads served by the mock site.
+    """
+    page = MagicMock(url="https://www.tiktok.com/search/video?q=cats")
+    harvester = ApiHarvester(page)
+    on_response = page.on.call_args.args[1]
+
+    with MockTikTokServer(card_count=5, page_size=3) as server:
+        for offset in (0, 3):
+            url = (
+                f"{server.base_url}/api/search/item/full/"
+                f"?keyword=cats&offset={offset}"
+            )
+            with urlopen(url, timeout=5) as api_response:
+                on_response(_response(url, json.load(api_response)))
+        on_response(_response(f"{server.base_url}/@creator1/video/1"))
+
+        assert harvester.pending == 2
+        links = harvester.drain()
+
+        assert len(links) == 5
+        assert links[0] == (
+            f"{server.base_url}/@creator0/video/{FIRST_VIDEO_ID}"
+        )
+        assert not harvester.has_more
+    assert harvester.pending == 0
+    assert harvester.drain() == []
+
+
+def test_api_harvester_ignores_responses_away_from_search_results():
+    """
+    Test that the recommendations loaded by a video opened in the same
+    tab neither add links nor override has_more.
+    """
+    page = MagicMock(url="https://www.tiktok.com/@a/video/1")
+    harvester = ApiHarvester(page)
+
+    harvester._on_response(
+        _response(
+            "https://www.tiktok.com/api/recommend/item_list/",
+            {"itemList": [{"id": "2", "author": {"uniqueId": "b"}}]},
+        )
+    )
+
+    assert harvester.pending == 0
+    page.url = "https://www.tiktok.com/search/video?q=cats"
+    harvester._on_response(
+        _response("https://www.tiktok.com/api/search/item/full/", {})
+    )
+    assert harvester.pending == 1
+
+
+def test_api_harvester_skips_unparsable_responses_and_detaches():
+    """Test that a bad payload is skipped and close() stops listening."""
+    page = MagicMock(url="https://www.tiktok.com/search/video?q=cats")
+    harvester = ApiHarvester(page)
+    broken = _response("https://www.tiktok.com/api/search/item/full/")
+    broken.json.side_effect = ValueError("not JSON")
+    harvester._on_response(broken)
+
+    assert harvester.drain() == []
+
+    harvester.close()
+    page.remove_listener.assert_called_once_with(
+        "response", harvester._on_response
+    )
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import src.async_engine as async_engine
+from src.viewer import HARVEST_NEW_VIDEO_LINKS_SCRIPT
+
+
+def _make_async_page(hrefs, heights):
+    """
+    Build a MagicMock page whose Playwright calls are awaitable and
+    whose harvest script returns the given hrefs once.
+    """
+    page = MagicMock()
+    batches = [hrefs]
+
+    def evaluate(script, *args):
+        if script == HARVEST_NEW_VIDEO_LINKS_SCRIPT:
+            return batches.pop(0) if batches else []
+        if "scrollHeight" in script and "scrollTo" not in script:
+            return heights.pop(0)
+        return None
+
+    page.evaluate = AsyncMock(side_effect=evaluate)
+    page.goto = AsyncMock()
+    page.wait_for_function = AsyncMock()
+    page.go_back = AsyncMock()
+    return page
+
+
+@patch("src.async_engine.asyncio.sleep", new_callable=AsyncMock)
+@patch("src.async_engine.random.randint")
+def test_async_watch_tiktok_feed_skip_and_watch(mock_randint, mock_sleep):
+    """
+    Test async_watch_tiktok_feed skips the first video, watches the rest
+    and returns the number of processed videos.
+    """
+    decisions = iter([1, 100, 5, 100, 5, 100, 5])
+    mock_randint.side_effect = lambda a, b: next(decisions)
+    page = _make_async_page(
+        ["/video/1", "/video/2", "/video/3", "/video/4"], [1000, 2000]
+    )
+
+    processed = asyncio.run(
+        async_engine.async_watch_tiktok_feed(
+            page, skip_percent=50, max_videos_to_process=4
+        )
+    )
+
+    assert processed == 4
+    assert page.goto.await_count == 3
+    assert page.go_back.await_count == 3
+    assert page.wait_for_function.await_count == 7
+
+
+@patch("src.async_engine.async_get_authenticated_page_and_context")
+def test_run_feed_session_returns_zero_on_error(mock_get_page):
+    """
+    Test run_feed_session logs the failure and returns 0 instead of
+    cancelling the other sessions running in the same event loop.
+    """
+    mock_get_page.side_effect = RuntimeError("login failed")
+
+    result = asyncio.run(
+        async_engine.run_feed_session(MagicMock(), 1, asyncio.Lock())
+    )
+
+    assert result == 0
+
+
+@patch("src.async_engine.os.path.exists", return_value=True)
+@patch("src.async_engine._async_reuse_session", new_callable=AsyncMock)
+def test_async_get_authenticated_page_and_context_reuses_playwright(
+    mock_reuse_session, mock_exists
+):
+    """
+    Test that a shared Playwright instance is used to launch the browser
+    and that the saved session is reused.
+    """
+    mock_reuse_session.return_value = "page_mock"
+    playwright = MagicMock()
+    browser = MagicMock()
+    browser.new_context = AsyncMock(return_value="context_mock")
+    playwright.chromium.launch = AsyncMock(return_value=browser)
+
+    page, context, p = asyncio.run(
+        async_engine.async_get_authenticated_page_and_context(playwright)
+    )
+
+    playwright.chromium.launch.assert_awaited_once()
+    mock_reuse_session.assert_awaited_once_with("context_mock")
+    assert (page, context, p) == ("page_mock", "context_mock", playwright)
+
+
+@patch("src.async_engine.os.path.exists", return_value=True)
+@patch("src.async_engine._async_reuse_session", new_callable=AsyncMock)
+def test_async_get_authenticated_page_and_context_closes_browser_on_error(
+    mock_reuse_session, mock_exists
+):
+    """
+    Test that the browser launched for a session is closed when the
+    session cannot be reused, instead of leaking a Chromium process.
+    """
+    mock_reuse_session.side_effect = RuntimeError("session expired")
+    playwright = MagicMock()
+    browser = MagicMock()
+    browser.new_context = AsyncMock(return_value="context_mock")
+    browser.close = AsyncMock()
+    playwright.chromium.launch = AsyncMock(return_value=browser)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(
+            async_engine.async_get_authenticated_page_and_context(playwright)
+        )
+
+    browser.close.assert_awaited_once()
+
+
+@patch("src.async_engine.expect")
+def test_async_perform_search_uses_configured_navigation_timeout(
+    mock_expect,
+):
+    """
+    Test that the async search waits for a new results URL with the
+    configured (adaptive) timeout and is timed as the search phase.
+    """
+    mock_expect.return_value.to_be_visible = AsyncMock()
+    mock_expect.return_value.to_be_enabled = AsyncMock()
+    page = MagicMock()
+    page.url = "https://www.tiktok.com/"
+    page.locator.return_value.fill = AsyncMock()
+    page.keyboard.press = AsyncMock()
+    page.wait_for_url = AsyncMock()
+    page.wait_for_function = AsyncMock()
+    async_engine.phase_timings.reset()
+    async_engine.adaptive_timeouts.reset()
+
+    asyncio.run(async_engine.async_perform_search(page, "cats"))
+
+    wait = page.wait_for_url.await_args
+    assert wait.kwargs["timeout"] == async_engine.SEARCH_NAVIGATION_TIMEOUT_MS
+    matches = wait.args[0]
+    assert matches("https://www.tiktok.com/search/video?q=cats")
+    assert not matches(page.url)
+    assert "search" in async_engine.phase_timings.samples
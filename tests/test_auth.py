@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 
 import pytest
 from unittest.mock import MagicMock, patch
@@ -37,7 +38,9 @@ def test_get_authenticated_page_and_context_no_storage(
 
     page, context, p = auth.get_authenticated_page_and_context()
 
-    mock_perform_login.assert_called_once_with("context_mock")
+    mock_perform_login.assert_called_once_with(
+        "context_mock", STORAGE_STATE_PATH
+    )
     assert page == "page_mock"
     assert context == "context_mock"
 
@@ -112,3 +115,147 @@ def test_perform_login_and_save_session_wait_for_url_timeout(mock_logger):
         auth._perform_login_and_save_session(context_mock)
 
     page_mock.wait_for_url.assert_called_once()
+
+
+@patch("src.auth._reuse_session")
+@patch("src.auth.sync_playwright")
+def test_attach_to_browser_daemon_reuses_daemon_context(
+    mock_playwright, mock_reuse_session
+):
+    """
+    Test that attaching connects over CDP, opens a page in the daemon's
+    existing context and routes only that page.
+    """
+    p = mock_playwright.return_value.start.return_value
+    context = MagicMock()
+    context.cookies.return_value = []
+    p.chromium.connect_over_cdp.return_value.contexts = [context]
+
+    with patch("src.auth.apply_routing_profile") as mock_routing:
+        page, attached_context, _ = auth.attach_to_browser_daemon(
+            "http://127.0.0.1:9333"
+        )
+
+    p.chromium.connect_over_cdp.assert_called_once_with(
+        "http://127.0.0.1:9333"
+    )
+    p.chromium.launch.assert_not_called()
+    assert attached_context is context
+    assert page is context.new_page.return_value
+    mock_routing.assert_called_once_with(page, auth.ROUTING_PROFILE)
+    mock_reuse_session.assert_called_once_with(context, page)
+
+
+@patch("src.auth._reuse_session")
+@patch("src.auth.sync_playwright")
+def test_attach_to_browser_daemon_skips_check_for_fresh_cookies(
+    mock_playwright, mock_reuse_session
+):
+    """
+    Test that the daemon's session is used without the validation
+    navigation while its session cookies are fresh.
+    """
+    p = mock_playwright.return_value.start.return_value
+    context = MagicMock()
+    context.cookies.return_value = [
+        {"name": "sessionid", "expires": time.time() + 30 * 24 * 3600}
+    ]
+    p.chromium.connect_over_cdp.return_value.contexts = [context]
+
+    with patch("src.auth.apply_routing_profile"):
+        page, _, _ = auth.attach_to_browser_daemon()
+
+    mock_reuse_session.assert_not_called()
+    page.goto.assert_not_called()
+
+
+@patch("src.auth.sync_playwright")
+def test_attach_to_browser_daemon_stops_driver_when_unreachable(
+    mock_playwright,
+):
+    """Test that a missing daemon raises and stops the Playwright driver."""
+    p = mock_playwright.return_value.start.return_value
+    p.chromium.connect_over_cdp.side_effect = Exception("ECONNREFUSED")
+
+    with pytest.raises(Exception, match="ECONNREFUSED"):
+        auth.attach_to_browser_daemon()
+
+    p.stop.assert_called_once()
+
+
+@patch("src.auth.is_session_fresh", return_value=True)
+@patch("src.auth.session_expires_at", return_value=2_000_000_000)
+@patch("src.auth._reuse_session")
+def test_open_authenticated_page_skips_check_for_fresh_session(
+    mock_reuse_session, mock_expires_at, mock_fresh, tmp_path
+):
+    """
+    Test that a saved session with fresh cookies is used without the
+    validation navigation.
+    """
+    state_path = tmp_path / "state.json"
+    state_path.write_text("{}", encoding="utf-8")
+    browser = MagicMock()
+    context = browser.new_context.return_value
+
+    page, _ = auth.open_authenticated_page(browser, str(state_path))
+
+    mock_reuse_session.assert_not_called()
+    assert page is context.new_page.return_value
+    page.goto.assert_not_called()
+
+
+@patch("src.auth.restore_session_cookies", return_value=True)
+@patch("src.auth._open_saved_session")
+@patch("src.auth.sync_playwright")
+def test_get_authenticated_page_and_context_persistent_headless(
+    mock_playwright, mock_open_saved_session, mock_restore
+):
+    """
+    Test that the persistent launch mode opens the profile directory
+    headless and restores the saved session into it.
+    """
+    p = mock_playwright().__enter__.return_value
+    context = p.chromium.launch_persistent_context.return_value
+    context.pages = ["first_page"]
+    mock_open_saved_session.return_value = "page_mock"
+
+    page, returned_context, _ = auth.get_authenticated_page_and_context(
+        headless=True, launch_mode="persistent"
+    )
+
+    p.chromium.launch.assert_not_called()
+    p.chromium.launch_persistent_context.assert_called_once_with(
+        auth.PERSISTENT_PROFILE_DIR, headless=True
+    )
+    mock_open_saved_session.assert_called_once_with(
+        context, STORAGE_STATE_PATH, "first_page"
+    )
+    assert (page, returned_context) == ("page_mock", context)
+
+
+@patch("src.auth._open_saved_session")
+def test_open_authenticated_page_records_and_replays_har(
+    mock_open_saved_session, tmp_path
+):
+    """
+    Test that the HAR paths reach the context: recording as a context
+    option, replay as a route from the recording.
+    """
+    state_path = tmp_path / "state.json"
+    state_path.write_text("{}", encoding="utf-8")
+    browser = MagicMock()
+    context = browser.new_context.return_value
+
+    auth.open_authenticated_page(
+        browser,
+        str(state_path),
+        record_har_path="out.har",
+        replay_har_path="in.har",
+    )
+
+    options = browser.new_context.call_args.kwargs
+    assert options["record_har_path"] == "out.har"
+    assert options["storage_state"] == str(state_path)
+    context.route_from_har.assert_called_once()
+    assert context.route_from_har.call_args.args == ("in.har",)
@@ -0,0 +1,157 @@
+from unittest.mock import MagicMock, patch
+
+from src.batch import QueryTask, load_queries, parse_query, run_query_batch
+from src.config import (
+    DEFAULT_SEARCH_QUERY,
+    MAX_VIDEOS_TO_PROCESS,
+    SEARCH_MODE,
+)
+
+
+def test_parse_query_with_and_without_budget():
+    """Test that only a trailing number is read as the video budget."""
+    assert parse_query("cats,20", 5) == QueryTask("cats", 20)
+    assert parse_query("cats", 5) == QueryTask("cats", 5)
+    assert parse_query("cats, dogs", 5) == QueryTask("cats, dogs", 5)
+
+
+def test_load_queries_skips_blank_lines_and_comments(tmp_path):
+    """Test reading a queries file."""
+    queries_file = tmp_path / "queries.txt"
+    queries_file.write_text(
+        "# weekend run\ncats,10\n\nfunny dogs\n", encoding="utf-8"
+    )
+
+    queries = load_queries(str(queries_file), 7)
+
+    assert queries == [QueryTask("cats", 10), QueryTask("funny dogs", 7)]
+
+
+@patch("src.batch.watch_tiktok_feed")
+@patch("src.batch.perform_search")
+def test_run_query_batch_runs_queries_on_one_page(mock_search, mock_watch):
+    """
+    Test that every query is searched and watched on the same page with
+    its own budget, and that a failing query does not stop the batch.
+    """
+    mock_search.side_effect = [None, RuntimeError("no results"), None]
+    mock_watch.side_effect = [3, 4]
+    queries = [QueryTask("a", 3), QueryTask("b", 5), QueryTask("c", 4)]
+
+    results = run_query_batch("page_mock", queries)
+
+    assert results == {(0, "a"): 3, (1, "b"): 0, (2, "c"): 4}
+    assert [call.args[0] for call in mock_search.call_args_list] == [
+        "page_mock"
+    ] * 3
+    assert [
+        call.kwargs["max_videos_to_process"]
+        for call in mock_watch.call_args_list
+    ] == [3, 4]
+
+
+@patch("src.batch.watch_tiktok_feed", side_effect=[2, 3])
+@patch("src.batch.perform_search")
+def test_run_query_batch_counts_repeated_queries_once_per_run(
+    mock_search, mock_watch
+):
+    """Test that a query repeated in the batch does not overwrite its count."""
+    results = run_query_batch(
+        "page_mock", [QueryTask("cats", 2), QueryTask("cats", 3)]
+    )
+
+    assert results == {(0, "cats"): 2, (1, "cats"): 3}
+    assert sum(results.values()) == 5
+
+
+@patch("src.batch.watch_tiktok_feed", return_value=1)
+@patch("src.batch.perform_search")
+def test_run_query_batch_defaults_to_default_query(mock_search, mock_watch):
+    """Test that an empty batch runs the default query."""
+    run_query_batch("page_mock", [])
+
+    mock_search.assert_called_once_with(
+        "page_mock", DEFAULT_SEARCH_QUERY, SEARCH_MODE, None
+    )
+    assert (
+        mock_watch.call_args.kwargs["max_videos_to_process"]
+        == MAX_VIDEOS_TO_PROCESS
+    )
+
+
+@patch("src.batch.watch_tiktok_feed", return_value=2)
+@patch("src.batch.perform_search")
+def test_run_query_batch_starts_with_cached_results(mock_search, mock_watch):
+    """Test that cached links returned by the search reach the viewer."""
+    mock_search.return_value = ["https://www.tiktok.com/@a/video/1"]
+
+    run_query_batch("page_mock", [QueryTask("cats", 2)], search_mode="direct")
+
+    assert mock_search.call_args.args[2] == "direct"
+    assert mock_watch.call_args.kwargs["initial_links"] == [
+        "https://www.tiktok.com/@a/video/1"
+    ]
+
+
+@patch("src.batch.ApiHarvester")
+@patch("src.batch.watch_tiktok_feed", return_value=1)
+@patch("src.batch.perform_search", return_value=[])
+def test_run_query_batch_network_harvest_listens_from_search(
+    mock_search, mock_watch, mock_harvester_class
+):
+    """
+    Test that network harvesting attaches one harvester per query
+    before searching, hands it to the viewer and detaches it afterwards.
+    """
+    run_query_batch(
+        "page_mock",
+        [QueryTask("a", 1), QueryTask("b", 1)],
+        harvest_mode="network",
+    )
+
+    harvester = mock_harvester_class.return_value
+    assert mock_harvester_class.call_count == 2
+    assert mock_watch.call_args.kwargs["api_harvester"] is harvester
+    assert harvester.close.call_count == 2
+
+
+@patch("src.batch.watch_tiktok_feed", return_value=1)
+@patch("src.batch.perform_search", return_value=[])
+def test_run_query_batch_skips_completed_queries_of_checkpoint(
+    mock_search, mock_watch
+):
+    """
+    Test that queries completed before are skipped, the others are
+    finished in the checkpoint, which is cleared when all are done.
+    """
+    checkpoint = MagicMock()
+    completed = [0]
+    checkpoint.finish_query.side_effect = completed.append
+    checkpoint.is_completed.side_effect = completed.__contains__
+
+    results = run_query_batch(
+        "page_mock",
+        [QueryTask("a", 1), QueryTask("b", 1)],
+        checkpoint=checkpoint,
+    )
+
+    assert results == {(1, "b"): 1}
+    checkpoint.start_query.assert_called_once_with(1, "b")
+    assert mock_watch.call_args.kwargs["checkpoint"] is checkpoint
+    checkpoint.clear.assert_called_once()
+
+
+@patch("src.batch.watch_tiktok_feed", side_effect=RuntimeError("crash"))
+@patch("src.batch.perform_search", return_value=[])
+def test_run_query_batch_keeps_checkpoint_of_failed_query(
+    mock_search, mock_watch
+):
+    """Test that a failed query saves the checkpoint and keeps it."""
+    checkpoint = MagicMock()
+    checkpoint.is_completed.return_value = False
+
+    run_query_batch("page_mock", [QueryTask("a", 1)], checkpoint=checkpoint)
+
+    checkpoint.save.assert_called_once()
+    checkpoint.finish_query.assert_not_called()
+    checkpoint.clear.assert_not_called()
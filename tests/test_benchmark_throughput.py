@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from benchmarks.throughput import (
+    PeakRssSampler,
+    descendants_rss_mb,
+    find_regressions,
+)
+
+
+def test_find_regressions_flags_drops_beyond_tolerance():
+    """
+    Test that only scenarios slower than the baseline by more than the
+    tolerance are reported.
+    """
+    baseline = [
+        {"scenario": "same_tab", "videos_per_minute": 100.0},
+        {"scenario": "prefetch", "videos_per_minute": 100.0},
+    ]
+    results = [
+        {"scenario": "same_tab", "videos_per_minute": 95.0},
+        {"scenario": "prefetch", "videos_per_minute": 80.0},
+        {"scenario": "secondary_tab", "videos_per_minute": 1.0},
+    ]
+
+    regressions = find_regressions(results, baseline, tolerance=0.1)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("prefetch")
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+def test_peak_rss_sampler_measures_child_processes():
+    """
+    Test that the sampler sees the memory of a running child process
+    (as it does for the browser), which finished-children rusage does not.
+    """
+    before = descendants_rss_mb(os.getpid())
+    child = subprocess.Popen(
+        [sys.executable, "-c", "x = bytearray(64 << 20); input()"],
+        stdin=subprocess.PIPE,
+    )
+    try:
+        with PeakRssSampler(interval_seconds=0.05) as sampler:
+            time.sleep(1)
+    finally:
+        child.communicate(b"\n")
+
+    assert sampler.peak_mb - before > 50
@@ -0,0 +1,82 @@
+from src.checkpoint import FeedCheckpoint
+
+
+def test_checkpoint_saves_every_n_videos_and_loads(tmp_path):
+    """
+    Test that progress is written every every_videos videos and that a
+    loaded checkpoint holds the same feed state.
+    """
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = FeedCheckpoint(path, every_videos=2)
+    checkpoint.set_queries([("cats", 10)])
+    checkpoint.start_query(0, "cats")
+    checkpoint.record_harvest(3, ["https://a/video/1", "https://a/video/2"])
+    checkpoint.record_video("https://a/video/1", 1)
+
+    assert FeedCheckpoint.load(path).processed_urls == []
+
+    checkpoint.record_video("https://a/video/2", 2)
+    loaded = FeedCheckpoint.load(path)
+
+    assert loaded.queries == [("cats", 10)]
+    assert loaded.position == 0
+    assert loaded.query == "cats"
+    assert loaded.processed_urls == ["https://a/video/1", "https://a/video/2"]
+    assert loaded.processed_videos_count == 2
+    assert loaded.scroll_count == 3
+    assert loaded.last_harvested_url == "https://a/video/2"
+
+
+def test_checkpoint_keeps_feed_of_resumed_query_only(tmp_path):
+    """
+    Test that starting the query in progress keeps its state, while
+    finishing it and starting another one resets the feed.
+    """
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = FeedCheckpoint(path)
+    checkpoint.start_query(0, "cats")
+    checkpoint.record_video("https://a/video/1", 1)
+    checkpoint.save()
+
+    resumed = FeedCheckpoint.load(path)
+    resumed.start_query(0, "cats")
+    assert resumed.processed_videos_count == 1
+
+    resumed.finish_query(0)
+    resumed.start_query(1, "dogs")
+    loaded = FeedCheckpoint.load(path)
+    assert loaded.completed_positions == [0]
+    assert loaded.query == "dogs"
+    assert loaded.processed_urls == []
+
+
+def test_checkpoint_tracks_repeated_queries_by_position(tmp_path):
+    """
+    Test that completing one of two identical queries leaves the other
+    to run, and that progress of another batch of queries is dropped.
+    """
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = FeedCheckpoint(path)
+    checkpoint.set_queries([("cats", 10), ("cats", 10)])
+    checkpoint.start_query(0, "cats")
+    checkpoint.finish_query(0)
+
+    resumed = FeedCheckpoint.load(path)
+    resumed.set_queries([("cats", 10), ("cats", 10)])
+    assert resumed.is_completed(0)
+    assert not resumed.is_completed(1)
+
+    resumed.set_queries([("dogs", 10), ("cats", 10)])
+    assert not resumed.is_completed(0)
+
+
+def test_checkpoint_load_and_clear_without_file(tmp_path):
+    """Test missing and damaged files, and removing the checkpoint."""
+    path = tmp_path / "checkpoint.json"
+    assert FeedCheckpoint.load(str(path)) is None
+
+    path.write_text("{broken", encoding="utf-8")
+    assert FeedCheckpoint.load(str(path)) is None
+
+    FeedCheckpoint(str(path)).clear()
+    assert not path.exists()
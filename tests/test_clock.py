@@ -0,0 +1,50 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from src.clock import Clock
+
+
+@patch("src.clock.time.sleep")
+def test_clock_uses_real_time_outside_virtual(mock_sleep):
+    """Test that the clock sleeps for real unless virtual time is on."""
+    clock = Clock()
+
+    clock.sleep(5)
+
+    mock_sleep.assert_called_once_with(5)
+    assert not clock.is_virtual
+
+
+@patch("src.clock.time.sleep")
+def test_clock_virtual_time_advances_only_when_sleeping(mock_sleep):
+    """
+    Test that virtual time starts at the given value, moves with sleep()
+    and advance(), and that real time is restored afterwards.
+    """
+    clock = Clock()
+
+    with clock.virtual(100.0):
+        clock.sleep(30)
+        clock.advance(0.5)
+        clock.advance(-10)  # Time never goes backwards
+        assert clock.monotonic() == clock.perf_counter() == 130.5
+
+    mock_sleep.assert_not_called()
+    assert not clock.is_virtual
+
+
+@patch("src.clock.asyncio.sleep", new_callable=AsyncMock)
+def test_clock_async_sleep_and_wall_time_follow_virtual_time(mock_sleep):
+    """
+    Test that async_sleep() advances virtual time without waiting, and
+    that time() reads virtual time while it is on.
+    """
+    clock = Clock()
+
+    with clock.virtual(1000.0):
+        asyncio.run(clock.async_sleep(30))
+        assert clock.time() == 1030.0
+
+    mock_sleep.assert_awaited_once_with(0)
+    asyncio.run(clock.async_sleep(2))
+    mock_sleep.assert_awaited_with(2)
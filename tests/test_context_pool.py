@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.context_pool import ContextPool, list_account_states
+
+
+def _make_playwright():
+    """Build a MagicMock Playwright whose browser creates mock contexts."""
+    playwright = MagicMock()
+    browser = MagicMock()
+    browser.new_context = AsyncMock(
+        side_effect=lambda storage_state: MagicMock(
+            name=storage_state, close=AsyncMock()
+        )
+    )
+    browser.close = AsyncMock()
+    playwright.chromium.launch = AsyncMock(return_value=browser)
+    return playwright, browser
+
+
+def test_list_account_states_only_returns_json(tmp_path):
+    """Test that only *.json storage-state files are picked up, sorted."""
+    (tmp_path / "b.json").write_text("{}")
+    (tmp_path / "a.json").write_text("{}")
+    (tmp_path / "notes.txt").write_text("")
+
+    states = list_account_states(str(tmp_path))
+
+    assert [s.rsplit("/", 1)[-1] for s in states] == ["a.json", "b.json"]
+
+
+def test_context_pool_start_without_accounts_raises(tmp_path):
+    """Test that starting a pool on an empty directory fails early."""
+    playwright, _ = _make_playwright()
+    pool = ContextPool(playwright, str(tmp_path))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(pool.start())
+
+    playwright.chromium.launch.assert_not_called()
+
+
+def test_context_pool_limits_concurrency_and_reuses_contexts(tmp_path):
+    """
+    Test that one browser is launched, no more than `concurrency`
+    contexts are in use at once and contexts are reused per account.
+    """
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.json").write_text("{}")
+    playwright, browser = _make_playwright()
+
+    in_use = 0
+    max_in_use = 0
+
+    async def worker(pool):
+        nonlocal in_use, max_in_use
+        async with pool.acquire():
+            in_use += 1
+            max_in_use = max(max_in_use, in_use)
+            await asyncio.sleep(0)
+            in_use -= 1
+
+    async def run():
+        pool = await ContextPool(playwright, str(tmp_path), 2).start()
+        await asyncio.gather(*(worker(pool) for _ in range(8)))
+        await pool.close()
+
+    asyncio.run(run())
+
+    playwright.chromium.launch.assert_awaited_once()
+    assert max_in_use == 2
+    assert browser.new_context.await_count <= 3
+    browser.close.assert_awaited_once()
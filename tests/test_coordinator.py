@@ -0,0 +1,133 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src import coordinator
+from src.clock import clock
+from src.coordinator import JobQueue, LeaseHeartbeat
+from src.workers import Job
+
+
+def _queue(tmp_path, **kwargs):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), **kwargs)
+
+
+def test_job_queue_leases_each_job_once_in_order(tmp_path):
+    """Test that jobs are leased oldest first and never to two workers."""
+    queue = _queue(tmp_path)
+    queue.enqueue(Job("a.json", "cats", 5))
+    queue.enqueue(Job("b.json", "dogs", 7))
+
+    first = queue.lease("host1:1")
+    second = queue.lease("host2:1")
+
+    assert first.job == Job("a.json", "cats", 5)
+    assert second.job == Job("b.json", "dogs", 7)
+    assert queue.lease("host3:1") is None
+    assert queue.counts() == {"leased": 2}
+    queue.close()
+
+
+def test_job_queue_requeues_expired_leases(tmp_path):
+    """
+    Test that a job whose worker stopped sending heartbeats goes back on
+    the queue, and that the old worker can no longer report it.
+    """
+    queue = _queue(tmp_path, lease_seconds=60)
+    queue.enqueue(Job("a.json", "cats"))
+
+    with clock.virtual(1000):
+        leased = queue.lease("host1:1")
+        clock.advance(30)
+        assert queue.heartbeat(leased.id, "host1:1")
+        clock.advance(50)
+        assert queue.lease("host2:1") is None  # Lease runs until 1090
+        clock.advance(120)
+        retried = queue.lease("host2:1")
+
+    assert retried.id == leased.id
+    assert retried.attempts == 2
+    assert not queue.complete(leased.id, "host1:1", 3)
+    assert queue.complete(retried.id, "host2:1", 3)
+    assert queue.counts() == {"done": 1}
+    queue.close()
+
+
+def test_job_queue_fails_job_after_max_attempts(tmp_path):
+    """Test that a failing job is retried until it runs out of attempts."""
+    queue = _queue(tmp_path, max_attempts=2)
+    queue.enqueue(Job("a.json", "cats"))
+
+    queue.fail(queue.lease("w").id, "w", "login failed")
+    assert queue.counts() == {"queued": 1}
+    queue.fail(queue.lease("w").id, "w", "login failed")
+
+    assert queue.counts() == {"failed": 1}
+    assert queue.lease("w") is None
+    queue.close()
+
+
+def test_lease_heartbeat_renews_lease_while_job_runs(tmp_path):
+    """
+    Test that the heartbeat thread keeps renewing the lease while the
+    job blocks outside of any phase, and stops with the job.
+    """
+    queue = _queue(tmp_path, lease_seconds=1)
+    queue.enqueue(Job("a.json"))
+    leased = queue.lease("w")
+
+    def expires_at():
+        return queue._connection.execute(
+            "SELECT lease_expires_at FROM jobs WHERE id = ?", (leased.id,)
+        ).fetchone()[0]
+
+    leased_until = expires_at()
+    with LeaseHeartbeat(queue, leased, "w", interval_seconds=0.05) as beat:
+        time.sleep(0.3)  # A long wait without any phase span
+
+    assert expires_at() > leased_until
+    assert not beat.lost
+    assert not beat._thread.is_alive()
+    queue.close()
+
+
+def test_lease_heartbeat_reports_lost_lease(tmp_path):
+    """Test that a lease taken over by another worker is noticed."""
+    queue = _queue(tmp_path)
+    queue.enqueue(Job("a.json"))
+    leased = queue.lease("w")
+
+    with LeaseHeartbeat(queue, leased, "other", interval_seconds=0.01) as beat:
+        time.sleep(0.1)
+
+    assert beat.lost
+    queue.close()
+
+
+def test_lease_heartbeat_rejects_interval_close_to_lease(tmp_path):
+    """Test that a heartbeat that could miss the lease is refused."""
+    queue = _queue(tmp_path, lease_seconds=60)
+    queue.enqueue(Job("a.json"))
+
+    with pytest.raises(ValueError):
+        LeaseHeartbeat(queue, queue.lease("w"), "w", interval_seconds=45)
+    queue.close()
+
+
+@patch("src.coordinator.run_job")
+def test_run_leased_job_reports_result(mock_run_job, tmp_path):
+    """
+    Test that a leased job runs with a heartbeat listener attached and
+    its result is reported to the queue.
+    """
+    queue = _queue(tmp_path)
+    queue.enqueue(Job("a.json", "cats", 4))
+    leased = queue.lease("w")
+    mock_run_job.return_value = {"processed": 4, "error": None}
+
+    coordinator.run_leased_job(queue, leased, "w", browser="browser")
+
+    mock_run_job.assert_called_once_with(leased.job, "browser")
+    assert queue.counts() == {"done": 1}
+    queue.close()
@@ -0,0 +1,42 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from src import daemon
+
+
+def test_restore_session_cookies_adds_saved_cookies(tmp_path):
+    """Test that the cookies of a storage state are added to the context."""
+    state_path = tmp_path / "state.json"
+    cookies = [{"name": "sessionid", "value": "x", "url": "https://a.b"}]
+    state_path.write_text(json.dumps({"cookies": cookies}), encoding="utf-8")
+    context = MagicMock()
+
+    assert daemon.restore_session_cookies(context, str(state_path))
+    context.add_cookies.assert_called_once_with(cookies)
+    assert not daemon.restore_session_cookies(
+        context, str(tmp_path / "missing.json")
+    )
+
+
+@patch("src.daemon._reuse_session")
+@patch("src.daemon.restore_session_cookies", return_value=True)
+@patch("src.daemon.sync_playwright")
+def test_run_browser_daemon_exposes_cdp_port_and_waits(
+    mock_playwright, mock_restore, mock_reuse_session
+):
+    """
+    Test that the daemon launches a persistent context with a CDP port,
+    restores the session and blocks until the browser is closed.
+    """
+    p = mock_playwright.return_value.__enter__.return_value
+    context = p.chromium.launch_persistent_context.return_value
+    context.pages = ["first_page"]
+
+    daemon.run_browser_daemon(9333, "state.json", "profile")
+
+    p.chromium.launch_persistent_context.assert_called_once_with(
+        "profile", headless=False, args=["--remote-debugging-port=9333"]
+    )
+    mock_reuse_session.assert_called_once_with(context, "first_page")
+    context.wait_for_event.assert_called_once_with("close", timeout=0)
+    context.close.assert_called_once()
@@ -0,0 +1,22 @@
+from unittest.mock import MagicMock
+
+from src.har import har_recording_options, replay_har
+
+
+def test_har_recording_options_only_with_a_path():
+    """Test that recording options are only added when a path is given."""
+    assert har_recording_options(None) == {}
+    assert har_recording_options("run.har")["record_har_path"] == "run.har"
+
+
+def test_replay_har_routes_context_from_recording():
+    """Test that replay serves the context from the HAR, offline."""
+    context = MagicMock()
+
+    replay_har(context, None)
+    context.route_from_har.assert_not_called()
+
+    replay_har(context, "run.har")
+    context.route_from_har.assert_called_once_with(
+        "run.har", not_found="abort"
+    )
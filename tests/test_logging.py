@@ -1,4 +1,8 @@
+import gzip
+import json
 import logging
+from logging.handlers import QueueHandler
+
 from logs import logger as logger_module
 
 
@@ -13,16 +17,56 @@ def test_logger_is_singleton():
 
 def test_logger_has_console_and_file_handlers():
     """
-    Test that the logger has both console and file handlers attached.
+    Test that the logger only enqueues records and that the background
+    listener writes them to both console and file handlers.
     """
     logger = logger_module.logger
     handler_types = [type(h) for h in logger.handlers]
+    listener_handlers = logger_module.listener.handlers
 
-    assert logging.StreamHandler in handler_types, "Console handler missing"
-    assert logging.FileHandler in handler_types, "File handler missing"
+    assert handler_types == [QueueHandler], "Queue handler missing"
+    assert any(
+        type(h) is logging.StreamHandler for h in listener_handlers
+    ), "Console handler missing"
+    assert any(
+        isinstance(h, logging.FileHandler) for h in listener_handlers
+    ), "File handler missing"
     assert logger.level == logging.INFO
 
 
+def test_json_lines_formatter_outputs_one_json_object():
+    """Test that the JSON formatter produces parseable single lines."""
+    record = logging.LogRecord(
+        "tiktok_automation_logger",
+        logging.WARNING,
+        __file__,
+        1,
+        "Watching %s",
+        ("video 1",),
+        None,
+    )
+
+    line = logger_module.JsonLinesFormatter().format(record)
+
+    assert "\n" not in line
+    entry = json.loads(line)
+    assert entry["level"] == "WARNING"
+    assert entry["message"] == "Watching video 1"
+
+
+def test_gzip_rotator_compresses_rotated_file(tmp_path):
+    """Test that rotated log files are gzip-compressed and removed."""
+    source = tmp_path / "tiktok_automation.log"
+    source.write_text("line 1\n", encoding="utf-8")
+    destination = logger_module._gzip_namer(str(source) + ".1")
+
+    logger_module._gzip_rotator(str(source), destination)
+
+    assert not source.exists()
+    with gzip.open(destination, "rt", encoding="utf-8") as rotated:
+        assert rotated.read() == "line 1\n"
+
+
 def test_logger_logs_info_message(caplog):
     """
     Use caplog to check that info messages are emitted.
@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src import main
+
+
+@patch("src.main.phase_timings")
+@patch("src.main.open_seen_index", return_value=None)
+@patch("src.main.run_query_batch")
+@patch("src.main.attach_to_browser_daemon")
+def test_main_attached_run_leaves_daemon_context_open(
+    mock_attach, mock_batch, mock_open_seen_index, mock_phase_timings
+):
+    """
+    Test that a run attached to the browser daemon closes only its page
+    and the driver connection, not the daemon's context.
+    """
+    page, context, p_instance = MagicMock(), MagicMock(), MagicMock()
+    mock_attach.return_value = (page, context, p_instance)
+
+    main.main(teardown_delay=0, cdp_url="http://127.0.0.1:9222")
+
+    mock_attach.assert_called_once_with("http://127.0.0.1:9222")
+    mock_batch.assert_called_once()
+    page.close.assert_called_once()
+    context.close.assert_not_called()
+    p_instance.stop.assert_called_once()
+
+
+def test_parse_args_attach_defaults_to_daemon_url():
+    """Test that a bare --attach uses the daemon's default CDP URL."""
+    assert main.parse_args(["--attach"]).attach == main.BROWSER_DAEMON_CDP_URL
+    assert main.parse_args([]).attach is None
+
+
+def test_parse_args_har_modes_need_a_launched_browser():
+    """Test that HAR recording or replay cannot be combined with --attach."""
+    assert main.parse_args(["--replay-har", "run.har"]).replay_har == (
+        "run.har"
+    )
+    with pytest.raises(SystemExit):
+        main.parse_args(["--attach", "--record-har", "run.har"])
+    with pytest.raises(SystemExit):
+        main.parse_args(["--record-har", "a.har", "--replay-har", "b.har"])
+
+
+def test_parse_args_rejects_single_session_options_in_other_modes():
+    """
+    Test that options only the single-session run understands are
+    rejected instead of silently ignored by --sessions and --workers.
+    """
+    assert main.parse_args(["--workers", "2", "--headless"]).headless
+    assert main.parse_args(["--workers", "2", "--jobs", "jobs.csv"]).jobs
+    for argv in (
+        ["--jobs", "jobs.csv"],
+        ["--workers", "1", "--jobs", "jobs.csv"],
+        ["--workers", "2", "--query", "cats"],
+        ["--sessions", "3", "--resume"],
+        ["--accounts-dir", "accounts", "--parallel-tabs", "2"],
+    ):
+        with pytest.raises(SystemExit):
+            main.parse_args(argv)
+
+
+@patch("src.main.phase_timings")
+@patch("src.main.run_jobs_in_pool")
+@patch("src.main.async_main", new_callable=MagicMock)
+@patch("src.main.asyncio.run")
+def test_run_from_command_line_passes_headless_to_every_mode(
+    mock_run, mock_async_main, mock_pool, mock_phase_timings
+):
+    """Test that --headless reaches the concurrent and worker modes."""
+    with patch("src.main.load_jobs", return_value=[]):
+        main.run_from_command_line(
+            ["--workers", "2", "--jobs", "jobs.csv", "--headless"]
+        )
+    mock_pool.assert_called_once_with([], 2, True)
+
+    main.run_from_command_line(["--sessions", "2", "--headless"])
+    mock_async_main.assert_called_once_with(
+        2, None, main.CONTEXT_POOL_CONCURRENCY, True
+    )
@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock
+
+from src.memory_governor import (
+    JS_HEAP_USED_SCRIPT,
+    PRUNE_CARDS_SCRIPT,
+    MemoryGovernor,
+    create_memory_governor,
+)
+
+
+def test_prune_cards_removes_processed_cards_when_enabled():
+    """Test that pruning evaluates the prune script and counts cards."""
+    page = MagicMock()
+    page.evaluate.return_value = 24
+    governor = MemoryGovernor(prune=True, keep_last_cards=6)
+
+    assert governor.prune_cards(page, "div.card", harvested_only=False) == 24
+
+    page.evaluate.assert_called_once_with(
+        PRUNE_CARDS_SCRIPT, ["div.card", 6, False]
+    )
+    assert governor.pruned_cards == 24
+
+    disabled = MemoryGovernor(prune=False)
+    assert disabled.prune_cards(MagicMock(), "div.card") == 0
+
+
+def test_needs_recycle_samples_heap_every_n_scrolls():
+    """
+    Test that the heap is only sampled on every sample_every-th scroll
+    and compared with the budget.
+    """
+    page = MagicMock()
+    page.evaluate.return_value = 600 * 1024 * 1024
+    governor = MemoryGovernor(budget_mb=512, sample_every=5)
+
+    assert not governor.needs_recycle(page, 4)
+    page.evaluate.assert_not_called()
+
+    assert governor.needs_recycle(page, 5)
+    page.evaluate.assert_called_once_with(JS_HEAP_USED_SCRIPT)
+    assert governor.samples_mb == [600]
+
+
+def test_needs_recycle_without_budget_or_heap_api():
+    """Test no recycling without a budget or without performance.memory."""
+    page = MagicMock()
+    page.evaluate.return_value = None
+
+    assert not MemoryGovernor(budget_mb=None).needs_recycle(page, 5)
+    assert not MemoryGovernor(budget_mb=1, sample_every=1).needs_recycle(
+        page, 3
+    )
+
+
+def test_create_memory_governor_is_disabled_by_default():
+    """Test that the default configuration adds no governor."""
+    assert create_memory_governor() is None
+
+
+def test_prune_restored_cards_prunes_even_when_pruning_is_disabled():
+    """
+    Test that cards loaded again after a reload are removed whether or
+    not they were harvested, even without PRUNE_PROCESSED_CARDS.
+    """
+    page = MagicMock()
+    page.evaluate.return_value = 30
+    governor = MemoryGovernor(prune=False, keep_last_cards=6)
+
+    assert governor.prune_restored_cards(page, "div.card") == 30
+    page.evaluate.assert_called_once_with(
+        PRUNE_CARDS_SCRIPT, ["div.card", 6, False]
+    )
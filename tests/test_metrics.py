@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from src.metrics import PhaseTimings, percentile
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles on a sorted list."""
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile([3.0], 0.95) == 3.0
+
+
+def test_span_records_duration_even_on_error():
+    """Test that a span records a sample when the block raises."""
+    timings = PhaseTimings()
+
+    with pytest.raises(RuntimeError):
+        with timings.span("search"):
+            raise RuntimeError("search failed")
+
+    assert len(timings.samples["search"]) == 1
+
+
+def test_summary_and_merge():
+    """Test per-phase aggregation, including merged worker samples."""
+    timings = PhaseTimings()
+    for seconds in (1.0, 2.0, 3.0):
+        timings.record("watch", seconds)
+    timings.merge({"watch": [10.0], "scroll": [0.5]})
+
+    summary = timings.summary()
+
+    assert summary["watch"] == {
+        "count": 4,
+        "total": 16.0,
+        "p50": 2.0,
+        "p95": 10.0,
+        "max": 10.0,
+    }
+    assert summary["scroll"]["count"] == 1
+
+
+def test_write_reports(tmp_path):
+    """Test the JSON report and the Prometheus textfile contents."""
+    timings = PhaseTimings()
+    timings.record("login", 4.0)
+    json_path = tmp_path / "reports" / "run_report.json"
+    prometheus_path = tmp_path / "reports" / "run.prom"
+
+    timings.write_reports(str(json_path), str(prometheus_path))
+
+    report = json.loads(json_path.read_text(encoding="utf-8"))
+    assert report["phases"]["login"]["max"] == 4.0
+    textfile = prometheus_path.read_text(encoding="utf-8")
+    assert (
+        'tiktok_automation_phase_duration_seconds{phase="login",'
+        'quantile="0.95"} 4.0'
+    ) in textfile
+    assert (
+        'tiktok_automation_phase_duration_seconds_count{phase="login"} 1'
+    ) in textfile
+
+
+def test_phase_timings_notifies_listeners():
+    """Test that every recorded sample is passed to the listeners."""
+    timings = PhaseTimings()
+    seen = []
+    timings.listeners.append(lambda phase, seconds: seen.append(phase))
+
+    with timings.span("scroll"):
+        pass
+    timings.record("watch", 1.0)
+
+    assert seen == ["scroll", "watch"]
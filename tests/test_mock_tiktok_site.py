@@ -0,0 +1,163 @@
+import json
+import time
+from urllib.request import urlopen
+
+import pytest
+from playwright.sync_api import sync_playwright
+
+from benchmarks.mock_tiktok_site import FIRST_VIDEO_ID, MockTikTokServer
+from src.api_harvest import ApiHarvester
+from src.har import har_recording_options, replay_har
+from src.search import perform_search
+from src.viewer import watch_tiktok_feed
+
+
+def _get(url: str) -> tuple[str, bytes]:
+    """Returns the content type and body of a GET request."""
+    with urlopen(url, timeout=5) as response:
+        return response.headers["Content-Type"], response.read()
+
+
+def test_mock_site_serves_pages_and_media():
+    """Test that home, search, video and media endpoints respond."""
+    with MockTikTokServer() as server:
+        _, home = _get(f"{server.base_url}/")
+        _, search = _get(f"{server.base_url}/search/video/?q=cats")
+        _, video = _get(f"{server.base_url}/@creator1/video/1")
+        content_type, media = _get(f"{server.base_url}/media/clip.wav")
+
+    assert b'placeholder="Search"' in home
+    assert b"search-video-card" in search
+    assert b"<video" in video
+    assert content_type == "audio/wav"
+    assert media.startswith(b"RIFF")
+
+
+def test_mock_site_search_api_paginates_until_card_count():
+    """Test the search API pages through exactly card_count items."""
+    with MockTikTokServer(card_count=30, page_size=12) as server:
+        offset = 0
+        ids = []
+        while True:
+            _, body = _get(
+                f"{server.base_url}/api/search/item/full/"
+                f"?keyword=cats&offset={offset}"
+            )
+            payload = json.loads(body)
+            ids += [entry["item"]["id"] for entry in payload["data"]]
+            offset = payload["cursor"]
+            if not payload["has_more"]:
+                break
+
+    assert len(ids) == 30
+    assert ids[0] == str(FIRST_VIDEO_ID)
+
+
+def test_mock_site_applies_latency():
+    """Test that every response is delayed by latency_ms."""
+    with MockTikTokServer(latency_ms=100) as server:
+        started_at = time.perf_counter()
+        _get(f"{server.base_url}/")
+
+    assert time.perf_counter() - started_at >= 0.1
+
+
+def test_search_and_watch_against_mock_site():
+    """
+    Drive the real perform_search and watch_tiktok_feed in a headless
+    browser against the mock site (skipped without a Chromium build).
+    """
+    with sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except Exception as e:
+            pytest.skip(f"Chromium is not available: {e}")
+
+        with MockTikTokServer(card_count=40) as server:
+            page = browser.new_context().new_page()
+            page.goto(f"{server.base_url}/")
+
+            perform_search(page, "cats")
+            processed = watch_tiktok_feed(
+                page,
+                skip_percent=50,
+                max_videos_to_process=15,
+                video_tab_mode="secondary",
+                watch_seconds_range=(0, 0),
+            )
+
+        browser.close()
+
+    assert processed == 15
+
+
+def test_network_harvest_against_mock_site():
+    """
+    Harvest video links from the mock site's search API responses
+    in a headless browser (skipped without a Chromium build).
+    """
+    with sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except Exception as e:
+            pytest.skip(f"Chromium is not available: {e}")
+
+        with MockTikTokServer(card_count=40) as server:
+            page = browser.new_context().new_page()
+            page.goto(f"{server.base_url}/")
+            api_harvester = ApiHarvester(page)
+
+            perform_search(page, "cats")
+            processed = watch_tiktok_feed(
+                page,
+                skip_percent=50,
+                max_videos_to_process=30,
+                video_tab_mode="secondary",
+                watch_seconds_range=(0, 0),
+                api_harvester=api_harvester,
+            )
+
+        browser.close()
+
+    assert processed == 30
+
+
+def test_har_record_and_offline_replay_against_mock_site(tmp_path):
+    """
+    Record a search and feed session against the mock site into a HAR,
+    then replay the same session with the server stopped (skipped without
+    a Chromium build).
+    """
+    har_path = str(tmp_path / "session.har")
+
+    def run_session(browser, base_url: str, **context_options) -> int:
+        context = browser.new_context(**context_options)
+        if "record_har_path" not in context_options:
+            replay_har(context, har_path)
+        page = context.new_page()
+        page.goto(f"{base_url}/")
+        perform_search(page, "cats", mode="direct")
+        processed = watch_tiktok_feed(
+            page,
+            skip_percent=100,
+            max_videos_to_process=20,
+            watch_seconds_range=(0, 0),
+        )
+        context.close()  # Writes the recording
+        return processed
+
+    with sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except Exception as e:
+            pytest.skip(f"Chromium is not available: {e}")
+
+        with MockTikTokServer(card_count=40) as server:
+            base_url = server.base_url
+            recorded = run_session(
+                browser, base_url, **har_recording_options(har_path)
+            )
+        replayed = run_session(browser, base_url)
+        browser.close()
+
+    assert recorded == replayed == 20
@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock, patch
+
+from src.clock import clock
+from src.parallel_watch import ParallelWatcher
+
+
+def _watcher(tabs=2, watch_seconds=10):
+    context = MagicMock()
+    context.new_page.side_effect = lambda: MagicMock()
+    return ParallelWatcher(context, tabs, (watch_seconds, watch_seconds))
+
+
+@patch("src.parallel_watch.wait_for_video_ready", return_value=True)
+def test_parallel_watcher_plays_videos_at_the_same_time(mock_ready):
+    """
+    Test that submit() starts videos in separate tabs without waiting
+    and only blocks for a free tab once every tab is playing.
+    """
+    watcher = _watcher(tabs=2)
+
+    with clock.virtual():
+        watcher.submit("https://www.tiktok.com/@a/video/1", "1")
+        watcher.submit("https://www.tiktok.com/@a/video/2", "2")
+        assert clock.monotonic() == 0
+        assert watcher.context.new_page.call_count == 2
+
+        # The third video waits for the first watch timer to run out
+        watcher.submit("https://www.tiktok.com/@a/video/3", "3")
+        assert clock.monotonic() == 10
+        assert watcher.watched == 2
+        assert watcher.context.new_page.call_count == 2
+
+        watcher.drain()
+        assert clock.monotonic() == 20
+
+    assert watcher.watched == 3
+
+
+@patch("src.parallel_watch.wait_for_video_ready", return_value=True)
+def test_parallel_watcher_frees_tab_of_failed_video(mock_ready):
+    """Test that a video failing to open is logged and frees its tab."""
+    watcher = _watcher(tabs=1)
+    tab = MagicMock()
+    tab.goto.side_effect = [Exception("net::ERR_FAILED"), None]
+    watcher.context.new_page.side_effect = [tab]
+
+    with clock.virtual():
+        watcher.submit("https://www.tiktok.com/@a/video/1", "1")
+        watcher.submit("https://www.tiktok.com/@a/video/2", "2")
+        watcher.drain()
+        assert clock.monotonic() == 10
+
+    assert watcher.watched == 1
+
+
+def test_parallel_watcher_close_closes_all_tabs():
+    """Test that close() closes every tab, even if one fails."""
+    watcher = _watcher(tabs=2)
+    tabs = [MagicMock(), MagicMock()]
+    tabs[0].close.side_effect = Exception("already closed")
+    watcher._tabs = list(tabs)
+
+    watcher.close()
+
+    tabs[1].close.assert_called_once()
+    assert watcher._tabs == []
+
+
+@patch("src.parallel_watch.wait_for_video_ready", return_value=False)
+def test_parallel_watcher_unplayable_video_is_no_success(mock_ready):
+    """Test that a video that never played is not recorded as a success."""
+    watcher = _watcher(tabs=1)
+
+    with clock.virtual():
+        with patch("src.parallel_watch.circuit_breaker") as breaker:
+            watcher.submit("https://www.tiktok.com/@a/video/1", "1")
+            watcher.drain()
+
+    breaker.record_failure.assert_called_once()
+    breaker.record_success.assert_not_called()
@@ -0,0 +1,132 @@
+import json
+from unittest.mock import MagicMock
+
+from src.metrics import PhaseTimings
+from src.profiling import (
+    RESOURCE_TIMING_SUMMARY_SCRIPT,
+    BrowserProfiler,
+    start_browser_profiler,
+)
+
+
+def _profiler(tmp_path, trace=False):
+    page, context = MagicMock(), MagicMock()
+    page.url = "https://www.tiktok.com/search/video?q=cats"
+    cdp = context.new_cdp_session.return_value
+    cdp.send.return_value = {
+        "metrics": [
+            {"name": "JSHeapUsedSize", "value": 50_000_000},
+            {"name": "Nodes", "value": 3000},
+            {"name": "Timestamp", "value": 1.0},
+        ]
+    }
+    page.evaluate.return_value = {"img": {"count": 3}}
+    timings = PhaseTimings()
+    profiler = BrowserProfiler(
+        page,
+        context,
+        trace=trace,
+        sample_interval_seconds=60,
+        trace_threshold_ms=1000,
+        trace_dir=str(tmp_path / "traces"),
+        timings=timings,
+    ).start()
+    return profiler, page, context, timings
+
+
+def test_profiler_samples_metrics_and_resource_timing_per_phase(tmp_path):
+    """
+    Test that recorded phases drive CDP metric samples (at most once
+    per interval) and resource timing summaries after scrolls.
+    """
+    profiler, page, context, timings = _profiler(tmp_path)
+
+    context.new_cdp_session.assert_called_once_with(page)
+    timings.record("scroll", 0.5)
+    timings.record("watch", 5.0)
+
+    assert len(profiler.metric_samples) == 1
+    assert profiler.metric_samples[0]["Nodes"] == 3000
+    assert "Timestamp" not in profiler.metric_samples[0]
+    page.evaluate.assert_called_once_with(RESOURCE_TIMING_SUMMARY_SCRIPT)
+    assert profiler.resource_timings[0]["by_type"] == {"img": {"count": 3}}
+    context.tracing.start.assert_not_called()
+
+
+def test_profiler_keeps_trace_only_for_slow_phases(tmp_path):
+    """Test that the trace is saved only when a phase was too slow."""
+    profiler, _, context, timings = _profiler(tmp_path, trace=True)
+    timings.record("search", 0.2)
+
+    assert profiler.stop(str(tmp_path / "profile.json")) is None
+    context.tracing.stop.assert_called_once_with()
+    assert timings.listeners == []
+
+    profiler, _, context, timings = _profiler(tmp_path, trace=True)
+    timings.record("scroll", 4.2)
+    report_path = tmp_path / "profile.json"
+
+    trace_path = profiler.stop(str(report_path))
+
+    context.tracing.stop.assert_called_once_with(path=trace_path)
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["slow_phases"] == [["scroll", 4.2]]
+    assert report["trace"] == trace_path
+
+
+def test_profiler_ignores_deliberate_waits_for_the_trace(tmp_path):
+    """
+    Test that watching a video, however long, does not keep the trace,
+    while a slow navigation does.
+    """
+    profiler, _, context, timings = _profiler(tmp_path, trace=True)
+    timings.record("watch", 15.0)
+    timings.record("cooldown", 60.0)
+
+    assert profiler.stop(str(tmp_path / "profile.json")) is None
+
+    profiler, _, context, timings = _profiler(tmp_path, trace=True)
+    timings.record("navigation", 6.0)
+
+    assert profiler.stop(str(tmp_path / "profile.json")) is not None
+
+
+def test_profiler_summarizes_resource_timing_of_video_tabs(tmp_path):
+    """
+    Test that after a navigation the resource timing of every open tab
+    that loaded something is summed up, with its URL.
+    """
+    profiler, page, context, timings = _profiler(tmp_path)
+    video_tab, idle_tab = MagicMock(), MagicMock()
+    video_tab.url = "https://www.tiktok.com/@a/video/1"
+    video_tab.evaluate.return_value = {"media": {"count": 2}}
+    idle_tab.evaluate.return_value = {}
+    context.pages = [page, video_tab, idle_tab]
+
+    timings.record("navigation", 0.8)
+
+    assert [entry["url"] for entry in profiler.resource_timings] == [
+        page.url,
+        video_tab.url,
+    ]
+
+
+def test_profiler_stop_survives_report_write_errors(tmp_path):
+    """Test that a report that cannot be written does not raise."""
+    profiler, _, _, _ = _profiler(tmp_path)
+    blocker = tmp_path / "file"
+    blocker.write_text("", encoding="utf-8")
+
+    assert profiler.stop(str(blocker / "profile.json")) is None
+
+
+def test_profiler_errors_do_not_fail_the_run(tmp_path):
+    """Test that profiling errors are only logged."""
+    profiler, page, _, timings = _profiler(tmp_path)
+    page.evaluate.side_effect = RuntimeError("page closed")
+
+    timings.record("scroll", 0.1)
+
+    context = MagicMock()
+    context.new_cdp_session.side_effect = RuntimeError("not Chromium")
+    assert start_browser_profiler(MagicMock(), context) is None
@@ -0,0 +1,112 @@
+import asyncio
+from contextlib import nullcontext
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from src.readiness import async_wait_until_ready, wait_until_ready
+
+
+@patch("src.readiness.logger")
+def test_wait_until_ready_passes_timeout_and_logs_duration(mock_logger):
+    """
+    Test that the configured upper bound is passed to the wait
+    and the time the condition took is logged.
+    """
+    wait = MagicMock()
+
+    assert wait_until_ready("video playback", wait, 1500) is True
+
+    wait.assert_called_once_with(1500)
+    message = mock_logger.info.call_args[0][0]
+    assert message.startswith("Ready: video playback after")
+
+
+@patch("src.readiness.logger")
+def test_wait_until_ready_returns_false_on_timeout(mock_logger):
+    """Test that hitting the upper bound logs a warning and does not raise."""
+    wait = MagicMock(side_effect=PlaywrightTimeoutError("Timeout 10ms"))
+
+    assert wait_until_ready("more video cards", wait, 10) is False
+
+    mock_logger.warning.assert_called_once()
+
+
+@patch("src.readiness.adaptive_timeouts")
+@patch("src.readiness.logger")
+def test_wait_until_ready_confirms_timeout_at_fixed_bound(
+    mock_logger, mock_adaptive_timeouts
+):
+    """
+    Test that a wait cut short by the learned timeout is retried for the
+    rest of the fixed bound when the timeout has to be confirmed.
+    """
+    mock_adaptive_timeouts.track.return_value = nullcontext(1000)
+    wait = MagicMock(side_effect=[PlaywrightTimeoutError("Timeout"), None])
+
+    assert wait_until_ready("more video cards", wait, 5000, True) is True
+
+    assert [call.args[0] for call in wait.call_args_list] == [1000, 4000]
+    mock_logger.warning.assert_not_called()
+
+
+@patch("src.readiness.adaptive_timeouts")
+@patch("src.readiness.logger")
+def test_wait_until_ready_accepts_learned_timeout_by_default(
+    mock_logger, mock_adaptive_timeouts
+):
+    """Test that without confirmation the learned timeout is final."""
+    mock_adaptive_timeouts.track.return_value = nullcontext(1000)
+    wait = MagicMock(side_effect=PlaywrightTimeoutError("Timeout"))
+
+    assert wait_until_ready("video playback", wait, 5000) is False
+
+    wait.assert_called_once_with(1000)
+
+
+@patch("src.readiness.logger")
+def test_wait_until_ready_propagates_other_errors(mock_logger):
+    """Test that errors other than timeouts are not swallowed."""
+    wait = MagicMock(side_effect=RuntimeError("page closed"))
+
+    with pytest.raises(RuntimeError):
+        wait_until_ready("search input", wait, 10)
+
+
+@patch("src.readiness.logger")
+def test_async_wait_until_ready_returns_false_on_timeout(mock_logger):
+    """Test the async variant handles timeouts the same way."""
+    wait = AsyncMock(side_effect=PlaywrightTimeoutError("Timeout 10ms"))
+
+    assert asyncio.run(async_wait_until_ready("x", wait, 10)) is False
+
+
+def test_wait_for_video_ready_only_waits_for_element_when_media_blocked():
+    """
+    Test that a page whose routing profile blocks video media waits for
+    the video element instead of playback, which would never happen.
+    """
+    from src.readiness import (
+        VIDEO_CAN_PLAY_SCRIPT,
+        VIDEO_ELEMENT_PRESENT_SCRIPT,
+        wait_for_video_ready,
+    )
+    from src.routing import apply_routing_profile
+
+    lean_context, minimal_context = MagicMock(), MagicMock()
+    apply_routing_profile(lean_context, "lean")
+    apply_routing_profile(minimal_context, "minimal")
+    lean_page, minimal_page = MagicMock(), MagicMock()
+    lean_page.context = lean_context
+    minimal_page.context = minimal_context
+
+    assert wait_for_video_ready(lean_page)
+    assert wait_for_video_ready(minimal_page)
+
+    assert lean_page.wait_for_function.call_args.args == (
+        VIDEO_CAN_PLAY_SCRIPT,
+    )
+    assert minimal_page.wait_for_function.call_args.args == (
+        VIDEO_ELEMENT_PRESENT_SCRIPT,
+    )
@@ -0,0 +1,94 @@
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from src.clock import clock
+from src.resilience import AdaptiveTimeouts, CircuitBreaker
+
+
+def test_adaptive_timeouts_use_fixed_bound_until_enough_samples():
+    """Test that the fixed timeout is used until min_samples are known."""
+    timeouts = AdaptiveTimeouts(min_samples=3, margin_ms=100, floor_ms=10)
+    timeouts.record("scroll", 200)
+    timeouts.record("scroll", 300)
+
+    assert timeouts.timeout_ms("scroll", 5000) == 5000
+
+    timeouts.record("scroll", 400)
+    assert timeouts.timeout_ms("scroll", 5000) == 500
+    assert timeouts.timeout_ms("other", 5000) == 5000
+
+
+def test_adaptive_timeouts_stay_between_floor_and_fixed_bound():
+    """Test the floor, the fixed upper bound and disabling."""
+    timeouts = AdaptiveTimeouts(min_samples=1, margin_ms=0, floor_ms=1000)
+    timeouts.record("fast", 5)
+    timeouts.record("slow", 90000)
+
+    assert timeouts.timeout_ms("fast", 5000) == 1000
+    assert timeouts.timeout_ms("slow", 5000) == 5000
+
+    timeouts.enabled = False
+    assert timeouts.timeout_ms("fast", 5000) == 5000
+
+
+def test_adaptive_timeouts_track_records_timeouts_with_full_timeout():
+    """
+    Test that a timed out wait is recorded with its whole timeout, so
+    the learned timeout grows again when the site gets slower.
+    """
+    timeouts = AdaptiveTimeouts(min_samples=100)
+
+    with pytest.raises(PlaywrightTimeoutError):
+        with timeouts.track("video playback", 1500) as timeout_ms:
+            assert timeout_ms == 1500
+            raise PlaywrightTimeoutError("Timeout 1500ms")
+    with timeouts.track("video playback", 1500):
+        pass
+
+    recorded = list(timeouts.durations_ms["video playback"])
+    assert recorded[0] == 1500
+    assert recorded[1] < 1500
+
+
+def test_circuit_breaker_opens_on_clustered_failures():
+    """
+    Test that threshold failures within the window open the breaker,
+    wait_if_open() sleeps until it closes and the cooldown doubles when
+    it opens again before a success.
+    """
+    with clock.virtual(100.0):
+        breaker = CircuitBreaker(
+            failure_threshold=2,
+            window_seconds=60,
+            cooldown_seconds=10,
+            max_cooldown_seconds=15,
+        )
+        breaker.record_failure()
+        assert not breaker.is_open
+
+        breaker.record_failure()
+        assert breaker.is_open
+        breaker.wait_if_open()
+        assert clock.monotonic() == 110.0
+        assert not breaker.is_open
+
+        clock.advance(1)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker._open_until == 126.0  # 15s cooldown, capped
+        assert breaker.times_opened == 2
+
+        breaker.record_success()
+        assert breaker._next_cooldown == 10
+
+
+def test_circuit_breaker_ignores_failures_outside_window():
+    """Test that spread out failures do not open the breaker."""
+    breaker = CircuitBreaker(failure_threshold=2, window_seconds=60)
+
+    with clock.virtual(0.0):
+        breaker.record_failure()
+        clock.advance(61)
+        breaker.record_failure()
+
+        assert not breaker.is_open
@@ -0,0 +1,47 @@
+from unittest.mock import patch
+
+from src.results_cache import ResultsCache
+
+LINKS = [
+    "https://www.tiktok.com/@a/video/1",
+    "https://www.tiktok.com/@a/video/2",
+]
+
+
+def test_results_cache_returns_links_within_ttl(tmp_path):
+    """Test that cached links are returned for the normalized query."""
+    cache = ResultsCache(str(tmp_path / "cache.json"), ttl_seconds=60)
+
+    cache.put("Funny  Cats", LINKS)
+
+    assert cache.get("funny cats") == LINKS
+    assert cache.get("dogs") is None
+
+
+def test_results_cache_expires_entries(tmp_path):
+    """Test that entries older than the TTL are not returned."""
+    cache = ResultsCache(str(tmp_path / "cache.json"), ttl_seconds=60)
+
+    with patch("src.results_cache.time.time", return_value=1000):
+        cache.put("cats", LINKS)
+    with patch("src.results_cache.time.time", return_value=1061):
+        assert cache.get("cats") is None
+
+
+def test_results_cache_persists_between_instances(tmp_path):
+    """Test that a new run reads the links cached by the previous one."""
+    path = str(tmp_path / "cache.json")
+    ResultsCache(path).put("cats", LINKS)
+
+    assert ResultsCache(path).get("cats") == LINKS
+
+
+def test_results_cache_ignores_empty_and_damaged_files(tmp_path):
+    """Test that empty results are not cached and bad files are ignored."""
+    path = tmp_path / "cache.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    cache = ResultsCache(str(path))
+    cache.put("cats", [])
+
+    assert cache.get("cats") is None
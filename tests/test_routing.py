@@ -0,0 +1,97 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.routing import (
+    ESTIMATED_BYTES_PER_REQUEST,
+    RoutingStats,
+    apply_routing_profile,
+    classify_request,
+    routing_stats,
+)
+
+
+def _make_request(url, resource_type, frame_url="https://www.tiktok.com/"):
+    """Build a MagicMock Playwright request."""
+    request = MagicMock(url=url, resource_type=resource_type)
+    request.frame.url = frame_url
+    return request
+
+
+def test_classify_request_categories():
+    """
+    Test that trackers, static assets and media are classified, and
+    that media outside a video page counts as a grid preview.
+    """
+    assert (
+        classify_request(
+            _make_request("https://mon.tiktokv.com/monitor", "xhr")
+        )
+        == "tracker"
+    )
+    assert classify_request(_make_request("https://x/a.png", "image")) == (
+        "image"
+    )
+    assert classify_request(_make_request("https://x/a.js", "script")) is None
+    assert (
+        classify_request(_make_request("https://x/v.mp4", "media"))
+        == "preview_media"
+    )
+    assert (
+        classify_request(
+            _make_request(
+                "https://x/v.mp4",
+                "media",
+                "https://www.tiktok.com/@a/video/1",
+            )
+        )
+        == "media"
+    )
+
+
+def test_apply_full_profile_installs_no_route():
+    """Test that the 'full' profile leaves the context untouched."""
+    context = MagicMock()
+
+    apply_routing_profile(context, "full")
+
+    context.route.assert_not_called()
+
+
+def test_apply_unknown_profile_raises():
+    """Test that a typo in the profile name is reported."""
+    with pytest.raises(ValueError):
+        apply_routing_profile(MagicMock(), "tiny")
+
+
+def test_lean_profile_aborts_blocked_and_falls_back_for_others():
+    """
+    Test that the installed route aborts blocked requests, counts them
+    and lets the other requests through.
+    """
+    context = MagicMock()
+    apply_routing_profile(context, "lean")
+    handle_route = context.route.call_args[0][1]
+    blocked_before = routing_stats.blocked.get("image", 0)
+
+    image_route = MagicMock(request=_make_request("https://x/a.png", "image"))
+    script_route = MagicMock(request=_make_request("https://x/a.js", "script"))
+    handle_route(image_route)
+    handle_route(script_route)
+
+    image_route.abort.assert_called_once()
+    script_route.fallback.assert_called_once()
+    script_route.abort.assert_not_called()
+    assert routing_stats.blocked["image"] == blocked_before + 1
+
+
+def test_routing_stats_estimates_bytes_saved():
+    """Test the bytes-saved estimate sums counts times average sizes."""
+    stats = RoutingStats()
+    stats.record("image")
+    stats.record("image")
+    stats.record("font")
+
+    assert stats.estimated_bytes_saved() == (
+        2 * ESTIMATED_BYTES_PER_REQUEST["image"]
+        + ESTIMATED_BYTES_PER_REQUEST["font"]
+    )
@@ -77,3 +77,89 @@ def test_perform_search_raises_on_failure(mock_logger):
         perform_search(page, "error test")
 
     mock_logger.error.assert_called_once()
+
+
+@patch("src.search.logger")
+def test_perform_search_direct_mode_opens_results_url(mock_logger):
+    """
+    Test that direct mode navigates to the results URL of the current
+    site instead of typing into the search box.
+    """
+    page = MagicMock()
+    page.url = "https://www.tiktok.com/foryou"
+    page.goto.side_effect = lambda url, **kwargs: setattr(page, "url", url)
+
+    perform_search(page, "funny cats", mode="direct")
+
+    page.goto.assert_called_once_with(
+        "https://www.tiktok.com/search/video?q=funny%20cats",
+        wait_until="commit",
+    )
+    page.keyboard.press.assert_not_called()
+    page.wait_for_function.assert_called_once()
+
+
+@patch("src.search.expect")
+@patch("src.search.logger")
+def test_perform_search_direct_mode_falls_back_to_search_box(
+    mock_logger, mock_expect
+):
+    """Test that a failed direct navigation falls back to the search box."""
+    page = MagicMock()
+    page.url = "https://www.tiktok.com/foryou"
+    page.goto.side_effect = Exception("net::ERR_ABORTED")
+
+    perform_search(page, "cats", mode="direct")
+
+    page.keyboard.press.assert_called_once_with("Enter")
+    page.wait_for_url.assert_called_once()
+
+
+@patch("src.search.expect")
+@patch("src.search.logger")
+def test_perform_search_warm_start_skips_grid_wait(mock_logger, mock_expect):
+    """
+    Test that a fresh cached first window is returned without waiting
+    for the grid, and that a cold search caches the rendered window.
+    """
+    page = MagicMock()
+    results_cache = MagicMock()
+    results_cache.get.return_value = ["https://www.tiktok.com/@a/video/1"]
+
+    links = perform_search(page, "cats", results_cache=results_cache)
+
+    assert links == ["https://www.tiktok.com/@a/video/1"]
+    page.wait_for_function.assert_not_called()
+
+    results_cache.get.return_value = None
+    page.evaluate.return_value = ["https://www.tiktok.com/@a/video/2"]
+
+    assert perform_search(page, "cats", results_cache=results_cache) == []
+    page.wait_for_function.assert_called_once()
+    results_cache.put.assert_called_once_with(
+        "cats", ["https://www.tiktok.com/@a/video/2"]
+    )
+
+
+def test_perform_search_rejects_unknown_mode():
+    """Test that an unknown search mode is reported."""
+    with pytest.raises(ValueError, match="Unknown search mode"):
+        perform_search(MagicMock(), "cats", mode="voice")
+
+
+@patch("src.search.expect")
+@patch("src.search.logger")
+def test_perform_search_opens_tiktok_from_blank_page(mock_logger, mock_expect):
+    """
+    Test that the search box path first opens TikTok when the session
+    page was left blank (fresh session without validation navigation).
+    """
+    page = MagicMock()
+    page.url = "about:blank"
+
+    perform_search(page, "cats")
+
+    page.goto.assert_called_once_with(
+        "https://www.tiktok.com/", wait_until="commit"
+    )
+    page.keyboard.press.assert_called_once_with("Enter")
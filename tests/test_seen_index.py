@@ -0,0 +1,153 @@
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+from src.seen_index import (
+    BloomFilter,
+    SeenVideoIndex,
+    account_namespace,
+    parse_video_id,
+)
+from src.viewer import HARVEST_NEW_VIDEO_LINKS_SCRIPT, watch_tiktok_feed
+
+
+def _written(path: str) -> int:
+    """Number of seen-video rows committed to the database file."""
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(
+            "SELECT COUNT(*) FROM seen_videos"
+        ).fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that every added item is reported as present."""
+    bloom = BloomFilter(capacity=1000)
+    items = [7300000000000000000 + i for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(
+        7400000000000000000 + i in bloom for i in range(1000)
+    )
+    assert false_positives < 50
+
+
+def test_seen_index_persists_between_instances(tmp_path):
+    """Test that IDs added by one run are seen by the next one."""
+    path = str(tmp_path / "seen.sqlite3")
+    index = SeenVideoIndex(path, namespace="alice")
+    index.add(123)
+    index.close()
+
+    reopened = SeenVideoIndex(path, namespace="alice")
+
+    assert 123 in reopened
+    assert 456 not in reopened
+    reopened.close()
+
+
+def test_seen_index_namespaces_are_separate(tmp_path):
+    """Test that accounts do not share their seen videos."""
+    path = str(tmp_path / "seen.sqlite3")
+    alice = SeenVideoIndex(path, namespace="alice")
+    bob = SeenVideoIndex(path, namespace="bob")
+
+    alice.add(123)
+
+    assert 123 in alice
+    assert 123 not in bob
+    alice.close()
+    bob.close()
+
+
+def test_seen_index_expires_entries(tmp_path):
+    """Test that entries older than the TTL are ignored and purged."""
+    path = str(tmp_path / "seen.sqlite3")
+    index = SeenVideoIndex(path, ttl_seconds=60)
+
+    with patch("src.seen_index.time.time", return_value=1000.0):
+        index.add(123)
+
+    with patch("src.seen_index.time.time", return_value=1100.0):
+        assert 123 not in index
+        assert index.purge_expired() == 1
+    index.close()
+
+
+def test_seen_index_purges_expired_entries_when_opened(tmp_path):
+    """Test that opening the index deletes the entries past their TTL."""
+    path = str(tmp_path / "seen.sqlite3")
+    with patch("src.seen_index.time.time", return_value=1000.0):
+        index = SeenVideoIndex(path, namespace="alice", ttl_seconds=60)
+        index.add(123)
+        index.close()
+
+    with patch("src.seen_index.time.time", return_value=1100.0):
+        reopened = SeenVideoIndex(path, namespace="bob", ttl_seconds=60)
+
+    assert _written(path) == 0
+    reopened.close()
+
+
+def test_seen_index_writes_added_ids_in_batches(tmp_path):
+    """
+    Test that added IDs are answered at once but only written once a
+    batch is full, or when the index is closed.
+    """
+    path = str(tmp_path / "seen.sqlite3")
+    index = SeenVideoIndex(path, commit_batch=3)
+
+    index.add(1)
+    index.add(2)
+    assert 1 in index
+    assert _written(path) == 0
+
+    index.add(3)
+    assert _written(path) == 3
+    index.add(4)
+    index.close()
+
+    assert _written(path) == 4
+
+
+def test_parse_video_id_and_namespace():
+    """Test numeric ID parsing and namespace naming."""
+    assert parse_video_id("7301234567890123456") == 7301234567890123456
+    assert parse_video_id("abc") is None
+    assert account_namespace("accounts/alice.json") == "alice"
+
+
+def test_watch_tiktok_feed_ignores_videos_seen_in_earlier_runs(
+    tmp_path, monkeypatch
+):
+    """
+    Test that the viewer skips videos already in the index without
+    counting them, and records the newly processed ones.
+    """
+    index = SeenVideoIndex(str(tmp_path / "seen.sqlite3"))
+    index.add(1)
+
+    batches = [
+        [
+            "https://www.tiktok.com/@a/video/1",
+            "https://www.tiktok.com/@a/video/2",
+        ]
+    ]
+    page = MagicMock()
+    page.evaluate.side_effect = lambda script, *args: (
+        (batches.pop(0) if batches else [])
+        if script == HARVEST_NEW_VIDEO_LINKS_SCRIPT
+        else 1000
+    )
+    monkeypatch.setattr("src.viewer.clock.sleep", lambda x: None)
+
+    processed = watch_tiktok_feed(
+        page, skip_percent=100, max_videos_to_process=1, seen_index=index
+    )
+
+    assert processed == 1
+    assert 2 in index
+    index.close()
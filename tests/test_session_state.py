@@ -0,0 +1,82 @@
+import json
+import time
+from unittest.mock import patch
+
+from src import session_state
+
+
+def _write_state(path, cookies):
+    path.write_text(json.dumps({"cookies": cookies}), encoding="utf-8")
+    return str(path)
+
+
+def test_session_expires_at_reads_session_cookie_expiry(tmp_path):
+    """Test that the expiry of the session cookie is returned."""
+    state_path = _write_state(
+        tmp_path / "state.json",
+        [
+            {"name": "tt_csrf_token", "expires": 10},
+            {"name": "sessionid", "expires": 2_000_000_000},
+        ],
+    )
+
+    assert session_state.session_expires_at(state_path) == 2_000_000_000
+
+
+def test_session_expiry_is_unknown_without_persistent_cookie(tmp_path):
+    """Test missing files, missing and browser-session-only cookies."""
+    missing_cookie = _write_state(tmp_path / "a.json", [])
+    session_only = _write_state(
+        tmp_path / "b.json", [{"name": "sessionid", "expires": -1}]
+    )
+
+    assert session_state.session_expires_at(missing_cookie) is None
+    assert session_state.session_expires_at(session_only) is None
+    assert session_state.session_expires_at(str(tmp_path / "c.json")) is None
+
+
+def test_is_session_fresh_requires_remaining_lifetime(tmp_path):
+    """Test freshness against the minimum remaining lifetime."""
+    state_path = _write_state(
+        tmp_path / "state.json",
+        [{"name": "sessionid", "expires": time.time() + 600}],
+    )
+
+    assert session_state.is_session_fresh(state_path, 300)
+    assert not session_state.is_session_fresh(state_path, 900)
+
+
+def test_are_cookies_fresh_reads_live_context_cookies():
+    """Test freshness of cookies as returned by a running context."""
+    now = time.time()
+
+    assert session_state.are_cookies_fresh(
+        [{"name": "sessionid", "expires": now + 7 * 24 * 3600}]
+    )
+    assert not session_state.are_cookies_fresh(
+        [{"name": "sessionid", "expires": now + 60}]
+    )
+    assert not session_state.are_cookies_fresh([])
+
+
+def test_session_expiry_is_cached_until_the_file_changes(tmp_path):
+    """Test that the file is only parsed again after it was modified."""
+    state_path = _write_state(
+        tmp_path / "state.json", [{"name": "sessionid", "expires": 100}]
+    )
+
+    with patch(
+        "src.session_state._read_session_expiry", return_value=100
+    ) as mock_read:
+        session_state.session_expires_at(state_path)
+        session_state.session_expires_at(state_path)
+        assert mock_read.call_count == 1
+
+        _write_state(
+            tmp_path / "state.json", [{"name": "sessionid", "expires": 200}]
+        )
+        with patch(
+            "src.session_state.os.path.getmtime", return_value=time.time() + 5
+        ):
+            session_state.session_expires_at(state_path)
+        assert mock_read.call_count == 2
@@ -0,0 +1,106 @@
+import random
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from src.clock import clock
+from src.readiness import VIDEO_CAN_PLAY_SCRIPT
+from src.resilience import adaptive_timeouts
+from src.simulation import SITE_MODEL, SimulatedPage, simulate_sessions
+
+
+def test_simulated_page_times_out_like_playwright():
+    """
+    Test that a wait longer than its timeout raises and costs exactly
+    the timeout of virtual time.
+    """
+    model = {**SITE_MODEL, "video_ready_latency_ms": (5000, 5000)}
+    page = SimulatedPage(
+        model, random.Random(0), {"scrolls": 0, "videos_opened": 0}
+    )
+
+    with clock.virtual():
+        with pytest.raises(PlaywrightTimeoutError):
+            page.wait_for_function(VIDEO_CAN_PLAY_SCRIPT, timeout=1000)
+        assert clock.monotonic() == 1.0
+
+
+def test_simulate_sessions_estimates_throughput_on_virtual_time():
+    """
+    Test that a simulation processes the budget of every session on
+    virtual time, counts scrolls and skips, and is reproducible.
+    """
+    settings = dict(
+        sessions=20,
+        seed=7,
+        skip_percent=50,
+        max_videos_to_process=30,
+        watch_seconds_range=(10, 10),
+    )
+
+    report = simulate_sessions(**settings)
+
+    assert report["videos_processed"] == 20 * 30
+    # 30 videos need three scrolls of 12 cards
+    assert report["scrolls_per_session"] == 3
+    assert 0.3 < report["skip_ratio"] < 0.7
+    # Watching alone takes 10s per watched video
+    assert report["virtual_hours"] * 3600 > report["videos_watched"] * 10
+    assert simulate_sessions(**settings) == report
+    assert not clock.is_virtual
+
+
+def test_simulate_sessions_is_isolated_from_previous_runs():
+    """
+    Test that breaker state of a slow simulation does not leak into the
+    next one, and that the global random generator is left untouched.
+    """
+    settings = dict(
+        sessions=2,
+        seed=3,
+        max_videos_to_process=10,
+        watch_seconds_range=(5, 5),
+    )
+    fresh = simulate_sessions(**settings)
+    # Every video times out, which opens the circuit breaker
+    simulate_sessions(
+        sessions=2,
+        model={"video_ready_latency_ms": (60000, 60000)},
+        max_videos_to_process=10,
+        watch_seconds_range=(5, 5),
+    )
+
+    state = random.getstate()
+    assert simulate_sessions(**settings) == fresh
+    assert random.getstate() == state
+
+
+def test_adaptive_timeouts_do_not_end_the_feed_early(monkeypatch):
+    """
+    Test that a scroll slower than the learned timeout is still waited
+    for up to the fixed bound, so adaptive timeouts find as many videos
+    as fixed ones when a few scrolls are slow.
+    """
+    latency = SimulatedPage._latency
+
+    def occasionally_slow_scrolls(self, name):
+        if name != "scroll_latency_ms":
+            return latency(self, name)
+        return 2.5 if self.rng.random() < 0.08 else self.rng.uniform(0.3, 0.6)
+
+    monkeypatch.setattr(SimulatedPage, "_latency", occasionally_slow_scrolls)
+    settings = dict(
+        sessions=100,
+        seed=1,
+        skip_percent=100,
+        max_videos_to_process=100,
+        watch_seconds_range=(0, 0),
+        model={"cards_per_query": 1000},
+    )
+    monkeypatch.setattr(adaptive_timeouts, "enabled", False)
+    fixed = simulate_sessions(**settings)
+    monkeypatch.setattr(adaptive_timeouts, "enabled", True)
+    adaptive = simulate_sessions(**settings)
+
+    assert adaptive["videos_processed"] == fixed["videos_processed"]
+    assert adaptive["scrolls_per_session"] == fixed["scrolls_per_session"]
@@ -0,0 +1,73 @@
+from unittest.mock import ANY, MagicMock
+
+from src.video_tabs import VideoTabPool
+
+
+def test_video_tab_pool_creates_tabs_lazily_and_round_robins():
+    """
+    Test that tabs are only opened when needed, up to the pool size,
+    and then reused in round-robin order.
+    """
+    context = MagicMock()
+    context.new_page.side_effect = lambda: MagicMock()
+    pool = VideoTabPool(context, size=2)
+
+    first = pool.acquire()
+    second = pool.acquire()
+
+    assert context.new_page.call_count == 2
+    assert [pool.acquire(), pool.acquire(), pool.acquire()] == [
+        first,
+        second,
+        first,
+    ]
+    assert context.new_page.call_count == 2
+
+
+def test_video_tab_pool_close_closes_all_tabs():
+    """Test that close() closes every opened tab, even if one fails."""
+    context = MagicMock()
+    tabs = [MagicMock(), MagicMock()]
+    tabs[0].close.side_effect = Exception("already closed")
+    context.new_page.side_effect = tabs
+    pool = VideoTabPool(context, size=2)
+    pool.acquire()
+    pool.acquire()
+
+    pool.close()
+
+    tabs[1].close.assert_called_once()
+    context.new_page.side_effect = lambda: MagicMock()
+    assert pool.acquire() is not tabs[0]
+
+
+def test_video_tab_pool_open_uses_prefetched_tab():
+    """
+    Test that a prefetched video is opened in the tab that already
+    started loading it, without navigating again.
+    """
+    context = MagicMock()
+    context.new_page.side_effect = lambda: MagicMock()
+    pool = VideoTabPool(context, size=2)
+
+    current = pool.open("https://www.tiktok.com/@a/video/1")
+    pool.prefetch("https://www.tiktok.com/@a/video/2")
+    prefetched = pool.open("https://www.tiktok.com/@a/video/2")
+
+    assert prefetched is not current
+    prefetched.goto.assert_called_once_with(
+        "https://www.tiktok.com/@a/video/2", wait_until="commit", timeout=ANY
+    )
+
+
+def test_video_tab_pool_forgets_unused_prefetch_when_tab_is_reused():
+    """Test that reusing a tab drops the prefetch it was holding."""
+    context = MagicMock()
+    context.new_page.side_effect = lambda: MagicMock()
+    pool = VideoTabPool(context, size=1)
+
+    pool.prefetch("https://www.tiktok.com/@a/video/2")
+    pool.open("https://www.tiktok.com/@a/video/3")
+    tab = pool.open("https://www.tiktok.com/@a/video/2")
+
+    assert tab.goto.call_count == 3
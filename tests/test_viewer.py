@@ -1,34 +1,42 @@
 import time
 
-from unittest.mock import MagicMock
-from src.viewer import watch_tiktok_feed
+from unittest.mock import ANY, MagicMock, patch
+from src.viewer import (
+    HARVEST_NEW_VIDEO_LINKS_SCRIPT,
+    SCROLL_TO_BOTTOM_SCRIPT,
+    get_video_id,
+    harvest_new_video_links,
+    watch_tiktok_feed,
+)
 
 
-class DummyLocator:
+class DummyFeed:
     """
-    A minimal stand-in for Playwright's Locator.
-    Simulates a list of video links
-    with a .all() method returning mock elements.
+    A minimal stand-in for the search results page's evaluate().
+    Returns scroll heights and, for the harvest script,
+    each batch of new video links only once.
     """
 
-    def __init__(self, hrefs):
+    def __init__(self, batches, heights):
         """
-        Initialize with a list of href strings to simulate video links.
+        Initialize with the link batches returned by successive harvests
+        and the successive values of document.body.scrollHeight.
 
-        :param hrefs: List of fake video URLs (e.g., ['/video/1', '/video/2']).
+        :param batches: List of lists of fake video URLs.
+        :param heights: List of fake scroll heights.
         """
-        self.hrefs = hrefs
-        self.call_count = 0
+        self.batches = batches
+        self.heights = heights
+        self.harvest_calls = 0
 
-    def all(self):
-        """
-        Return a list of MagicMock objects, each simulating an element
-        with a .get_attribute('href') method returning one of the fake URLs.
-        """
-        return [
-            MagicMock(get_attribute=MagicMock(return_value=href))
-            for href in self.hrefs
-        ]
+    def evaluate(self, script, *args):
+        """Dispatch the evaluated script to the matching fake result."""
+        if script == HARVEST_NEW_VIDEO_LINKS_SCRIPT:
+            self.harvest_calls += 1
+            return self.batches.pop(0) if self.batches else []
+        if "scrollHeight" in script and "scrollTo" not in script:
+            return self.heights.pop(0)
+        return None
 
 
 def test_watch_tiktok_feed_skip_and_watch(monkeypatch):
@@ -41,23 +49,19 @@ def test_watch_tiktok_feed_skip_and_watch(monkeypatch):
     """
     page = MagicMock()
 
-    heights = [1000, 2000, 2000]
-    page.evaluate = MagicMock(
-        side_effect=lambda script: (
-            heights.pop(0) if "scrollHeight" in script else None
-        )
-    )
-    page.locator = MagicMock(
-        return_value=DummyLocator(
+    feed = DummyFeed(
+        [
             [
-                "/video/1",
-                "/video/2",
-                "/video/3",
-                "/video/4",
+                "https://www.tiktok.com/@a/video/1",
+                "https://www.tiktok.com/@a/video/2",
+                "https://www.tiktok.com/@a/video/3",
+                "https://www.tiktok.com/@a/video/4",
             ]
-        )
+        ],
+        [1000, 2000, 2000],
     )
-    page.wait_for_load_state = MagicMock()
+    page.evaluate = MagicMock(side_effect=feed.evaluate)
+    page.wait_for_function = MagicMock()
     page.go_back = MagicMock()
 
     import random
@@ -78,10 +82,431 @@ def test_watch_tiktok_feed_skip_and_watch(monkeypatch):
     # Patch time.sleep to a no-op to speed up the test
     monkeypatch.setattr(time, "sleep", lambda x: None)
 
-    watch_tiktok_feed(page, skip_percent=50, max_videos_to_process=4)
+    processed = watch_tiktok_feed(
+        page, skip_percent=50, max_videos_to_process=4
+    )
 
-    assert page.locator.called
-    assert page.wait_for_load_state.call_count == 6
+    assert feed.harvest_calls == 1
+    assert processed == 4
+    assert page.goto.call_count == 3
+    # One readiness wait per scroll plus two per watched video
+    assert page.wait_for_function.call_count == 7
+    page.wait_for_load_state.assert_not_called()
     assert page.go_back.call_count == 3
 
     monkeypatch.setattr(random, "randint", random_backup)
+
+
+def test_harvest_new_video_links_uses_single_evaluation():
+    """
+    Test that harvesting is one page.evaluate call with the card selector,
+    not a locator query plus one round-trip per element.
+    """
+    page = MagicMock()
+    page.evaluate.return_value = ["https://www.tiktok.com/@a/video/1"]
+
+    links = harvest_new_video_links(page)
+
+    page.evaluate.assert_called_once()
+    page.locator.assert_not_called()
+    assert links == ["https://www.tiktok.com/@a/video/1"]
+
+
+def test_harvest_new_video_links_handles_empty_result():
+    """Test that a None result from the page is treated as no links."""
+    page = MagicMock()
+    page.evaluate.return_value = None
+
+    assert harvest_new_video_links(page) == []
+
+
+def test_get_video_id_uses_last_path_segment():
+    """Test video ID extraction from normalized links."""
+    assert get_video_id("https://www.tiktok.com/@a/video/123") == "123"
+    assert get_video_id("https://www.tiktok.com/@a/video/123/") == "123"
+
+
+def test_watch_tiktok_feed_secondary_tab_keeps_results_page(monkeypatch):
+    """
+    Test that in secondary tab mode videos open in one reusable tab,
+    the search results page never navigates back and the tab is closed.
+    """
+    page = MagicMock()
+    video_page = MagicMock()
+    page.context.new_page.return_value = video_page
+
+    feed = DummyFeed(
+        [
+            [
+                "https://www.tiktok.com/@a/video/1",
+                "https://www.tiktok.com/@a/video/2",
+            ]
+        ],
+        [1000, 2000, 2000],
+    )
+    page.evaluate = MagicMock(side_effect=feed.evaluate)
+
+    import random
+
+    monkeypatch.setattr(random, "randint", lambda a, b: 100)
+    monkeypatch.setattr(time, "sleep", lambda x: None)
+
+    processed = watch_tiktok_feed(
+        page,
+        skip_percent=0,
+        max_videos_to_process=2,
+        video_tab_mode="secondary",
+    )
+
+    assert processed == 2
+    page.context.new_page.assert_called_once()
+    assert video_page.goto.call_count == 2
+    page.goto.assert_not_called()
+    page.go_back.assert_not_called()
+    video_page.close.assert_called_once()
+
+
+def test_watch_tiktok_feed_prefetches_next_video(monkeypatch):
+    """
+    Test that with prefetch the next video to watch starts loading in a
+    second tab while the current one plays, and is then reused.
+    """
+    page = MagicMock()
+    tabs = [MagicMock(), MagicMock()]
+    page.context.new_page.side_effect = tabs
+
+    feed = DummyFeed(
+        [
+            [
+                "https://www.tiktok.com/@a/video/1",
+                "https://www.tiktok.com/@a/video/2",
+            ]
+        ],
+        [1000, 2000, 2000],
+    )
+    page.evaluate = MagicMock(side_effect=feed.evaluate)
+
+    import random
+
+    monkeypatch.setattr(random, "randint", lambda a, b: 100)
+    monkeypatch.setattr(time, "sleep", lambda x: None)
+
+    watch_tiktok_feed(
+        page,
+        skip_percent=0,
+        max_videos_to_process=2,
+        video_tab_mode="secondary",
+        prefetch=True,
+    )
+
+    tabs[0].goto.assert_called_once_with(
+        "https://www.tiktok.com/@a/video/1", wait_until="commit", timeout=ANY
+    )
+    tabs[1].goto.assert_called_once_with(
+        "https://www.tiktok.com/@a/video/2", wait_until="commit", timeout=ANY
+    )
+
+
+def test_watch_tiktok_feed_processes_initial_links_first(monkeypatch):
+    """
+    Test that initial (cached) links are processed before the first
+    scroll and are not processed again once the grid renders them.
+    """
+    page = MagicMock()
+    cached = ["https://www.tiktok.com/@a/video/1"]
+    feed = DummyFeed(
+        [cached + ["https://www.tiktok.com/@a/video/2"]], [1000, 2000]
+    )
+    page.evaluate = MagicMock(side_effect=feed.evaluate)
+
+    import random
+
+    monkeypatch.setattr(random, "randint", lambda a, b: 100)
+    monkeypatch.setattr(time, "sleep", lambda x: None)
+
+    processed = watch_tiktok_feed(
+        page, skip_percent=0, max_videos_to_process=2, initial_links=cached
+    )
+
+    assert processed == 2
+    assert [call.args[0] for call in page.goto.call_args_list] == [
+        "https://www.tiktok.com/@a/video/1",
+        "https://www.tiktok.com/@a/video/2",
+    ]
+    assert feed.harvest_calls == 1
+
+
+def test_watch_tiktok_feed_harvests_from_api_responses(monkeypatch):
+    """
+    Test that with an API harvester queued API pages are processed
+    without scrolling, links come from the harvester instead of the
+    DOM and scrolling waits for the next API response.
+    """
+    page = MagicMock()
+    feed = DummyFeed([], [1000, 2000, 2000])
+    page.evaluate = MagicMock(side_effect=feed.evaluate)
+
+    api_harvester = MagicMock()
+    api_harvester.pending = 1
+    batches = [
+        ["https://www.tiktok.com/@a/video/1"],
+        ["https://www.tiktok.com/@a/video/2"],
+    ]
+
+    def drain():
+        api_harvester.pending = 0
+        return batches.pop(0)
+
+    api_harvester.drain.side_effect = drain
+
+    import random
+
+    monkeypatch.setattr(random, "randint", lambda a, b: 100)
+    monkeypatch.setattr(time, "sleep", lambda x: None)
+
+    processed = watch_tiktok_feed(
+        page,
+        skip_percent=0,
+        max_videos_to_process=2,
+        video_tab_mode="secondary",
+        api_harvester=api_harvester,
+    )
+
+    assert processed == 2
+    assert feed.harvest_calls == 0
+    # Only the second batch needed a scroll
+    page.expect_response.assert_called_once()
+
+
+def test_watch_tiktok_feed_api_mode_ends_on_has_more_not_height(
+    monkeypatch,
+):
+    """
+    Test that with an API harvester the scroll height is never checked
+    (cards render late) and the feed ends once the API has no more
+    results, or when a scroll brings no API page.
+    """
+    for has_more_after, drains in ((False, 2), (True, 3)):
+        page = MagicMock()
+        # Any height read would raise: DummyFeed has none to return
+        feed = DummyFeed([], [])
+        page.evaluate = MagicMock(side_effect=feed.evaluate)
+
+        api_harvester = MagicMock()
+        api_harvester.pending = 1
+        api_harvester.has_more = True
+        batches = [
+            ["https://www.tiktok.com/@a/video/1"],
+            ["https://www.tiktok.com/@a/video/2"],
+        ]
+
+        def drain():
+            api_harvester.pending = 0
+            if len(batches) == 1:
+                api_harvester.has_more = has_more_after
+            return batches.pop(0) if batches else []
+
+        api_harvester.drain.side_effect = drain
+
+        import random
+
+        monkeypatch.setattr(random, "randint", lambda a, b: 1)
+
+        processed = watch_tiktok_feed(
+            page,
+            skip_percent=100,
+            max_videos_to_process=10,
+            api_harvester=api_harvester,
+        )
+
+        assert processed == 2
+        assert api_harvester.drain.call_count == drains
+
+
+def test_watch_tiktok_feed_memory_governor_prunes_and_recycles(monkeypatch):
+    """
+    Test that the governor prunes cards after each batch and that a page
+    over its memory budget is reloaded at the same URL and scrolled back
+    to its position.
+    """
+    page = MagicMock()
+    page.url = "https://www.tiktok.com/search/video?q=cats"
+    feed = DummyFeed(
+        [
+            ["https://www.tiktok.com/@a/video/1"],
+            ["https://www.tiktok.com/@a/video/2"],
+        ],
+        [1000, 2000],
+    )
+    page.evaluate = MagicMock(side_effect=feed.evaluate)
+    governor = MagicMock()
+    governor.prune_cards.return_value = 0
+    governor.recycles = 0
+    governor.needs_recycle.side_effect = [True, False]
+
+    import random
+
+    monkeypatch.setattr(random, "randint", lambda a, b: 100)
+    monkeypatch.setattr(time, "sleep", lambda x: None)
+
+    processed = watch_tiktok_feed(
+        page,
+        skip_percent=100,
+        max_videos_to_process=2,
+        memory_governor=governor,
+    )
+
+    assert processed == 2
+    assert governor.prune_cards.call_count == 1
+    page.goto.assert_called_once_with(page.url, wait_until="commit")
+    assert governor.recycles == 1
+
+
+def test_recycle_results_page_prunes_restored_cards():
+    """
+    Test that a reloaded results page is scrolled back to its position
+    and the cards of the positions already passed are pruned on the way.
+    """
+    from src.viewer import _recycle_results_page
+
+    page = MagicMock()
+    page.url = "https://www.tiktok.com/search/video?q=cats"
+    page.evaluate.return_value = 12
+    governor = MagicMock()
+
+    with patch("src.viewer.wait_for_more_cards", return_value=True):
+        _recycle_results_page(page, 4, governor)
+
+    page.goto.assert_called_once_with(page.url, wait_until="commit")
+    scrolls = [
+        call
+        for call in page.evaluate.call_args_list
+        if call.args[0] == SCROLL_TO_BOTTOM_SCRIPT
+    ]
+    assert len(scrolls) == 4
+    # Before every scroll but the first
+    assert governor.prune_restored_cards.call_count == 3
+
+
+def test_watch_tiktok_feed_resumes_from_checkpoint(monkeypatch, tmp_path):
+    """
+    Test that a checkpoint with progress restores the counters, scrolls
+    back to its position, skips its videos and records new ones.
+    """
+    from src.checkpoint import FeedCheckpoint
+
+    checkpoint = FeedCheckpoint(str(tmp_path / "checkpoint.json"))
+    checkpoint.start_query(0, "cats")
+    checkpoint.scroll_count = 2
+    checkpoint.record_video("https://www.tiktok.com/@a/video/1", 1)
+
+    page = MagicMock()
+    feed = DummyFeed(
+        [
+            [
+                "https://www.tiktok.com/@a/video/1",
+                "https://www.tiktok.com/@a/video/2",
+            ]
+        ],
+        [1000, 2000],
+    )
+    page.evaluate = MagicMock(side_effect=feed.evaluate)
+
+    import random
+
+    monkeypatch.setattr(random, "randint", lambda a, b: 100)
+    monkeypatch.setattr(time, "sleep", lambda x: None)
+
+    processed = watch_tiktok_feed(
+        page,
+        skip_percent=0,
+        max_videos_to_process=2,
+        checkpoint=checkpoint,
+    )
+
+    assert processed == 2
+    # Only the video after the checkpoint is watched
+    assert [call.args[0] for call in page.goto.call_args_list] == [
+        "https://www.tiktok.com/@a/video/2"
+    ]
+    assert checkpoint.processed_videos_count == 2
+    assert checkpoint.scroll_count == 3
+
+
+def test_watch_tiktok_feed_parallel_tabs_watches_all_videos(monkeypatch):
+    """
+    Test that with parallel tabs every video opens in its own tab, the
+    results page never navigates and the tabs are closed at the end.
+    """
+    page = MagicMock()
+    tabs = [MagicMock(), MagicMock()]
+    page.context.new_page.side_effect = tabs
+    feed = DummyFeed(
+        [
+            [
+                "https://www.tiktok.com/@a/video/1",
+                "https://www.tiktok.com/@a/video/2",
+                "https://www.tiktok.com/@a/video/3",
+            ]
+        ],
+        [1000, 2000],
+    )
+    page.evaluate = MagicMock(side_effect=feed.evaluate)
+
+    import random
+
+    monkeypatch.setattr(random, "randint", lambda a, b: 1)
+    monkeypatch.setattr(time, "sleep", lambda x: None)
+
+    processed = watch_tiktok_feed(
+        page, skip_percent=0, max_videos_to_process=3, parallel_tabs=2
+    )
+
+    assert processed == 3
+    assert page.context.new_page.call_count == 2
+    assert tabs[0].goto.call_count + tabs[1].goto.call_count == 3
+    page.goto.assert_not_called()
+    tabs[0].close.assert_called_once()
+    tabs[1].close.assert_called_once()
+
+
+def test_watch_tiktok_feed_unplayable_videos_count_as_failures(monkeypatch):
+    """
+    Test that a video that never becomes playable is reported to the
+    circuit breaker as a failure and never as a success, so repeated
+    failures keep escalating its backoff.
+    """
+    from unittest.mock import patch
+
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+    from src.readiness import VIDEO_CAN_PLAY_SCRIPT
+
+    page = MagicMock()
+    feed = DummyFeed(
+        [
+            [
+                "https://www.tiktok.com/@a/video/1",
+                "https://www.tiktok.com/@a/video/2",
+            ]
+        ],
+        [1000, 2000],
+    )
+    page.evaluate = MagicMock(side_effect=feed.evaluate)
+
+    def wait_for_function(script, *args, **kwargs):
+        if script == VIDEO_CAN_PLAY_SCRIPT:
+            raise PlaywrightTimeoutError("Timeout")
+
+    page.wait_for_function = MagicMock(side_effect=wait_for_function)
+
+    import random
+
+    monkeypatch.setattr(random, "randint", lambda a, b: 100)
+    monkeypatch.setattr(time, "sleep", lambda x: None)
+
+    with patch("src.viewer.circuit_breaker") as breaker:
+        watch_tiktok_feed(page, skip_percent=0, max_videos_to_process=2)
+
+    assert breaker.record_failure.call_count == 2
+    breaker.record_success.assert_not_called()
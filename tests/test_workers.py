@@ -0,0 +1,139 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler
+from queue import SimpleQueue
+from unittest.mock import MagicMock, patch
+
+import src.workers as workers
+from src.config import DEFAULT_SEARCH_QUERY
+
+
+def test_load_jobs_parses_accounts_and_queries(tmp_path):
+    """
+    Test load_jobs reads 'account,query' lines, skips blank lines and
+    falls back to the default query.
+    """
+    jobs_file = tmp_path / "jobs.csv"
+    jobs_file.write_text("a.json,funny dogs\n\nb.json\n", encoding="utf-8")
+
+    jobs = workers.load_jobs(str(jobs_file))
+
+    assert jobs == [
+        workers.Job("a.json", "funny dogs"),
+        workers.Job("b.json", DEFAULT_SEARCH_QUERY),
+    ]
+
+
+@patch("src.workers.open_seen_index", return_value=None)
+@patch("src.workers.watch_tiktok_feed", return_value=7)
+@patch("src.workers.perform_search")
+@patch("src.workers.open_authenticated_page")
+def test_run_job_returns_result(
+    mock_open_page, mock_search, mock_watch, mock_open_seen_index
+):
+    """
+    Test run_job runs search and watch on the worker browser, closes the
+    context and returns the processed count.
+    """
+    context = MagicMock()
+    mock_open_page.return_value = ("page_mock", context)
+
+    result = workers.run_job(workers.Job("a.json", "cats"))
+
+    mock_search.assert_called_once_with("page_mock", "cats")
+    context.close.assert_called_once()
+    assert result["processed"] == 7
+    assert result["error"] is None
+
+
+@patch("src.workers.open_authenticated_page")
+def test_run_job_reports_errors(mock_open_page):
+    """Test that a failing job is reported instead of raising."""
+    mock_open_page.side_effect = RuntimeError("login failed")
+
+    result = workers.run_job(workers.Job("a.json"))
+
+    assert result["processed"] == 0
+    assert result["error"] == "login failed"
+
+
+@patch("src.workers.util")
+@patch("src.workers.sync_playwright")
+def test_init_worker_sends_records_to_the_log_queue(mock_playwright, _):
+    """
+    Test that a worker logs through a queue to the parent, keeping the
+    level and creation time of its records.
+    """
+    log_queue = SimpleQueue()
+    handlers = list(workers.logger.handlers)
+    try:
+        workers._init_worker(True, log_queue)
+        workers.logger.warning("Slow scroll")
+        assert [type(h) for h in workers.logger.handlers] == [QueueHandler]
+    finally:
+        workers._worker_browser = None
+        for handler in list(workers.logger.handlers):
+            workers.logger.removeHandler(handler)
+        for handler in handlers:
+            workers.logger.addHandler(handler)
+
+    record = log_queue.get_nowait()
+    assert record.levelno == logging.WARNING
+    assert record.getMessage().endswith("] Slow scroll")
+    assert record.getMessage().startswith("[worker ")
+    p = mock_playwright.return_value.start.return_value
+    p.chromium.launch.assert_called_once_with(headless=True)
+
+
+@patch("src.workers.ProcessPoolExecutor", ThreadPoolExecutor)
+@patch("src.workers.run_job")
+def test_run_jobs_in_pool_merges_results(mock_run_job):
+    """
+    Test run_jobs_in_pool collects one result per job and hands the
+    records workers put on the log queue to this process's handlers.
+    """
+    log_queues = []
+
+    def run_job(job):
+        log_queues[0].put(
+            logging.makeLogRecord(
+                {"levelno": logging.ERROR, "msg": f"failed {job.account}"}
+            )
+        )
+        return {
+            "account": job.account,
+            "query": job.query,
+            "pid": 1,
+            "processed": 3,
+            "error": None,
+            "duration_seconds": 1.0,
+        }
+
+    mock_run_job.side_effect = run_job
+    handler = MagicMock(level=logging.NOTSET)
+    jobs = [workers.Job("a.json"), workers.Job("b.json")]
+
+    with patch(
+        "src.workers._init_worker",
+        lambda headless, log_queue: log_queues.append(log_queue),
+    ), patch.object(workers.logger, "handlers", [handler]):
+        results = workers.run_jobs_in_pool(jobs, 1)
+
+    assert sorted(r["account"] for r in results) == ["a.json", "b.json"]
+    forwarded = {
+        call.args[0].getMessage(): call.args[0].levelno
+        for call in handler.handle.call_args_list
+    }
+    assert forwarded["failed a.json"] == logging.ERROR
+    assert forwarded["failed b.json"] == logging.ERROR
+
+
+def test_load_jobs_reads_optional_video_budget(tmp_path):
+    """Test that a third column sets the video budget of a job."""
+    jobs_file = tmp_path / "jobs.csv"
+    jobs_file.write_text("a.json,cats,12\nb.json,dogs,x\n", encoding="utf-8")
+
+    jobs = workers.load_jobs(str(jobs_file))
+
+    assert jobs[0] == workers.Job("a.json", "cats", 12)
+    assert jobs[1].max_videos == workers.MAX_VIDEOS_TO_PROCESS